@@ -0,0 +1,188 @@
+"""
+Technical Indicator Pipeline
+Shared pandas-ta indicator set used by live analysis and backtests
+"""
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# pandas-ta output columns for each indicator (nested names follow the analysis dict)
+INDICATOR_COLUMNS = {
+    'RSI': 'RSI_14',
+    'MACD': {'macd': 'MACD_12_26_9', 'signal': 'MACDs_12_26_9', 'hist': 'MACDh_12_26_9'},
+    'BB': {'upper': 'BBU_20_2.0', 'middle': 'BBM_20_2.0', 'lower': 'BBL_20_2.0'},
+    'STOCH': {'k': 'STOCHk_14_3_3', 'd': 'STOCHd_14_3_3'},
+    'EMA_50': 'EMA_50',
+    'EMA_200': 'EMA_200',
+    'ATR': 'ATRr_14',  # Wilder-smoothed average true range, used for SL/TP distances
+}
+
+# Bars needed before every indicator has a value (EMA_200)
+WARMUP_BARS = 200
+
+
+@dataclass(frozen=True)
+class IndicatorNode:
+    """One indicator in the dependency graph"""
+    compute: Callable  # compute(df) appends the node's columns
+    columns: Tuple[str, ...]
+    depends: Tuple[str, ...] = ()
+
+
+def _ema(length: int) -> IndicatorNode:
+    """EMA node of one length"""
+    return IndicatorNode(lambda df: df.ta.ema(length=length, append=True), (f'EMA_{length}',))
+
+
+def _macd(df):
+    """MACD from the already computed EMA_12/EMA_26 (same as pandas-ta's macd)"""
+    import pandas_ta as ta
+
+    macd = df['EMA_12'] - df['EMA_26']
+    signal = ta.ema(macd.loc[macd.first_valid_index():], length=9)
+    if signal is None:
+        return  # Too few bars
+    df['MACD_12_26_9'] = macd
+    df['MACDs_12_26_9'] = signal
+    df['MACDh_12_26_9'] = macd - signal
+
+
+# Every indicator a strategy can require; intermediate nodes (EMA_12/EMA_26)
+# are computed only as dependencies
+INDICATOR_GRAPH: Dict[str, IndicatorNode] = {
+    'RSI': IndicatorNode(lambda df: df.ta.rsi(length=14, append=True), ('RSI_14',)),
+    'EMA_12': _ema(12),
+    'EMA_26': _ema(26),
+    'EMA_50': _ema(50),
+    'EMA_200': _ema(200),
+    'MACD': IndicatorNode(_macd, ('MACD_12_26_9', 'MACDs_12_26_9', 'MACDh_12_26_9'),
+                          depends=('EMA_12', 'EMA_26')),
+    'BB': IndicatorNode(lambda df: df.ta.bbands(length=20, std=2, append=True),
+                        tuple(INDICATOR_COLUMNS['BB'].values())),
+    'STOCH': IndicatorNode(lambda df: df.ta.stoch(append=True),
+                           tuple(INDICATOR_COLUMNS['STOCH'].values())),
+    'ATR': IndicatorNode(lambda df: df.ta.atr(length=14, append=True), ('ATRr_14',)),
+}
+
+# Names strategy configurations use for graph nodes
+INDICATOR_ALIASES = {
+    'MA': ('EMA_50', 'EMA_200'),
+    'Bollinger': ('BB',),
+}
+
+_unknown_logged = set()
+
+
+@lru_cache(maxsize=64)
+def _plan(names: frozenset) -> Tuple[str, ...]:
+    """Topologically ordered nodes needed for a set of indicator names"""
+    order, visiting, done = [], set(), set()
+
+    def visit(name: str):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Indicator dependency cycle at {name}")
+        visiting.add(name)
+        for dependency in INDICATOR_GRAPH[name].depends:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for name in sorted(names):
+        visit(name)
+    return tuple(order)
+
+
+def resolve_indicators(names: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Resolve required indicator names into the graph nodes to compute
+
+    Args:
+        names: Indicator names or aliases (e.g. from get_required_indicators);
+            names that are not indicators ('price', 'prediction') are ignored
+
+    Returns:
+        Node names in dependency order, each once
+    """
+    nodes = set()
+    for name in names:
+        for node in INDICATOR_ALIASES.get(name, (name,)):
+            if node in INDICATOR_GRAPH:
+                nodes.add(node)
+            elif node not in _unknown_logged:
+                _unknown_logged.add(node)
+                logger.debug(f"Not a computed indicator, ignored: {node}")
+    return _plan(frozenset(nodes))
+
+
+def append_indicators(df, names: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+    """
+    Append indicator columns to an OHLCV DataFrame over its full length
+
+    Each node of the dependency graph is computed once; nodes whose columns
+    the DataFrame already has are skipped.
+
+    Args:
+        df: DataFrame with Open/High/Low/Close/Volume columns
+        names: Required indicators (None = every indicator in INDICATOR_COLUMNS)
+
+    Returns:
+        Node names that were computed
+    """
+    import pandas_ta as ta  # noqa: F401 - registers the DataFrame.ta accessor
+
+    computed = []
+    for name in resolve_indicators(INDICATOR_COLUMNS if names is None else names):
+        node = INDICATOR_GRAPH[name]
+        if all(column in df.columns for column in node.columns):
+            continue
+        node.compute(df)
+        computed.append(name)
+    return tuple(computed)
+
+
+def latest_indicators(df) -> Dict:
+    """
+    Read the latest value of each indicator
+
+    Args:
+        df: DataFrame after append_indicators
+
+    Returns:
+        Indicators dictionary as produced by AIMarketAnalyzer
+    """
+    indicators = {}
+    for name, column in INDICATOR_COLUMNS.items():
+        if isinstance(column, dict):
+            if all(c in df.columns for c in column.values()):
+                indicators[name] = {key: df[c].iloc[-1] for key, c in column.items()}
+        elif column in df.columns:
+            indicators[name] = df[column].iloc[-1]
+    return indicators
+
+
+def indicator_arrays(df) -> Dict[str, np.ndarray]:
+    """
+    Extract every indicator column as a float64 array
+
+    Args:
+        df: DataFrame after append_indicators
+
+    Returns:
+        Dictionary keyed by 'RSI', 'MACD.hist', 'BB.upper', etc. (missing columns are NaN)
+    """
+    arrays = {}
+    nan = np.full(len(df), np.nan)
+    for name, column in INDICATOR_COLUMNS.items():
+        columns = column.items() if isinstance(column, dict) else [(None, column)]
+        for key, c in columns:
+            label = name if key is None else f"{name}.{key}"
+            arrays[label] = df[c].to_numpy(dtype=np.float64) if c in df.columns else nan
+    return arrays
@@ -3,11 +3,18 @@ AI Market Analyzer
 Comprehensive market analysis using AI and technical indicators
 """
 import logging
-from typing import Dict, Optional, Any
+import time
+from typing import Callable, Dict, Iterable, Optional, Any, Set
 from datetime import datetime, timedelta
-import pandas as pd
 import numpy as np
 
+from ..utils.analysis_cache import get_analysis_cache
+from ..utils.feature_store import get_feature_store, indicator_features
+from ..utils.dependencies import module_available
+from ..utils.realtime_bars import TIMEFRAME_SECONDS
+from .indicators import append_indicators, latest_indicators
+from ..utils.metrics import get_metrics_registry
+
 logger = logging.getLogger(__name__)
 
 class AIMarketAnalyzer:
@@ -16,9 +23,19 @@ class AIMarketAnalyzer:
     Analyzes market conditions using technical indicators and AI
     """
     
+    # Read by the sentiment, trend, volatility and confidence scoring below
+    BASE_INDICATORS = ('RSI', 'MACD', 'BB', 'EMA_50', 'EMA_200')
+    
     def __init__(self):
         """Initialize market analyzer"""
         self.indicators_enabled = False
+        self.live_source = None
+        self.indicator_requirements: Optional[Callable[[], Iterable[str]]] = None
+        self.min_live_bars = 200  # Enough history for EMA_200
+        self.analysis_latency = get_metrics_registry().histogram(
+            'analysis_duration_seconds', 'Market analysis time per symbol and timeframe',
+            ['symbol', 'timeframe']
+        )
         self._check_dependencies()
         self.timeframe_map = {
             'M1': '1m', 'M5': '5m', 'M15': '15m', 'M30': '30m',
@@ -27,20 +44,14 @@ class AIMarketAnalyzer:
         }
     
     def _check_dependencies(self):
-        """Check if required libraries are available"""
-        try:
-            # Try to import pandas-ta (optional)
-            try:
-                import pandas_ta as ta
-                import yfinance as yf
-                self.indicators_enabled = True
-                logger.info("Technical indicators and data fetching enabled (pandas-ta, yfinance)")
-            except ImportError as e:
-                logger.warning(f"Optional libraries not available: {e} - using basic indicators")
-                self.indicators_enabled = False
-        except ImportError:
-            logger.warning("Required libraries not available - limited functionality")
+        """Check if required libraries are available (imported on first analysis)"""
+        missing = [name for name in ('pandas', 'pandas_ta', 'yfinance') if not module_available(name)]
+        if missing:
+            logger.warning(f"Optional libraries not available: {', '.join(missing)} - using basic indicators")
             self.indicators_enabled = False
+        else:
+            self.indicators_enabled = True
+            logger.info("Technical indicators and data fetching enabled (pandas-ta, yfinance)")
     
     def analyze(self, symbol: str, timeframe: str = "H1") -> Dict:
         """
@@ -53,9 +64,12 @@ class AIMarketAnalyzer:
         Returns:
             Analysis dictionary
         """
+        start = time.perf_counter()
         try:
             # Get market data
             market_data = self._get_market_data(symbol, timeframe)
+            if market_data and 'df' in market_data:
+                market_data['df'] = self._closed_bars(market_data['df'], market_data.get('interval'))
             
             if not market_data or 'df' not in market_data or market_data['df'].empty:
                 logger.warning(f"No market data available for {symbol}")
@@ -71,6 +85,14 @@ class AIMarketAnalyzer:
                     'error': 'No market data available'
                 }
             
+            # Reuse the analysis if this bar has already been analyzed
+            bar_time = market_data['df'].index[-1].isoformat()
+            cache = get_analysis_cache()
+            cache_key = cache.make_key(symbol, timeframe, bar_time)
+            cached = cache.get(cache_key, 'analysis')
+            if cached is not None:
+                return cached
+
             # Calculate technical indicators
             indicators = self._calculate_indicators(market_data)
             market_data['indicators'] = indicators
@@ -87,10 +109,11 @@ class AIMarketAnalyzer:
             # Calculate confidence
             confidence = self._calculate_confidence(sentiment, trend, volatility, indicators)
             
-            return {
+            analysis = {
                 'symbol': symbol,
                 'timeframe': timeframe,
                 'timestamp': datetime.now().isoformat(),
+                'bar_time': bar_time,
                 'sentiment': sentiment,
                 'trend': trend,
                 'volatility': volatility,
@@ -98,6 +121,10 @@ class AIMarketAnalyzer:
                 'confidence': confidence,
                 'close_price': market_data['df']['Close'].iloc[-1]
             }
+            cache.put(cache_key, 'analysis', analysis)
+            cache.put(cache_key, 'closes', market_data['df']['Close'].to_numpy(dtype=np.float64))
+            get_feature_store().update((symbol, timeframe), indicator_features(analysis))
+            return analysis
             
         except Exception as e:
             logger.error(f"Error in market analysis: {e}")
@@ -114,6 +141,8 @@ class AIMarketAnalyzer:
                 'confidence': 0.0,
                 'error': str(e)
             }
+        finally:
+            self.analysis_latency.labels(symbol, timeframe).observe(time.perf_counter() - start)
     
     def _map_symbol(self, symbol: str) -> str:
         """Map generic symbol to yfinance format"""
@@ -139,12 +168,70 @@ class AIMarketAnalyzer:
             
         return symbol
 
+    def set_live_source(self, source):
+        """
+        Use locally aggregated real-time bars when available
+        
+        Args:
+            source: Object with get_live_bars(symbol, timeframe, count), e.g. DataCollector
+        """
+        self.live_source = source
+    
+    def set_indicator_requirements(self, provider: Optional[Callable[[], Iterable[str]]]):
+        """
+        Compute only the indicators someone requires
+        
+        Args:
+            provider: Returns the indicator names needed beyond BASE_INDICATORS
+                (e.g. AIStrategyEngine.required_indicators); None computes all
+        """
+        self.indicator_requirements = provider
+    
+    def required_indicators(self) -> Optional[Set[str]]:
+        """Indicators to compute (None = all)"""
+        if self.indicator_requirements is None:
+            return None
+        return set(self.BASE_INDICATORS).union(self.indicator_requirements())
+    
+    def _get_live_data(self, symbol: str, timeframe: str) -> Optional[Dict]:
+        """Get market data from the real-time bar buffer"""
+        if self.live_source is None:
+            return None
+
+        bars = self.live_source.get_live_bars(symbol, timeframe)
+        if len(bars) < self.min_live_bars:
+            return None
+
+        import pandas as pd
+
+        df = pd.DataFrame(
+            {
+                'Open': bars['open'],
+                'High': bars['high'],
+                'Low': bars['low'],
+                'Close': bars['close'],
+                'Volume': bars['volume'],
+            },
+            index=pd.to_datetime(bars['time'], unit='s', utc=True)
+        )
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'interval': timeframe,
+            'source': 'live',
+            'df': df
+        }
+
     def _get_market_data(self, symbol: str, timeframe: str) -> Optional[Dict]:
-        """Get market data from yfinance"""
+        """Get market data from the live bar buffer, falling back to yfinance"""
         if not self.indicators_enabled:
-            return {'symbol': symbol, 'timeframe': timeframe, 'df': pd.DataFrame()}
+            return None
 
         try:
+            live_data = self._get_live_data(symbol, timeframe)
+            if live_data is not None:
+                return live_data
+
             import yfinance as yf
             
             yf_symbol = self._map_symbol(symbol)
@@ -168,12 +255,27 @@ class AIMarketAnalyzer:
                 'symbol': symbol,
                 'yf_symbol': yf_symbol,
                 'timeframe': timeframe,
+                'interval': yf_interval,
                 'df': df
             }
         except Exception as e:
             logger.error(f"Error fetching data for {symbol}: {e}")
             return None
     
+    def _closed_bars(self, df, interval: Optional[str]):
+        """
+        Drop the bar still forming so analysis (and its cache key) only
+        changes when a bar closes
+        
+        Args:
+            df: OHLCV DataFrame indexed by bar open time
+            interval: Bar interval of the data (e.g. '1h', 'M5')
+        """
+        seconds = TIMEFRAME_SECONDS.get(interval)
+        if seconds and len(df) and df.index[-1].timestamp() + seconds > time.time():
+            return df.iloc[:-1].copy()
+        return df
+    
     def _calculate_indicators(self, market_data: Dict) -> Dict:
         """Calculate technical indicators using pandas-ta"""
         indicators = {}
@@ -182,46 +284,8 @@ class AIMarketAnalyzer:
 
         df = market_data['df']
         try:
-            import pandas_ta as ta
-
-            # RSI
-            df.ta.rsi(length=14, append=True)
-            if 'RSI_14' in df.columns:
-                indicators['RSI'] = df['RSI_14'].iloc[-1]
-
-            # MACD
-            df.ta.macd(append=True)
-            if 'MACD_12_26_9' in df.columns:
-                indicators['MACD'] = {
-                    'macd': df['MACD_12_26_9'].iloc[-1],
-                    'signal': df['MACDs_12_26_9'].iloc[-1],
-                    'hist': df['MACDh_12_26_9'].iloc[-1]
-                }
-
-            # Bollinger Bands
-            df.ta.bbands(length=20, std=2, append=True)
-            if 'BBL_20_2.0' in df.columns:
-                 indicators['BB'] = {
-                     'upper': df['BBU_20_2.0'].iloc[-1],
-                     'middle': df['BBM_20_2.0'].iloc[-1],
-                     'lower': df['BBL_20_2.0'].iloc[-1]
-                 }
-
-            # Stochastic
-            df.ta.stoch(append=True)
-            if 'STOCHk_14_3_3' in df.columns:
-                indicators['STOCH'] = {
-                    'k': df['STOCHk_14_3_3'].iloc[-1],
-                    'd': df['STOCHd_14_3_3'].iloc[-1]
-                }
-
-            # EMA
-            df.ta.ema(length=50, append=True)
-            df.ta.ema(length=200, append=True)
-            if 'EMA_50' in df.columns:
-                indicators['EMA_50'] = df['EMA_50'].iloc[-1]
-            if 'EMA_200' in df.columns:
-                indicators['EMA_200'] = df['EMA_200'].iloc[-1]
+            append_indicators(df, self.required_indicators())
+            indicators = latest_indicators(df)
 
         except Exception as e:
             logger.error(f"Error calculating indicators: {e}")
@@ -0,0 +1,522 @@
+"""
+Backtest Engine
+Replays stored bars through strategy generate_signal() with simulated fills
+"""
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .analyzers.indicators import WARMUP_BARS, append_indicators, indicator_arrays
+from .utils.analysis_cache import AnalysisCache
+from .utils.bar_store import BAR_DTYPE
+from .utils.feature_store import feature_matrix
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKTEST_CONFIG = {
+    'spread': 0.0001,            # Price units added to buys / exits of sells
+    'atr_stop_multiplier': 1.5,  # Default SL distance in ATRs when the signal has none
+    'stop_loss_percent': 0.5,    # Default SL distance before ATR is available
+    'risk_reward_ratio': 2.5,    # Default TP = SL distance x ratio (matches the EA)
+    'lot_size': 0.1,
+    'contract_size': 100000,
+    'min_confidence': 0.6,
+    'warmup_bars': WARMUP_BARS,
+}
+
+_SENTIMENT_LABELS = ('bearish', 'neutral', 'bullish')
+
+
+class BacktestData:
+    """
+    Precomputed arrays for one symbol/timeframe series
+
+    Indicators and the analyzer's derived fields are computed once over the
+    whole history; the replay loop only indexes into them.
+    """
+
+    def __init__(self, symbol: str, timeframe: str, time: np.ndarray, columns: Dict[str, np.ndarray]):
+        """
+        Initialize series data
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            time: Bar times (epoch seconds)
+            columns: Arrays keyed by 'open', 'high', 'low', 'close', indicator
+                labels (see indicator_arrays) and derived analysis fields
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.time = np.asarray(time, dtype=np.int64)
+        self.columns = columns
+        self.open = columns['open']
+        self.high = columns['high']
+        self.low = columns['low']
+        self.close = columns['close']
+        self.predictions: Optional[list] = None
+        self.signals: Optional[list] = None
+
+        # Python lists for fast per-bar access in the replay loop
+        self.rows: Dict[str, list] = {name: values.tolist() for name, values in columns.items()}
+        self.rows['bar_time'] = np.datetime_as_string(
+            self.time.astype('datetime64[s]'), timezone='UTC'
+        ).tolist()
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+
+class Backtester:
+    """
+    Event-driven backtester over stored bars
+
+    Each bar is presented to the strategies as the same market_data dictionary
+    AIMarketAnalyzer produces live. Signals fill at the next bar's open, and
+    positions exit on stop loss, take profit or end of data.
+    """
+
+    def __init__(self, strategies: List, config: Optional[Dict] = None):
+        """
+        Initialize backtester
+
+        Args:
+            strategies: Strategy instances (BaseStrategy interface)
+            config: Overrides for DEFAULT_BACKTEST_CONFIG
+        """
+        self.strategies = strategies
+        self.config = {**DEFAULT_BACKTEST_CONFIG, **(config or {})}
+
+    def prepare(self, symbol: str, timeframe: str, bars: np.ndarray,
+                predictor=None, classifier=None) -> BacktestData:
+        """
+        Precompute indicators and model outputs for a series
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            bars: BAR_DTYPE array (e.g. DataCollector.load_range)
+            predictor: PricePredictor for ML strategies (defaults to a strategy's)
+            classifier: SignalClassifier for ML strategies (defaults to a strategy's)
+
+        Returns:
+            BacktestData ready for run()
+        """
+        import pandas as pd
+
+        bars = np.asarray(bars).astype(BAR_DTYPE, copy=False)
+        df = pd.DataFrame(
+            {
+                'Open': bars['open'],
+                'High': bars['high'],
+                'Low': bars['low'],
+                'Close': bars['close'],
+                'Volume': bars['volume'],
+            },
+            index=pd.to_datetime(bars['time'], unit='s', utc=True)
+        )
+        append_indicators(df)
+
+        columns = indicator_arrays(df)
+        for field in ('open', 'high', 'low', 'close', 'volume'):
+            columns[field] = np.ascontiguousarray(bars[field], dtype=np.float64)
+        columns.update(self._derive_analysis(columns))
+        data = BacktestData(symbol, timeframe, bars['time'], columns)
+
+        predictor = predictor or self._strategy_model('price_predictor')
+        classifier = classifier or self._strategy_model('signal_classifier')
+        if predictor is not None:
+            self._prepare_predictions(data, predictor)
+            if classifier is not None and getattr(classifier, 'is_trained', False):
+                self._prepare_signals(data, classifier)
+
+        return data
+
+    def _strategy_model(self, attribute: str):
+        """Get a model exposed by any strategy (e.g. MLStrategy.price_predictor)"""
+        for strategy in self.strategies:
+            model = getattr(strategy, attribute, None)
+            if model is not None:
+                return model
+        return None
+
+    def _derive_analysis(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Vectorized sentiment, trend, volatility and confidence
+
+        Mirrors AIMarketAnalyzer._analyze_sentiment/_analyze_trend/
+        _analyze_volatility/_calculate_confidence bar by bar.
+        """
+        rsi = columns['RSI']
+        ema_50, ema_200 = columns['EMA_50'], columns['EMA_200']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            score = (
+                np.where(rsi > 50, 1, -1) +
+                np.where(columns['MACD.hist'] > 0, 1, -1) +
+                np.where(ema_50 > ema_200, 1, -1)
+            )
+            sentiment = np.sign(score)
+
+            trend_direction = np.where(ema_50 > ema_200, 1, -1)
+
+            middle = columns['BB.middle']
+            bandwidth = (columns['BB.upper'] - columns['BB.lower']) / middle
+            volatility = np.where(middle > 0, np.minimum(bandwidth * 10, 1.0), 0.5)
+
+            agreement = (sentiment != 0) & (sentiment == trend_direction)
+            rsi_confirms = (
+                ((sentiment > 0) & (rsi > 40) & (rsi < 70)) |
+                ((sentiment < 0) & (rsi > 30) & (rsi < 60))
+            )
+            confidence = np.clip(0.5 + 0.2 * agreement + 0.1 * rsi_confirms, 0.0, 1.0)
+
+        return {
+            'sentiment': sentiment.astype(np.float64),
+            'trend_direction': trend_direction.astype(np.float64),
+            'trend_strength': np.full(len(rsi), 0.7),
+            'volatility': volatility,
+            'confidence': confidence,
+        }
+
+    def _prepare_predictions(self, data: BacktestData, predictor):
+        """Precompute per-bar price predictions with one vectorized pass"""
+        predicted, confidence = predictor.predict_series(data.close)
+        with np.errstate(invalid='ignore'):
+            change = predicted - data.close
+            direction = np.where(change > 0, 1.0, -1.0)
+        change_percent = change / data.close * 100
+
+        data.columns['prediction_direction'] = np.where(np.isnan(predicted), 0.0, direction)
+        data.columns['prediction_confidence'] = confidence
+        data.columns['prediction_change_percent'] = np.nan_to_num(change_percent)
+
+        error = {
+            'predicted_price': None,
+            'price_change': 0.0,
+            'direction': 'unknown',
+            'confidence': 0.0,
+            'error': 'Insufficient historical data'
+        }
+        data.predictions = [
+            error if np.isnan(price) else {
+                'symbol': data.symbol,
+                'timeframe': data.timeframe,
+                'predicted_price': price,
+                'price_change': delta,
+                'price_change_percent': percent,
+                'direction': 'up' if delta > 0 else 'down',
+                'confidence': conf
+            }
+            for price, delta, percent, conf in zip(
+                predicted.tolist(), change.tolist(), change_percent.tolist(), confidence.tolist()
+            )
+        ]
+
+    def _prepare_signals(self, data: BacktestData, classifier, chunk_size: int = 65536):
+        """Precompute per-bar classifier signals in large batches"""
+        features = feature_matrix(data.columns)
+        signals = []
+        for start in range(0, len(features), chunk_size):
+            batch = classifier.classify_batch(features[start:start + chunk_size])
+            if batch is None:
+                return
+            signals.extend(batch)
+        data.signals = signals
+
+    def _market_data(self, data: BacktestData, i: int) -> Dict:
+        """Build the analyzer-shaped market_data dictionary for bar i"""
+        rows = data.rows
+        trend_direction = rows['trend_direction'][i]
+        return {
+            'symbol': data.symbol,
+            'timeframe': data.timeframe,
+            'timestamp': rows['bar_time'][i],
+            'bar_time': rows['bar_time'][i],
+            'sentiment': _SENTIMENT_LABELS[int(rows['sentiment'][i]) + 1],
+            'trend': {
+                'direction': 'up' if trend_direction > 0 else 'down',
+                'strength': rows['trend_strength'][i]
+            },
+            'volatility': rows['volatility'][i],
+            'indicators': {
+                'RSI': rows['RSI'][i],
+                'MACD': {
+                    'macd': rows['MACD.macd'][i],
+                    'signal': rows['MACD.signal'][i],
+                    'hist': rows['MACD.hist'][i]
+                },
+                'BB': {
+                    'upper': rows['BB.upper'][i],
+                    'middle': rows['BB.middle'][i],
+                    'lower': rows['BB.lower'][i]
+                },
+                'STOCH': {
+                    'k': rows['STOCH.k'][i],
+                    'd': rows['STOCH.d'][i]
+                },
+                'EMA_50': rows['EMA_50'][i],
+                'EMA_200': rows['EMA_200'][i],
+                'ATR': rows['ATR'][i]
+            },
+            'confidence': rows['confidence'][i],
+            'close_price': rows['close'][i]
+        }
+
+    def _best_signal(self, data: BacktestData, i: int, cache: AnalysisCache) -> Optional[Dict]:
+        """Run all strategies on bar i and return the most confident signal"""
+        market_data = self._market_data(data, i)
+
+        if data.predictions is not None:
+            key = cache.make_key(data.symbol, data.timeframe, market_data['bar_time'])
+            cache.put(key, 'prediction', data.predictions[i])
+            if data.signals is not None:
+                cache.put(key, 'signals', data.signals[i])
+
+        best_signal = None
+        best_confidence = self.config['min_confidence']
+        for strategy in self.strategies:
+            signal = strategy.generate_signal(data.symbol, market_data)
+            if signal and signal.get('action') in ('BUY', 'SELL'):
+                confidence = signal.get('confidence', 0.0)
+                if confidence >= best_confidence:
+                    best_signal = signal
+                    best_confidence = confidence
+        return best_signal
+
+    def _find_exit(self, data: BacktestData, side: int, start: int,
+                   stop_loss: float, take_profit: float) -> Tuple[int, float, str]:
+        """
+        Find the first bar touching SL or TP, scanning ahead in growing chunks
+
+        Bars are bid prices: longs exit at bid, shorts exit at bid + spread.
+        A bar hitting both levels is assumed to hit the stop first, and a bar
+        gapping through a level fills at its open.
+
+        Returns:
+            Tuple of (exit bar index, exit price, exit reason)
+        """
+        spread = self.config['spread']
+        n = len(data)
+        chunk = 64
+        j = start
+        while j < n:
+            k = min(j + chunk, n)
+            if side > 0:
+                hit_sl = data.low[j:k] <= stop_loss
+                hit_tp = data.high[j:k] >= take_profit
+            else:
+                hit_sl = data.high[j:k] + spread >= stop_loss
+                hit_tp = data.low[j:k] + spread <= take_profit
+
+            hits = np.flatnonzero(hit_sl | hit_tp)
+            if len(hits):
+                offset = hits[0]
+                index = j + int(offset)
+                bar_open = float(data.open[index]) + (spread if side < 0 else 0.0)
+                if hit_sl[offset]:
+                    price = min(stop_loss, bar_open) if side > 0 else max(stop_loss, bar_open)
+                    return index, price, 'stop_loss'
+                price = max(take_profit, bar_open) if side > 0 else min(take_profit, bar_open)
+                return index, price, 'take_profit'
+
+            j = k
+            chunk *= 2
+
+        last_close = float(data.close[-1]) + (spread if side < 0 else 0.0)
+        return n - 1, last_close, 'end_of_data'
+
+    def run(self, data: BacktestData, stop_check: Optional[Callable[[List[Dict], int], bool]] = None) -> Dict:
+        """
+        Replay a prepared series through the strategies
+
+        Args:
+            data: Output of prepare()
+            stop_check: Called with (trades, bar index) after each trade;
+                returning True abandons the run (early stopping)
+
+        Returns:
+            Summary dictionary with a 'trades' list; each trade has the fields
+            PerformanceOptimizer.track_performance expects
+        """
+        started = time.perf_counter()
+        config = self.config
+        spread = config['spread']
+        units = config['lot_size'] * config['contract_size']
+        n = len(data)
+
+        # Isolate ML strategies from the live analysis cache during replay
+        cache = AnalysisCache(max_size=4)
+        saved_caches = {}
+        for strategy in self.strategies:
+            if hasattr(strategy, 'analysis_cache'):
+                saved_caches[strategy] = strategy.analysis_cache
+                strategy.analysis_cache = cache
+
+        trades = []
+        stopped_early = False
+        try:
+            i = config['warmup_bars']
+            while i < n - 1:
+                signal = self._best_signal(data, i, cache)
+                if signal is None:
+                    i += 1
+                    continue
+
+                side = 1 if signal['action'] == 'BUY' else -1
+                entry_index = i + 1
+                entry_price = float(data.open[entry_index]) + (spread if side > 0 else 0.0)
+
+                stop_loss = signal.get('stop_loss')
+                take_profit = signal.get('take_profit')
+                if not stop_loss:
+                    # Same rule as AIRiskManager: ATR multiple, percent until ATR warms up
+                    atr = data.columns['ATR'][i]
+                    if np.isfinite(atr) and atr > 0:
+                        stop_loss = entry_price - side * atr * config['atr_stop_multiplier']
+                    else:
+                        stop_loss = entry_price * (1 - side * config['stop_loss_percent'] / 100)
+                if not take_profit:
+                    distance = abs(entry_price - stop_loss)
+                    take_profit = entry_price + side * distance * config['risk_reward_ratio']
+
+                exit_index, exit_price, reason = self._find_exit(
+                    data, side, entry_index, stop_loss, take_profit
+                )
+                trades.append({
+                    'symbol': data.symbol,
+                    'action': signal['action'],
+                    'entry_price': entry_price,
+                    'exit_price': exit_price,
+                    'stop_loss': stop_loss,
+                    'take_profit': take_profit,
+                    'profit': (exit_price - entry_price) * side * units,
+                    'duration': int(data.time[exit_index] - data.time[entry_index]),
+                    'entry_time': data.rows['bar_time'][entry_index],
+                    'exit_time': data.rows['bar_time'][exit_index],
+                    'exit_reason': reason,
+                    'confidence': signal.get('confidence', 0.0),
+                    'strategy': signal.get('strategy')
+                })
+                i = exit_index
+
+                if stop_check is not None and stop_check(trades, i):
+                    stopped_early = True
+                    break
+        finally:
+            for strategy, saved in saved_caches.items():
+                strategy.analysis_cache = saved
+
+        elapsed = time.perf_counter() - started
+        bars_processed = max(min(i, n) - config['warmup_bars'], 0)
+        summary = summarize_trades(trades)
+        summary.update({
+            'symbol': data.symbol,
+            'timeframe': data.timeframe,
+            'bars_processed': bars_processed,
+            'elapsed': elapsed,
+            'bars_per_minute': bars_processed / elapsed * 60 if elapsed > 0 else 0.0,
+            'stopped_early': stopped_early,
+            'trades': trades
+        })
+        return summary
+
+    def run_bars(self, symbol: str, timeframe: str, bars: np.ndarray) -> Dict:
+        """
+        Prepare and run a series in one call
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            bars: BAR_DTYPE array
+
+        Returns:
+            Backtest summary
+        """
+        return self.run(self.prepare(symbol, timeframe, bars))
+
+
+def summarize_trades(trades: List[Dict]) -> Dict:
+    """
+    Aggregate trade results
+
+    Args:
+        trades: Trade dictionaries with a 'profit' field (in time order)
+
+    Returns:
+        Summary statistics
+    """
+    if not trades:
+        return {
+            'total_trades': 0,
+            'winning_trades': 0,
+            'losing_trades': 0,
+            'win_rate': 0.0,
+            'total_profit': 0.0,
+            'average_profit': 0.0,
+            'profit_factor': 0.0,
+            'max_drawdown': 0.0
+        }
+
+    profits = np.array([t['profit'] for t in trades], dtype=np.float64)
+    equity = np.cumsum(profits)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0))
+    gross_profit = profits[profits > 0].sum()
+    gross_loss = -profits[profits < 0].sum()
+
+    return {
+        'total_trades': len(trades),
+        'winning_trades': int((profits > 0).sum()),
+        'losing_trades': int((profits < 0).sum()),
+        'win_rate': float((profits > 0).mean()),
+        'total_profit': float(equity[-1]),
+        'average_profit': float(profits.mean()),
+        'profit_factor': float(gross_profit / gross_loss) if gross_loss > 0 else float('inf'),
+        'max_drawdown': float((peak - equity).max())
+    }
+
+
+def main():
+    """Backtest strategies on stored bars (run as ``python -m ai.backtester`` from python/)"""
+    import argparse
+
+    from .utils.data_collector import DataCollector
+    from .strategies.technical_strategy import TechnicalStrategy
+    from .strategies.scalping_strategy import ScalpingStrategy
+    from .strategies.ml_strategy import MLStrategy
+
+    strategy_classes = {
+        'technical': TechnicalStrategy,
+        'scalping': ScalpingStrategy,
+        'ml': MLStrategy,
+    }
+
+    parser = argparse.ArgumentParser(description='Backtest trading strategies on stored bars')
+    parser.add_argument('--symbol', default='EURUSD')
+    parser.add_argument('--timeframe', default='H1')
+    parser.add_argument('--strategy', choices=list(strategy_classes) + ['all'], default='all')
+    parser.add_argument('--spread', type=float, default=DEFAULT_BACKTEST_CONFIG['spread'])
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    names = list(strategy_classes) if args.strategy == 'all' else [args.strategy]
+    strategies = [strategy_classes[name](config={}) for name in names]
+
+    bars = DataCollector().load_range(args.symbol, args.timeframe)
+    if len(bars) <= DEFAULT_BACKTEST_CONFIG['warmup_bars']:
+        logger.error(f"Not enough stored bars for {args.symbol} {args.timeframe}: {len(bars)}")
+        return
+
+    result = Backtester(strategies, {'spread': args.spread}).run_bars(args.symbol, args.timeframe, bars)
+    logger.info(
+        f"{args.symbol} {args.timeframe}: {result['total_trades']} trades, "
+        f"win rate {result['win_rate']:.1%}, profit {result['total_profit']:.2f}, "
+        f"max drawdown {result['max_drawdown']:.2f}, "
+        f"{result['bars_per_minute']:,.0f} bars/min"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Model Registry
+Process-wide registry so each model is constructed and loaded only once
+"""
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = Path(__file__).parent.parent.parent.parent / "data" / "models"
+
+
+class ModelHandle:
+    """
+    Reference to a shared model
+
+    Always resolves to the registry's current version, so consumers pick up
+    a hot-swapped model on their next call without re-acquiring.
+    """
+
+    def __init__(self, registry: 'ModelRegistry', name: str):
+        """
+        Initialize model handle
+
+        Args:
+            registry: Owning registry
+            name: Registered model name
+        """
+        self._registry = registry
+        self.name = name
+        self.released = False
+
+    @property
+    def model(self) -> Any:
+        """Current model instance (loaded on first access)"""
+        return self._registry._resolve(self.name)
+
+    @property
+    def version(self) -> int:
+        """Current model version"""
+        return self._registry.get_version(self.name)
+
+    def release(self):
+        """Release this reference"""
+        if not self.released:
+            self.released = True
+            self._registry.release(self.name)
+
+
+class ModelRegistry:
+    """
+    Process-wide model registry
+
+    Models are created lazily by their factory, shared by reference count
+    and replaced atomically when a retrained model file lands.
+    """
+
+    def __init__(self):
+        """Initialize model registry"""
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.RLock()
+
+    def acquire(self, name: str, factory: Callable[[], Any],
+                model_path: Optional[str] = None) -> ModelHandle:
+        """
+        Acquire a shared model handle
+
+        Args:
+            name: Model name (e.g., 'price_predictor')
+            factory: Callable creating a new model instance
+            model_path: Trained model file to load and watch (optional)
+
+        Returns:
+            ModelHandle
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = {
+                    'factory': factory,
+                    'model': None,
+                    'version': 0,
+                    'refcount': 0,
+                    'model_path': Path(model_path) if model_path else None,
+                    'model_mtime': None
+                }
+                self._entries[name] = entry
+            elif model_path and entry['model_path'] is None:
+                entry['model_path'] = Path(model_path)
+
+            entry['refcount'] += 1
+            return ModelHandle(self, name)
+
+    def release(self, name: str):
+        """
+        Release a reference; the model is dropped when no consumers remain
+
+        Args:
+            name: Model name
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return
+
+            entry['refcount'] -= 1
+            if entry['refcount'] <= 0:
+                del self._entries[name]
+                logger.info(f"Model '{name}' unloaded (no remaining consumers)")
+
+    def _resolve(self, name: str) -> Any:
+        """Get current model instance, building it on first use"""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+
+            if entry['model'] is None:
+                entry['model'] = self._build(entry)
+                entry['version'] = 1
+                logger.info(f"Model '{name}' loaded (version 1)")
+
+            return entry['model']
+
+    def _build(self, entry: Dict) -> Any:
+        """Create a model instance and load its trained weights if present"""
+        model = entry['factory']()
+        model_path = entry['model_path']
+        if model_path is not None and model_path.exists():
+            model.load_model(str(model_path))
+            entry['model_mtime'] = model_path.stat().st_mtime
+        return model
+
+    def get_version(self, name: str) -> int:
+        """
+        Get current model version
+
+        Args:
+            name: Model name
+
+        Returns:
+            Version number (0 if not loaded yet)
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            return entry['version'] if entry else 0
+
+    def swap(self, name: str, model: Any) -> int:
+        """
+        Atomically replace a model
+
+        Args:
+            name: Model name
+            model: New model instance
+
+        Returns:
+            New version number
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                logger.warning(f"Cannot swap unregistered model '{name}'")
+                return 0
+
+            entry['model'] = model
+            entry['version'] += 1
+            logger.info(f"Model '{name}' hot-swapped to version {entry['version']}")
+            return entry['version']
+
+    def reload(self, name: str) -> int:
+        """
+        Build a fresh instance from the model file and swap it in
+
+        The new model is loaded outside the lock so consumers keep using
+        the current version until the swap. A model that fails to load is
+        not swapped in, and its file time is not recorded, so the next
+        refresh() retries.
+
+        Args:
+            name: Model name
+
+        Returns:
+            New version number (0 on failure)
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return 0
+            staging = dict(entry)
+
+        try:
+            model = self._build(staging)
+        except Exception as e:
+            logger.error(f"Error reloading model '{name}': {e}")
+            return 0
+
+        # load_model() reports failures through is_trained rather than raising
+        if staging['model_path'] is not None and not getattr(model, 'is_trained', True):
+            logger.warning(f"Model '{name}' failed to load from {staging['model_path']} - keeping current version")
+            return 0
+
+        with self._lock:
+            if name in self._entries:
+                self._entries[name]['model_mtime'] = staging['model_mtime']
+        return self.swap(name, model)
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Hot-swap every loaded model whose file changed on disk
+
+        Returns:
+            Dictionary of model name -> new version for swapped models
+        """
+        with self._lock:
+            candidates = []
+            for name, entry in self._entries.items():
+                model_path = entry['model_path']
+                if entry['model'] is None or model_path is None or not model_path.exists():
+                    continue
+                if model_path.stat().st_mtime != entry['model_mtime']:
+                    candidates.append(name)
+
+        swapped = {}
+        for name in candidates:
+            version = self.reload(name)
+            if version:
+                swapped[name] = version
+        return swapped
+
+    def get_stats(self) -> Dict:
+        """Get registry statistics"""
+        with self._lock:
+            return {
+                name: {
+                    'loaded': entry['model'] is not None,
+                    'version': entry['version'],
+                    'refcount': entry['refcount'],
+                    'model_path': str(entry['model_path']) if entry['model_path'] else None
+                }
+                for name, entry in self._entries.items()
+            }
+
+
+# Singleton instance
+_model_registry = None
+
+def get_model_registry() -> ModelRegistry:
+    """Get singleton instance of ModelRegistry"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
@@ -3,55 +3,158 @@ Price Predictor Model
 Predicts future price movements using machine learning
 """
 import logging
-from typing import Dict, Optional, List
+import os
+from typing import Any, Dict, Optional, List
 from datetime import datetime
+from pathlib import Path
 import numpy as np
 
+from ..utils.bar_store import HISTORICAL_DIR, BarStore
+from ..utils.metrics import get_metrics_registry
+
 logger = logging.getLogger(__name__)
 
+DEEP_MODEL_TYPES = ('lstm', 'transformer')
+
+# Bars for single-symbol predict(); shared by every PricePredictor instance
+# so a hot-swapped model keeps the same source
+_bar_source = None
+_history_store = None
+
+
+def set_bar_source(source):
+    """
+    Read live bars for predict() (falls back to the historical bar store)
+
+    Args:
+        source: Object with get_live_bars(symbol, timeframe, count), e.g.
+            DataCollector or SharedBarPlane (None = historical store only)
+    """
+    global _bar_source
+    _bar_source = source
+
+
+class RidgeWindowModel:
+    """
+    Linear autoregressive model over normalized log-return windows
+
+    Inputs are the last ``window`` log returns divided by their own standard
+    deviation, so one model serves every symbol and timeframe. Inference is a
+    single matrix-vector product for the whole batch.
+    """
+
+    def __init__(self, window: int = 32, horizon: int = 1, l2: float = 1.0):
+        """
+        Initialize ridge model
+
+        Args:
+            window: Number of returns per input window
+            horizon: Number of bars ahead to predict
+            l2: Ridge regularization strength
+        """
+        self.window = window
+        self.horizon = horizon
+        self.l2 = l2
+        self.weights = np.zeros(window, dtype=np.float64)
+        self.bias = 0.0
+        self.residual_std = 1.0
+
+    def forward(self, features: np.ndarray) -> np.ndarray:
+        """
+        Predict normalized future returns
+
+        Args:
+            features: Array of shape (batch, window)
+
+        Returns:
+            Array of shape (batch,)
+        """
+        return features @ self.weights + self.bias
+
+    def fit(self, features: np.ndarray, targets: np.ndarray):
+        """
+        Fit weights in closed form
+
+        Args:
+            features: Array of shape (samples, window)
+            targets: Array of shape (samples,)
+        """
+        mean_x = features.mean(axis=0)
+        mean_y = targets.mean()
+        centered = features - mean_x
+        gram = centered.T @ centered + self.l2 * np.eye(self.window)
+        self.weights = np.linalg.solve(gram, centered.T @ (targets - mean_y))
+        self.bias = float(mean_y - mean_x @ self.weights)
+        residuals = targets - self.forward(features)
+        self.residual_std = float(residuals.std()) or 1.0
+
+    def save(self, model_path: str):
+        """Save model parameters to an .npz file (write-then-rename: the service may hot-load it)"""
+        tmp_path = f"{model_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                weights=self.weights,
+                bias=self.bias,
+                residual_std=self.residual_std,
+                window=self.window,
+                horizon=self.horizon,
+                l2=self.l2
+            )
+        os.replace(tmp_path, model_path)
+
+    @classmethod
+    def load(cls, model_path: str) -> 'RidgeWindowModel':
+        """Load model parameters from an .npz file"""
+        with np.load(model_path) as data:
+            model = cls(int(data['window']), int(data['horizon']), float(data['l2']))
+            model.weights = data['weights'].astype(np.float64)
+            model.bias = float(data['bias'])
+            model.residual_std = float(data['residual_std'])
+        return model
+
 
 class PricePredictor:
     """
-    Predicts future price movements using deep learning
-    Uses LSTM or Transformer-based neural network
+    Predicts future price movements
+    Uses a NumPy ridge model over return windows with batched inference
     """
-    
-    def __init__(self, model_type: str = "lstm"):
+
+    def __init__(self, model_type: str = "ridge", window: int = 32):
         """
         Initialize price predictor
-        
+
         Args:
-            model_type: Model type ('lstm' or 'transformer')
+            model_type: Model type ('ridge'; 'lstm'/'transformer' fall back to ridge)
+            window: Number of returns per input window
         """
         self.model_type = model_type
-        self.model = None
+        self.window = window
+        self.model: Optional[RidgeWindowModel] = None
         self.is_trained = False
+        self._input_buffer = np.empty((0, window), dtype=np.float64)
+        self.inference_latency = get_metrics_registry().histogram(
+            'model_inference_seconds', 'Batched model inference time', ['model']
+        ).labels('price_predictor')
         self._check_dependencies()
-    
+
     def _check_dependencies(self):
-        """Check if ML libraries are available"""
-        try:
-            import tensorflow as tf
-            self.ml_available = True
-            logger.info("TensorFlow available for price prediction")
-        except ImportError:
-            try:
-                import torch
-                self.ml_available = True
-                logger.info("PyTorch available for price prediction")
-            except ImportError:
-                self.ml_available = False
-                logger.warning("No ML framework available - price prediction disabled")
-    
+        """Check the model type (the ridge model only needs NumPy)"""
+        if self.model_type in DEEP_MODEL_TYPES:
+            logger.info(f"{self.model_type} model not implemented - using NumPy ridge model")
+        self.ml_available = True
+
     def predict(self, symbol: str, timeframe: str = "H1", horizon: int = 24) -> Dict:
         """
         Predict future price movements
-        
+
         Args:
             symbol: Trading symbol
             timeframe: Timeframe for prediction
-            horizon: Prediction horizon in periods (e.g., 24 hours)
-            
+            horizon: Unused (kept for API compatibility); the reported
+                horizon is the trained model's, or 1 bar for the untrained
+                momentum fallback
+
         Returns:
             Prediction dictionary:
             - predicted_price: Predicted price
@@ -60,227 +163,298 @@ class PricePredictor:
             - confidence: Prediction confidence (0-1)
             - timeframe: Timeframe used
         """
-        if not self.ml_available:
+        try:
+            closes = self._get_closes(symbol, timeframe)
+            key = (symbol, timeframe)
+            return self.predict_batch({key: closes}, horizon)[key]
+
+        except Exception as e:
+            logger.error(f"Error in price prediction: {e}")
             return {
                 'predicted_price': None,
                 'price_change': 0.0,
                 'direction': 'unknown',
                 'confidence': 0.0,
-                'error': 'ML framework not available'
+                'error': str(e)
             }
-        
-        try:
-            # Get historical data
-            historical_data = self._get_historical_data(symbol, timeframe)
-            
-            if not historical_data or len(historical_data) < 10:
-                return {
+
+    def predict_batch(self, windows: Dict[Any, np.ndarray], horizon: int = 24) -> Dict[Any, Dict]:
+        """
+        Predict all symbols/timeframes with a single forward pass
+
+        Args:
+            windows: Dictionary of (symbol, timeframe) -> array of recent closes
+            horizon: Unused (kept for API compatibility, see predict)
+
+        Returns:
+            Dictionary of (symbol, timeframe) -> prediction dictionary
+        """
+        results = {}
+        keys = []
+        last_prices = []
+        scales = []
+
+        buffer = self._get_input_buffer(len(windows))
+        for key, closes in windows.items():
+            scale = self._fill_features(buffer[len(keys)], closes)
+            if scale is None:
+                results[key] = {
                     'predicted_price': None,
                     'price_change': 0.0,
                     'direction': 'unknown',
                     'confidence': 0.0,
                     'error': 'Insufficient historical data'
                 }
-            
-            # Make prediction
-            if self.model and self.is_trained:
-                prediction = self._make_prediction(historical_data, horizon)
+                continue
+            keys.append(key)
+            last_prices.append(closes[-1])
+            scales.append(scale)
+
+        if not keys:
+            return results
+
+        features = buffer[:len(keys)]
+        with self.inference_latency.time():
+            if self.model is not None and self.is_trained:
+                normalized = self.model.forward(features)
+                confidence = 0.5 + 0.45 * np.tanh(np.abs(normalized) / self.model.residual_std)
+                horizon = self.model.horizon
             else:
-                # Use simple prediction if model not trained
-                prediction = self._simple_prediction(historical_data, horizon)
-            
-            return {
+                # Untrained fallback: mean return of the last 10 bars, one bar ahead
+                normalized = features[:, -10:].mean(axis=1)
+                confidence = np.full(len(keys), 0.4)
+                horizon = 1
+
+        log_change = normalized * np.asarray(scales)
+        last_prices = np.asarray(last_prices)
+        predicted = last_prices * np.exp(log_change)
+        timestamp = datetime.now().isoformat()
+
+        for i, key in enumerate(keys):
+            symbol, timeframe = key if isinstance(key, tuple) else (key, None)
+            results[key] = {
                 'symbol': symbol,
                 'timeframe': timeframe,
-                'timestamp': datetime.now().isoformat(),
-                'predicted_price': prediction.get('price'),
-                'price_change': prediction.get('change', 0.0),
-                'price_change_percent': prediction.get('change_percent', 0.0),
-                'direction': prediction.get('direction', 'unknown'),
-                'confidence': prediction.get('confidence', 0.5),
+                'timestamp': timestamp,
+                'predicted_price': float(predicted[i]),
+                'price_change': float(predicted[i] - last_prices[i]),
+                'price_change_percent': float((predicted[i] / last_prices[i] - 1.0) * 100),
+                'direction': 'up' if log_change[i] > 0 else 'down',
+                'confidence': float(confidence[i]),
                 'horizon': horizon
             }
-            
-        except Exception as e:
-            logger.error(f"Error in price prediction: {e}")
-            return {
-                'predicted_price': None,
-                'price_change': 0.0,
-                'direction': 'unknown',
-                'confidence': 0.0,
-                'error': str(e)
-            }
-    
-    def _get_historical_data(self, symbol: str, timeframe: str) -> Optional[List]:
+
+        return results
+
+    def predict_series(self, closes: np.ndarray, chunk_size: int = 65536) -> tuple:
         """
-        Get historical price data
-        
+        Predict at every bar of a close series (used for backtests)
+
+        Equivalent to calling predict_batch with each bar's trailing window,
+        computed in chunks over a sliding-window view.
+
         Args:
-            symbol: Trading symbol
-            timeframe: Timeframe
-            
+            closes: Close prices (oldest first)
+            chunk_size: Windows evaluated per step (bounds peak memory)
+
         Returns:
-            List of historical price data
+            Tuple of (predicted prices, confidence) arrays aligned with closes
+            (NaN / 0 where the window is incomplete or degenerate)
         """
-        # TODO: Implement actual data fetching from broker or data provider
-        # Should return OHLCV data
-        return None
-    
-    def _make_prediction(self, historical_data: List, horizon: int) -> Dict:
+        closes = np.asarray(closes, dtype=np.float64)
+        predicted = np.full(len(closes), np.nan)
+        confidence = np.zeros(len(closes))
+        if len(closes) < self.window + 1 or not np.all(closes > 0):
+            return predicted, confidence
+
+        returns = np.diff(np.log(closes))
+        windows = np.lib.stride_tricks.sliding_window_view(returns, self.window)
+        trained = self.model is not None and self.is_trained
+
+        for start in range(0, len(windows), chunk_size):
+            block = windows[start:start + chunk_size]
+            scales = block.std(axis=1)
+            valid = scales > 0
+            features = block[valid] / scales[valid, None]
+
+            if trained:
+                normalized = self.model.forward(features)
+                block_confidence = 0.5 + 0.45 * np.tanh(np.abs(normalized) / self.model.residual_std)
+            else:
+                normalized = features[:, -10:].mean(axis=1)
+                block_confidence = np.full(len(normalized), 0.4)
+
+            # Window i ends at bar i + window
+            bars = np.arange(start, start + len(block))[valid] + self.window
+            predicted[bars] = closes[bars] * np.exp(normalized * scales[valid])
+            confidence[bars] = block_confidence
+
+        return predicted, confidence
+
+    def _get_input_buffer(self, rows: int) -> np.ndarray:
         """
-        Make prediction using trained model
-        
+        Get the shared preallocated input buffer
+
         Args:
-            historical_data: Historical price data
-            horizon: Prediction horizon
-            
+            rows: Number of windows needed
+
         Returns:
-            Prediction dictionary
+            Buffer with at least ``rows`` rows
         """
-        # TODO: Implement actual ML model prediction
-        # This should use the trained model to predict future prices
-        return {
-            'price': None,
-            'change': 0.0,
-            'change_percent': 0.0,
-            'direction': 'unknown',
-            'confidence': 0.5
-        }
-    
-    def _simple_prediction(self, historical_data: List, horizon: int) -> Dict:
+        if self._input_buffer.shape[0] < rows:
+            capacity = 1 << max(rows - 1, 0).bit_length()
+            self._input_buffer = np.empty((capacity, self.window), dtype=np.float64)
+        return self._input_buffer
+
+    def _fill_features(self, row: np.ndarray, closes: np.ndarray) -> Optional[float]:
         """
-        Simple prediction using basic methods (fallback)
-        
+        Write normalized log returns of the latest window into a buffer row
+
         Args:
-            historical_data: Historical price data
-            horizon: Prediction horizon
-            
+            row: Buffer row to fill
+            closes: Recent close prices (oldest first)
+
         Returns:
-            Prediction dictionary
+            Return scale (standard deviation) or None if data is insufficient
         """
-        try:
-            # Simple moving average based prediction
-            if len(historical_data) < 2:
-                return {
-                    'price': None,
-                    'change': 0.0,
-                    'change_percent': 0.0,
-                    'direction': 'unknown',
-                    'confidence': 0.3
-                }
-            
-            # Calculate simple trend
-            recent_prices = [d.get('close', 0) for d in historical_data[-10:]]
-            if len(recent_prices) < 2:
-                return {
-                    'price': None,
-                    'change': 0.0,
-                    'change_percent': 0.0,
-                    'direction': 'unknown',
-                    'confidence': 0.3
-                }
-            
-            current_price = recent_prices[-1]
-            avg_price = sum(recent_prices) / len(recent_prices)
-            
-            # Simple trend-based prediction
-            if current_price > avg_price:
-                direction = 'up'
-                change_percent = 0.1  # Small upward prediction
-            else:
-                direction = 'down'
-                change_percent = -0.1  # Small downward prediction
-            
-            predicted_price = current_price * (1 + change_percent / 100)
-            change = predicted_price - current_price
-            
-            return {
-                'price': predicted_price,
-                'change': change,
-                'change_percent': change_percent,
-                'direction': direction,
-                'confidence': 0.4  # Low confidence for simple prediction
-            }
-            
-        except Exception as e:
-            logger.error(f"Error in simple prediction: {e}")
-            return {
-                'price': None,
-                'change': 0.0,
-                'change_percent': 0.0,
-                'direction': 'unknown',
-                'confidence': 0.3
-            }
-    
-    def train(self, training_data: List, epochs: int = 100):
-        """
-        Train the prediction model
-        
-        Args:
-            training_data: Training dataset
-            epochs: Number of training epochs
-        """
-        if not self.ml_available:
-            logger.warning("ML framework not available - cannot train model")
-            return
-        
-        try:
-            # TODO: Implement model training
-            # This should:
-            # 1. Prepare training data
-            # 2. Build model architecture
-            # 3. Train model
-            # 4. Save trained model
-            logger.info("Model training not yet implemented")
-            self.is_trained = False
-            
-        except Exception as e:
-            logger.error(f"Error training model: {e}")
-            self.is_trained = False
-    
-    def load_model(self, model_path: str):
-        """
-        Load pre-trained model
-        
-        Args:
-            model_path: Path to saved model
-        """
-        if not self.ml_available:
-            logger.warning("ML framework not available - cannot load model")
-            return
-        
-        try:
-            # TODO: Implement model loading
-            logger.info(f"Model loading not yet implemented: {model_path}")
-            self.is_trained = False
-            
-        except Exception as e:
-            logger.error(f"Error loading model: {e}")
-            self.is_trained = False
-
-
+        if closes is None or len(closes) < self.window + 1:
+            return None
 
+        recent = np.asarray(closes[-(self.window + 1):], dtype=np.float64)
+        if not np.all(recent > 0):
+            return None
 
+        log_prices = np.log(recent)
+        np.subtract(log_prices[1:], log_prices[:-1], out=row)
+        scale = float(row.std())
+        if scale <= 0:
+            return None
+        row /= scale
+        return scale
 
+    def _build_training_set(self, closes: np.ndarray, horizon: int) -> tuple:
+        """
+        Build normalized (features, targets) from a close series
 
+        Args:
+            closes: Close prices (oldest first)
+            horizon: Bars ahead to predict
 
+        Returns:
+            Tuple of (features, targets)
+        """
+        returns = np.diff(np.log(closes))
+        count = len(returns) - self.window - horizon + 1
+        if count <= 0:
+            return np.empty((0, self.window)), np.empty(0)
 
+        windows = np.lib.stride_tricks.sliding_window_view(returns, self.window)[:count]
+        scales = windows.std(axis=1)
+        valid = scales > 0
 
+        cumulative = np.concatenate(([0.0], np.cumsum(returns)))
+        start = np.arange(count) + self.window
+        future = cumulative[start + horizon] - cumulative[start]
 
+        return windows[valid] / scales[valid, None], future[valid] / scales[valid]
 
+    def _get_closes(self, symbol: str, timeframe: str) -> Optional[np.ndarray]:
+        """
+        Recent closes from the live bars, falling back to the historical store
 
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
 
+        Returns:
+            Close prices (oldest first) or None if no data is available
+        """
+        needed = self.window + 1
+        if _bar_source is not None:
+            bars = _bar_source.get_live_bars(symbol, timeframe, needed)
+            if len(bars) >= needed:
+                return bars['close']
 
+        global _history_store
+        if _history_store is None:
+            _history_store = BarStore(HISTORICAL_DIR)
+        bars = _history_store.tail(symbol, timeframe, needed)
+        return bars['close'] if len(bars) else None
 
+    def train(self, training_data: List, epochs: int = 100, horizon: int = 1):
+        """
+        Train the prediction model
 
+        Args:
+            training_data: List of OHLCV dictionaries, or a list of close
+                price arrays (one per symbol/timeframe)
+            epochs: Unused by the closed-form ridge model (kept for API compatibility)
+            horizon: Bars ahead to predict
+        """
+        try:
+            if training_data and isinstance(training_data[0], dict):
+                series = [np.array([d.get('close', 0) for d in training_data], dtype=np.float64)]
+            else:
+                series = [np.asarray(s, dtype=np.float64) for s in training_data]
 
+            features, targets = [], []
+            for closes in series:
+                if len(closes) < self.window + horizon + 1 or not np.all(closes > 0):
+                    continue
+                x, y = self._build_training_set(closes, horizon)
+                features.append(x)
+                targets.append(y)
 
+            if not features or sum(len(y) for y in targets) < self.window * 4:
+                logger.warning("Insufficient training data for price predictor")
+                self.is_trained = False
+                return
 
+            model = RidgeWindowModel(self.window, horizon)
+            model.fit(np.concatenate(features), np.concatenate(targets))
+            self.model = model
+            self.is_trained = True
+            logger.info(f"Price predictor trained on {sum(len(y) for y in targets)} windows")
 
+        except Exception as e:
+            logger.error(f"Error training model: {e}")
+            self.is_trained = False
 
+    def save_model(self, model_path: str):
+        """
+        Save trained model
 
+        Args:
+            model_path: Path to save model (.npz)
+        """
+        if self.model is None or not self.is_trained:
+            logger.warning("No trained model to save")
+            return
 
+        try:
+            Path(model_path).parent.mkdir(parents=True, exist_ok=True)
+            self.model.save(model_path)
+            logger.info(f"Price predictor saved to {model_path}")
 
+        except Exception as e:
+            logger.error(f"Error saving model: {e}")
 
+    def load_model(self, model_path: str):
+        """
+        Load pre-trained model
 
+        Args:
+            model_path: Path to saved model (.npz)
+        """
+        try:
+            model = RidgeWindowModel.load(model_path)
+            if model.window != self.window:
+                self.window = model.window
+                self._input_buffer = np.empty((0, model.window), dtype=np.float64)
+            self.model = model
+            self.is_trained = True
+            logger.info(f"Price predictor loaded from {model_path}")
 
+        except Exception as e:
+            logger.error(f"Error loading model: {e}")
+            self.is_trained = False
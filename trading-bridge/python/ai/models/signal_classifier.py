@@ -3,8 +3,17 @@ Signal Classifier Model
 Classifies market conditions and trading opportunities using ML
 """
 import logging
+import os
 from typing import Dict, List, Optional
 from datetime import datetime
+from pathlib import Path
+import pickle
+
+import numpy as np
+
+from ..utils.dependencies import module_available
+from ..utils.feature_store import FEATURE_SCHEMA, vectorize
+from ..utils.metrics import get_metrics_registry
 
 logger = logging.getLogger(__name__)
 
@@ -19,16 +28,17 @@ class SignalClassifier:
         """Initialize signal classifier"""
         self.model = None
         self.is_trained = False
+        self.inference_latency = get_metrics_registry().histogram(
+            'model_inference_seconds', 'Batched model inference time', ['model']
+        ).labels('signal_classifier')
         self._check_dependencies()
     
     def _check_dependencies(self):
-        """Check if ML libraries are available"""
-        try:
-            from sklearn.ensemble import RandomForestClassifier
-            self.ml_available = True
+        """Check if ML libraries are available (without importing them)"""
+        self.ml_available = module_available('sklearn')
+        if self.ml_available:
             logger.info("scikit-learn available for signal classification")
-        except ImportError:
-            self.ml_available = False
+        else:
             logger.warning("scikit-learn not available - using rule-based classification")
     
     def classify(self, market_analysis: Dict, price_prediction: Dict) -> List[Dict]:
@@ -147,22 +157,45 @@ class SignalClassifier:
         Returns:
             List of signals
         """
-        # TODO: Implement ML-based classification
-        # This should use trained model to classify signals
-        # For now, fall back to rule-based
-        return self._rule_based_classify(
-            market_analysis.get('sentiment', 'neutral'),
-            market_analysis.get('trend', {}),
-            price_prediction.get('direction', 'unknown'),
-            price_prediction.get('confidence', 0.0)
-        )
+        features = vectorize(market_analysis, price_prediction)[np.newaxis, :]
+        return self.classify_batch(features)[0]
     
-    def train(self, training_data: List[Dict], labels: List[str]):
+    def classify_batch(self, features: np.ndarray) -> Optional[List[List[Dict]]]:
+        """
+        Classify every row with a single predict_proba call
+        
+        Args:
+            features: Array of shape (symbols, len(FEATURE_SCHEMA)) from the feature store
+            
+        Returns:
+            List of signal lists (one per row), or None if no trained model
+        """
+        if not self.is_trained or self.model is None or len(features) == 0:
+            return None
+        
+        with self.inference_latency.time():
+            probabilities = self.model.predict_proba(features)
+        classes = self.model.classes_
+        best = probabilities.argmax(axis=1)
+        
+        results = []
+        for row, column in enumerate(best):
+            action = str(classes[column])
+            confidence = float(probabilities[row, column])
+            results.append([{
+                'action': action,
+                'confidence': confidence,
+                'reasoning': f'ML classifier: P({action})={confidence:.2f}'
+            }])
+        return results
+    
+    def train(self, training_data: List, labels: List[str]):
         """
         Train the classification model
         
         Args:
-            training_data: Training features
+            training_data: Feature rows in FEATURE_SCHEMA order, or signal
+                dictionaries with 'market_analysis' and 'prediction'
             labels: Training labels (BUY/SELL/HOLD)
         """
         if not self.ml_available:
@@ -170,18 +203,52 @@ class SignalClassifier:
             return
         
         try:
-            # TODO: Implement model training
-            # This should:
-            # 1. Prepare features from training data
-            # 2. Train classifier (Random Forest, Neural Network, etc.)
-            # 3. Save trained model
-            logger.info("ML model training not yet implemented")
-            self.is_trained = False
+            from sklearn.ensemble import RandomForestClassifier
+            
+            if not training_data or len(training_data) != len(labels):
+                logger.warning("No training data for signal classifier")
+                self.is_trained = False
+                return
+            
+            features = np.vstack([
+                vectorize(item.get('market_analysis', item), item.get('prediction', {}))
+                if isinstance(item, dict) else np.asarray(item, dtype=np.float64)
+                for item in training_data
+            ])
+            
+            model = RandomForestClassifier(n_estimators=100, max_depth=8, random_state=42)
+            model.fit(features, np.asarray(labels))
+            self.model = model
+            self.is_trained = True
+            logger.info(f"Signal classifier trained on {len(labels)} samples")
             
         except Exception as e:
             logger.error(f"Error training classifier: {e}")
             self.is_trained = False
     
+    def save_model(self, model_path: str):
+        """
+        Save trained model
+        
+        Args:
+            model_path: Path to save model (.pkl)
+        """
+        if self.model is None or not self.is_trained:
+            logger.warning("No trained model to save")
+            return
+        
+        try:
+            Path(model_path).parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so a hot-reloading service never reads a partial file
+            tmp_path = f"{model_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'schema': FEATURE_SCHEMA, 'model': self.model}, f)
+            os.replace(tmp_path, model_path)
+            logger.info(f"Signal classifier saved to {model_path}")
+            
+        except Exception as e:
+            logger.error(f"Error saving classifier: {e}")
+    
     def load_model(self, model_path: str):
         """
         Load pre-trained model
@@ -194,37 +261,18 @@ class SignalClassifier:
             return
         
         try:
-            # TODO: Implement model loading
-            logger.info(f"Model loading not yet implemented: {model_path}")
-            self.is_trained = False
+            with open(model_path, 'rb') as f:
+                saved = pickle.load(f)
+            
+            if tuple(saved.get('schema', ())) != FEATURE_SCHEMA:
+                logger.warning(f"Feature schema mismatch in {model_path} - retrain the classifier")
+                self.is_trained = False
+                return
+            
+            self.model = saved['model']
+            self.is_trained = True
+            logger.info(f"Signal classifier loaded from {model_path}")
             
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             self.is_trained = False
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
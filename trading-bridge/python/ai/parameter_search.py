@@ -0,0 +1,582 @@
+"""
+Parameter Search
+Parallel backtest-driven optimization of strategy parameters
+"""
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .backtester import DEFAULT_BACKTEST_CONFIG, BacktestData, Backtester
+
+logger = logging.getLogger(__name__)
+
+# Parameters applied to the prepared indicator data instead of the strategy
+DATA_PARAMETERS = ('bb_std',)
+
+# Parameters applied to both the strategy and the backtest config, so the
+# backtester's own confidence gate does not mask the strategy's threshold
+SHARED_PARAMETERS = ('min_confidence',)
+
+DEFAULT_SEARCH_CONFIG = {
+    'max_workers': None,         # None = os.cpu_count()
+    'objective': 'total_profit',
+    'min_trades': 10,
+    'early_stopping': {
+        'min_trades': 20,
+        'min_profit_factor': 0.5,
+        'max_drawdown': None,
+    },
+    'tpe': {
+        'gamma': 0.25,           # Fraction of completed candidates treated as "good"
+        'n_startup': 10,         # Random candidates before the model is used
+        'n_ei_candidates': 24,   # Draws scored per suggested candidate
+    },
+}
+
+
+def _strategy_class(strategy_name: str):
+    """Resolve a strategy class by short or display name"""
+    from .strategies.technical_strategy import TechnicalStrategy
+    from .strategies.scalping_strategy import ScalpingStrategy
+
+    classes = {
+        'technical': TechnicalStrategy,
+        'Technical Analysis Strategy': TechnicalStrategy,
+        'scalping': ScalpingStrategy,
+        'Scalping Strategy': ScalpingStrategy,
+    }
+    if strategy_name not in classes:
+        raise ValueError(f"Strategy not supported by parameter search: {strategy_name}")
+    return classes[strategy_name]
+
+
+def split_parameters(params: Dict) -> Tuple[Dict, Dict, Dict]:
+    """
+    Split a candidate into backtest, strategy and data parameters
+
+    Args:
+        params: Candidate parameter set
+
+    Returns:
+        Tuple of (backtest config, strategy config, data parameters)
+    """
+    backtest, strategy, data = {}, {}, {}
+    for name, value in params.items():
+        if name in SHARED_PARAMETERS:
+            backtest[name] = value
+            strategy[name] = value
+        elif name in DEFAULT_BACKTEST_CONFIG:
+            backtest[name] = value
+        elif name in DATA_PARAMETERS:
+            data[name] = value
+        else:
+            strategy[name] = value
+    return backtest, strategy, data
+
+
+def rescale_bollinger(columns: Dict[str, np.ndarray], bb_std: float) -> Dict[str, np.ndarray]:
+    """
+    Derive Bollinger Bands for another width from the precomputed 2.0 bands
+
+    Args:
+        columns: BacktestData columns computed with std=2.0
+        bb_std: Target band width in standard deviations
+
+    Returns:
+        Columns with BB.upper/BB.lower replaced
+    """
+    middle = columns['BB.middle']
+    half_width = (columns['BB.upper'] - middle) * (bb_std / 2.0)
+    return {**columns, 'BB.upper': middle + half_width, 'BB.lower': middle - half_width}
+
+
+class EarlyStopper:
+    """
+    Abandons clearly bad candidates during a backtest
+
+    Called by Backtester.run after every trade; keeps running totals so each
+    check is O(1).
+    """
+
+    def __init__(self, min_trades: int = 20, min_profit_factor: float = 0.5,
+                 max_drawdown: Optional[float] = None):
+        """
+        Initialize early stopper
+
+        Args:
+            min_trades: Trades required before judging a candidate
+            min_profit_factor: Stop when gross profit / gross loss falls below this
+            max_drawdown: Stop when drawdown exceeds this (account currency)
+        """
+        self.min_trades = min_trades
+        self.min_profit_factor = min_profit_factor
+        self.max_drawdown = max_drawdown
+        self.seen = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.equity = 0.0
+        self.peak = 0.0
+
+    def __call__(self, trades: List[Dict], index: int) -> bool:
+        for trade in trades[self.seen:]:
+            profit = trade['profit']
+            if profit > 0:
+                self.gross_profit += profit
+            else:
+                self.gross_loss -= profit
+            self.equity += profit
+            self.peak = max(self.peak, self.equity)
+        self.seen = len(trades)
+
+        if self.max_drawdown is not None and self.peak - self.equity > self.max_drawdown:
+            return True
+        if self.seen < self.min_trades:
+            return False
+        return self.gross_loss > 0 and self.gross_profit / self.gross_loss < self.min_profit_factor
+
+
+def _params_key(params: Dict) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class TPESampler:
+    """
+    Tree-structured Parzen Estimator over a discrete parameter grid
+
+    Completed candidates are split into the best ``gamma`` fraction and the
+    rest. Each parameter gets a smoothed value histogram per group (the
+    parameters are modelled independently); new candidates are drawn from
+    the good histograms and the draw with the highest l(x) / g(x) is kept.
+    """
+
+    def __init__(self, param_grid: Dict[str, List], gamma: float = 0.25, n_startup: int = 10,
+                 n_ei_candidates: int = 24, seed: int = 42):
+        """
+        Initialize sampler
+
+        Args:
+            param_grid: Dictionary of parameter name -> candidate values
+            gamma: Fraction of completed candidates treated as good
+            n_startup: Completed candidates required before the model is used
+            n_ei_candidates: Draws scored per suggested candidate
+            seed: Random seed
+        """
+        self.names = sorted(param_grid)
+        self.values = {name: list(param_grid[name]) for name in self.names}
+        self.size = math.prod(len(v) for v in self.values.values())
+        self.gamma = gamma
+        self.n_startup = n_startup
+        self.n_ei_candidates = n_ei_candidates
+        self.rng = random.Random(seed)
+
+    def _random(self) -> Dict:
+        return {name: self.rng.choice(self.values[name]) for name in self.names}
+
+    def _histograms(self, history: List[Tuple[Dict, float]]) -> Dict[str, Tuple[List[float], List[float]]]:
+        """Per-parameter (good, bad) value weights with a +1 prior"""
+        ranked = sorted(history, key=lambda item: item[1], reverse=True)
+        n_good = max(1, math.ceil(self.gamma * len(ranked)))
+        good = [params for params, score in ranked[:n_good] if score != float('-inf')]
+        bad = [params for params, _ in ranked[len(good):]]
+
+        histograms = {}
+        for name in self.names:
+            values = self.values[name]
+            good_weights = [1.0] * len(values)
+            bad_weights = [1.0] * len(values)
+            for weights, group in ((good_weights, good), (bad_weights, bad)):
+                for params in group:
+                    if params.get(name) in values:
+                        weights[values.index(params[name])] += 1.0
+            histograms[name] = (good_weights, bad_weights)
+        return histograms
+
+    def suggest(self, history: List[Tuple[Dict, float]], n: int, seen: Set[str]) -> List[Dict]:
+        """
+        Propose new candidates
+
+        Args:
+            history: Completed (params, score) pairs; -inf scores count as bad
+            n: Number of candidates wanted
+            seen: Keys of candidates already proposed (updated in place)
+
+        Returns:
+            Up to n candidates not in seen (fewer once the grid is exhausted)
+        """
+        histograms = self._histograms(history) if len(history) >= self.n_startup else None
+        suggestions = []
+        while len(suggestions) < n and len(seen) < self.size:
+            best, best_ratio = None, float('-inf')
+            for _ in range(self.n_ei_candidates if histograms else 1):
+                params, ratio = {}, 0.0
+                for name in self.names:
+                    if histograms:
+                        good_weights, bad_weights = histograms[name]
+                        j = self.rng.choices(range(len(good_weights)), weights=good_weights)[0]
+                        ratio += (math.log(good_weights[j] / sum(good_weights))
+                                  - math.log(bad_weights[j] / sum(bad_weights)))
+                        params[name] = self.values[name][j]
+                    else:
+                        params[name] = self.rng.choice(self.values[name])
+                if _params_key(params) not in seen and ratio > best_ratio:
+                    best, best_ratio = params, ratio
+
+            # Every draw was a repeat: fall back to a random unseen candidate
+            attempts = 0
+            while best is None and attempts < 100:
+                params = self._random()
+                if _params_key(params) not in seen:
+                    best = params
+                attempts += 1
+            if best is None:
+                break
+
+            seen.add(_params_key(best))
+            suggestions.append(best)
+        return suggestions
+
+
+class SharedSeries:
+    """
+    Publishes prepared BacktestData columns in one shared-memory block
+
+    Workers attach to the block by name and build their BacktestData views
+    over it, so the history and indicators are neither pickled nor copied.
+    """
+
+    def __init__(self, data: BacktestData):
+        """
+        Copy series columns into shared memory
+
+        Args:
+            data: Prepared series
+        """
+        self.names = ['time'] + list(data.columns)
+        self.shape = (len(self.names), len(data))
+        self.shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(self.shape)) * 8, 8))
+
+        matrix = np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)
+        matrix[0] = data.time  # Epoch seconds are exact in float64
+        for row, name in enumerate(self.names[1:], start=1):
+            matrix[row] = data.columns[name]
+
+        self.descriptor = {
+            'shm_name': self.shm.name,
+            'shape': self.shape,
+            'names': self.names,
+            'symbol': data.symbol,
+            'timeframe': data.timeframe,
+        }
+        self.fingerprint = (
+            f"{data.symbol}:{data.timeframe}:{len(data)}:"
+            f"{int(data.time[0]) if len(data) else 0}:{int(data.time[-1]) if len(data) else 0}"
+        )
+
+    def close(self):
+        """Release the shared block"""
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# Per-process state set up by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(descriptor: Dict):
+    """Attach a worker process to the shared series"""
+    shm = shared_memory.SharedMemory(name=descriptor['shm_name'])
+    matrix = np.ndarray(descriptor['shape'], dtype=np.float64, buffer=shm.buf)
+    columns = {name: matrix[row] for row, name in enumerate(descriptor['names'])}
+
+    _worker_state.clear()
+    _worker_state.update({
+        'shm': shm,
+        'time': columns.pop('time').astype(np.int64),
+        'columns': columns,
+        'symbol': descriptor['symbol'],
+        'timeframe': descriptor['timeframe'],
+        'data': {},
+    })
+
+
+def _worker_data(bb_std: Optional[float]) -> BacktestData:
+    """Get (and memoize) the worker's BacktestData for a band width"""
+    cache = _worker_state['data']
+    if bb_std not in cache:
+        columns = _worker_state['columns']
+        if bb_std is not None:
+            columns = rescale_bollinger(columns, bb_std)
+            columns.update(Backtester([])._derive_analysis(columns))
+        cache[bb_std] = BacktestData(
+            _worker_state['symbol'], _worker_state['timeframe'], _worker_state['time'], columns
+        )
+    return cache[bb_std]
+
+
+def _evaluate(task: Tuple[str, Dict, Dict, Dict]) -> Tuple[Dict, Dict]:
+    """
+    Backtest one candidate (runs in a worker process)
+
+    Args:
+        task: (strategy name, candidate params, base backtest config, early stopping config)
+
+    Returns:
+        Tuple of (candidate params, summary without trades)
+    """
+    strategy_name, params, base_config, early_stopping = task
+    backtest_config, strategy_config, data_params = split_parameters(params)
+
+    strategy = _strategy_class(strategy_name)(config=strategy_config)
+    backtester = Backtester([strategy], {**base_config, **backtest_config})
+    stop_check = EarlyStopper(**early_stopping) if early_stopping else None
+
+    summary = backtester.run(_worker_data(data_params.get('bb_std')), stop_check)
+    summary.pop('trades', None)
+    return params, summary
+
+
+class ResultCache:
+    """JSON-backed cache of candidate results keyed by strategy, parameters and data"""
+
+    def __init__(self, cache_file: Optional[Path]):
+        """
+        Initialize result cache
+
+        Args:
+            cache_file: JSON file path (None = in-memory only)
+        """
+        self.cache_file = cache_file
+        self.results: Dict[str, Dict] = {}
+        if cache_file and cache_file.exists():
+            try:
+                with open(cache_file, 'r') as f:
+                    self.results = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable optimization cache {cache_file}: {e}")
+
+    @staticmethod
+    def make_key(strategy_name: str, params: Dict, base_config: Dict, fingerprint: str) -> str:
+        """Build a stable cache key"""
+        payload = json.dumps(
+            {'strategy': strategy_name, 'params': params, 'config': base_config, 'data': fingerprint},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.results.get(key)
+
+    def put(self, key: str, summary: Dict):
+        self.results[key] = summary
+
+    def save(self):
+        """Write cache atomically"""
+        if not self.cache_file:
+            return
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.results, f)
+        os.replace(tmp_file, self.cache_file)
+
+
+class ParameterSearch:
+    """
+    Evaluates parameter sets for one strategy against a prepared series
+
+    Candidates run in a ProcessPoolExecutor whose workers share the series
+    through shared memory; bad candidates stop early and finished results
+    are cached so repeated sweeps only evaluate new combinations.
+    """
+
+    def __init__(self, strategy_name: str, data: BacktestData, config: Optional[Dict] = None,
+                 backtest_config: Optional[Dict] = None, cache_file: Optional[Path] = None):
+        """
+        Initialize parameter search
+
+        Args:
+            strategy_name: Strategy short or display name ('technical', 'scalping')
+            data: Series prepared by Backtester.prepare
+            config: Overrides for DEFAULT_SEARCH_CONFIG
+            backtest_config: Base backtest config shared by every candidate
+            cache_file: Result cache file (None = no persistence)
+        """
+        _strategy_class(strategy_name)  # Fail fast on unsupported strategies
+        self.strategy_name = strategy_name
+        self.data = data
+        self.config = {**DEFAULT_SEARCH_CONFIG, **(config or {})}
+        self.backtest_config = backtest_config or {}
+        self.cache = ResultCache(cache_file)
+
+    @staticmethod
+    def grid(param_grid: Dict[str, List]) -> List[Dict]:
+        """
+        Expand a parameter grid
+
+        Args:
+            param_grid: Dictionary of parameter name -> candidate values
+
+        Returns:
+            List of parameter sets (cartesian product)
+        """
+        names = sorted(param_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*(param_grid[n] for n in names))]
+
+    @staticmethod
+    def random_samples(param_grid: Dict[str, List], n_samples: int, seed: int = 42) -> List[Dict]:
+        """
+        Sample distinct parameter sets from a grid
+
+        Args:
+            param_grid: Dictionary of parameter name -> candidate values
+            n_samples: Number of sets to draw
+            seed: Random seed
+
+        Returns:
+            List of parameter sets
+        """
+        candidates = ParameterSearch.grid(param_grid)
+        rng = random.Random(seed)
+        return rng.sample(candidates, min(n_samples, len(candidates)))
+
+    def run_tpe(self, param_grid: Dict[str, List], n_trials: int, batch_size: Optional[int] = None,
+                seed: int = 42) -> Dict:
+        """
+        Search a grid sequentially with a TPE sampler
+
+        Each round evaluates a batch of suggestions in parallel (see run())
+        and feeds the scores back into the sampler.
+
+        Args:
+            param_grid: Dictionary of parameter name -> candidate values
+            n_trials: Maximum number of candidates to evaluate
+            batch_size: Candidates per round (None = number of workers)
+            seed: Random seed
+
+        Returns:
+            Dictionary with best_params, best_score and ranked results (as run())
+        """
+        sampler = TPESampler(param_grid, seed=seed, **self.config['tpe'])
+        batch_size = batch_size or self.config['max_workers'] or os.cpu_count() or 1
+
+        history: List[Tuple[Dict, float]] = []
+        seen: Set[str] = set()
+        ranked, evaluated, cached, elapsed = [], 0, 0, 0.0
+        while len(history) < n_trials:
+            batch = sampler.suggest(history, min(batch_size, n_trials - len(history)), seen)
+            if not batch:
+                break
+            result = self.run(batch)
+            history.extend((r['params'], r['score']) for r in result['results'])
+            ranked.extend(result['results'])
+            evaluated += result['evaluated']
+            cached += result['cached']
+            elapsed += result['elapsed']
+
+        ranked.sort(key=lambda r: r['score'], reverse=True)
+        best = ranked[0] if ranked and ranked[0]['score'] != float('-inf') else None
+        return {
+            'strategy': self.strategy_name,
+            'best_params': best['params'] if best else None,
+            'best_score': best['score'] if best else None,
+            'evaluated': evaluated,
+            'cached': cached,
+            'elapsed': elapsed,
+            'results': ranked
+        }
+
+    def _score(self, summary: Dict) -> float:
+        """Objective value (higher is better); disqualified candidates score -inf"""
+        if summary.get('stopped_early') or summary.get('total_trades', 0) < self.config['min_trades']:
+            return float('-inf')
+        return float(summary.get(self.config['objective'], 0.0))
+
+    def run(self, candidates: List[Dict]) -> Dict:
+        """
+        Evaluate candidates and rank them
+
+        Args:
+            candidates: Parameter sets (see grid() / random_samples(); run_tpe() for
+                a sequential model-based search)
+
+        Returns:
+            Dictionary with best_params, best_score and ranked results
+        """
+        started = time.perf_counter()
+        shared = SharedSeries(self.data)
+        base_config = {**DEFAULT_BACKTEST_CONFIG, **self.backtest_config}
+
+        results = []
+        pending = []
+        for params in candidates:
+            key = self.cache.make_key(self.strategy_name, params, base_config, shared.fingerprint)
+            summary = self.cache.get(key)
+            if summary is not None:
+                results.append((params, summary))
+            else:
+                pending.append((key, params))
+        cached = len(results)
+
+        try:
+            tasks = [
+                (self.strategy_name, params, base_config, self.config['early_stopping'])
+                for _, params in pending
+            ]
+            workers = self.config['max_workers'] or os.cpu_count() or 1
+
+            if workers == 1 or len(tasks) <= 1:
+                _init_worker(shared.descriptor)
+                try:
+                    evaluated = [_evaluate(task) for task in tasks]
+                finally:
+                    _worker_state.pop('shm').close()
+                    _worker_state.clear()
+            else:
+                chunksize = max(1, len(tasks) // (workers * 4))
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(shared.descriptor,)) as executor:
+                    evaluated = list(executor.map(_evaluate, tasks, chunksize=chunksize))
+
+            for (key, _), (params, summary) in zip(pending, evaluated):
+                self.cache.put(key, summary)
+                results.append((params, summary))
+            self.cache.save()
+
+        finally:
+            shared.close()
+
+        ranked = sorted(
+            ({'params': params, 'score': self._score(summary), **summary} for params, summary in results),
+            key=lambda r: r['score'], reverse=True
+        )
+        best = ranked[0] if ranked and ranked[0]['score'] != float('-inf') else None
+        elapsed = time.perf_counter() - started
+
+        logger.info(
+            f"Parameter search for {self.strategy_name}: {len(candidates)} candidate(s), "
+            f"{cached} cached, {sum(1 for r in ranked if r.get('stopped_early'))} stopped early, "
+            f"{elapsed:.1f}s"
+        )
+
+        return {
+            'strategy': self.strategy_name,
+            'best_params': best['params'] if best else None,
+            'best_score': best['score'] if best else None,
+            'evaluated': len(pending),
+            'cached': cached,
+            'elapsed': elapsed,
+            'results': ranked
+        }
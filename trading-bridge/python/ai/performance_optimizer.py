@@ -3,14 +3,87 @@ Performance Optimizer
 Optimizes trading parameters using AI
 """
 import logging
+from collections import deque
 from typing import Dict, List, Optional
 from datetime import datetime
 from pathlib import Path
 import json
+import math
+import threading
 
 logger = logging.getLogger(__name__)
 
 
+class PerformanceStats:
+    """
+    Running trade statistics updated in O(1) per trade
+    """
+    
+    __slots__ = ('count', 'total', 'total_sq', 'wins', 'losses', 'max_profit',
+                 'min_profit', 'equity', 'peak', 'max_drawdown')
+    
+    def __init__(self):
+        """Initialize empty accumulators"""
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.wins = 0
+        self.losses = 0
+        self.max_profit = float('-inf')
+        self.min_profit = float('inf')
+        self.equity = 0.0
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+    
+    def add(self, profit: float):
+        """
+        Add one closed trade
+        
+        Args:
+            profit: Trade profit/loss
+        """
+        self.count += 1
+        self.total += profit
+        self.total_sq += profit * profit
+        if profit > 0:
+            self.wins += 1
+        elif profit < 0:
+            self.losses += 1
+        self.max_profit = max(self.max_profit, profit)
+        self.min_profit = min(self.min_profit, profit)
+        
+        self.equity += profit
+        if self.equity > self.peak:
+            self.peak = self.equity
+        self.max_drawdown = max(self.max_drawdown, self.peak - self.equity)
+    
+    def to_dict(self) -> Dict:
+        """Get statistics in analyze_performance format"""
+        if self.count == 0:
+            return {
+                'total_trades': 0,
+                'win_rate': 0.0,
+                'total_profit': 0.0,
+                'average_profit': 0.0,
+                'max_drawdown': 0.0
+            }
+        
+        mean = self.total / self.count
+        variance = max(self.total_sq / self.count - mean * mean, 0.0)
+        return {
+            'total_trades': self.count,
+            'winning_trades': self.wins,
+            'losing_trades': self.losses,
+            'win_rate': self.wins / self.count,
+            'total_profit': self.total,
+            'average_profit': mean,
+            'profit_std': math.sqrt(variance),
+            'max_profit': self.max_profit,
+            'min_profit': self.min_profit,
+            'max_drawdown': self.max_drawdown
+        }
+
+
 class PerformanceOptimizer:
     """
     AI-powered performance optimization
@@ -25,10 +98,34 @@ class PerformanceOptimizer:
             config: Configuration dictionary
         """
         self.config = config or {}
-        self.performance_history = []
+        self.performance_history = deque(maxlen=1000)  # Recent trades only
+        self.stats = {'all': PerformanceStats()}
+        self._stats_lock = threading.Lock()
         self.optimization_results = {}
         self.data_dir = Path(__file__).parent.parent.parent / "data" / "performance"
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._load_performance_data()
+    
+    def _record(self, entry: Dict):
+        """
+        Add one trade to the recent window and the running statistics
+        
+        Args:
+            entry: Performance entry
+        """
+        profit = entry.get('profit', 0) or 0.0
+        keys = ['all']
+        if entry.get('strategy'):
+            keys.append(('strategy', entry['strategy']))
+        if entry.get('symbol'):
+            keys.append(('symbol', entry['symbol']))
+        with self._stats_lock:
+            self.performance_history.append(entry)
+            for key in keys:
+                stats = self.stats.get(key)
+                if stats is None:
+                    stats = self.stats[key] = PerformanceStats()
+                stats.add(profit)
     
     def track_performance(self, trade_result: Dict):
         """
@@ -50,86 +147,55 @@ class PerformanceOptimizer:
                 **trade_result
             }
             
-            self.performance_history.append(performance_entry)
-            
-            # Keep only recent history (last 1000 trades)
-            if len(self.performance_history) > 1000:
-                self.performance_history = self.performance_history[-1000:]
+            # Update the recent window and running statistics overall, per strategy and per symbol
+            self._record(performance_entry)
             
-            # Save to file
-            self._save_performance_data()
+            # Append to file
+            self._save_performance_data(performance_entry)
             
-            logger.debug(f"Performance tracked: {trade_result.get('symbol')} - {trade_result.get('profit', 0):.2f}")
+            logger.debug(f"Performance tracked: {trade_result.get('symbol')} - "
+                         f"{trade_result.get('profit', 0) or 0.0:.2f}")
             
         except Exception as e:
             logger.error(f"Error tracking performance: {e}")
     
-    def analyze_performance(self, strategy_name: Optional[str] = None) -> Dict:
+    def analyze_performance(self, strategy_name: Optional[str] = None,
+                            symbol: Optional[str] = None, recent: bool = False) -> Dict:
         """
         Analyze trading performance
         
         Args:
             strategy_name: Optional strategy name to filter
+            symbol: Optional symbol to filter (ignored if strategy_name is given)
+            recent: Only use the last 1000 trades instead of the lifetime statistics
             
         Returns:
             Performance analysis dictionary
         """
         try:
-            if not self.performance_history:
-                return {
-                    'total_trades': 0,
-                    'win_rate': 0.0,
-                    'total_profit': 0.0,
-                    'average_profit': 0.0,
-                    'max_drawdown': 0.0
-                }
-            
-            # Filter by strategy if specified
-            trades = self.performance_history
             if strategy_name:
-                trades = [t for t in trades if t.get('strategy') == strategy_name]
-            
-            if not trades:
-                return {
-                    'total_trades': 0,
-                    'win_rate': 0.0,
-                    'total_profit': 0.0
-                }
-            
-            # Calculate metrics
-            total_trades = len(trades)
-            winning_trades = [t for t in trades if t.get('profit', 0) > 0]
-            losing_trades = [t for t in trades if t.get('profit', 0) < 0]
-            
-            win_rate = len(winning_trades) / total_trades if total_trades > 0 else 0.0
-            total_profit = sum([t.get('profit', 0) for t in trades])
-            average_profit = total_profit / total_trades if total_trades > 0 else 0.0
-            
-            # Calculate max drawdown
-            cumulative_profit = 0
-            peak = 0
-            max_drawdown = 0
-            
-            for trade in trades:
-                cumulative_profit += trade.get('profit', 0)
-                if cumulative_profit > peak:
-                    peak = cumulative_profit
-                drawdown = peak - cumulative_profit
-                if drawdown > max_drawdown:
-                    max_drawdown = drawdown
+                key = ('strategy', strategy_name)
+            elif symbol:
+                key = ('symbol', symbol)
+            else:
+                key = 'all'
             
-            return {
-                'total_trades': total_trades,
-                'winning_trades': len(winning_trades),
-                'losing_trades': len(losing_trades),
-                'win_rate': win_rate,
-                'total_profit': total_profit,
-                'average_profit': average_profit,
-                'max_profit': max([t.get('profit', 0) for t in trades]) if trades else 0.0,
-                'min_profit': min([t.get('profit', 0) for t in trades]) if trades else 0.0,
-                'max_drawdown': max_drawdown,
-                'strategy': strategy_name or 'all'
-            }
+            with self._stats_lock:
+                if recent:
+                    stats = PerformanceStats()
+                    for trade in self.performance_history:
+                        if (key == 'all' or (strategy_name and trade.get('strategy') == strategy_name)
+                                or (not strategy_name and trade.get('symbol') == symbol)):
+                            stats.add(trade.get('profit', 0) or 0.0)
+                else:
+                    stats = self.stats.get(key)
+                analysis = stats.to_dict() if stats else PerformanceStats().to_dict()
+            
+            if analysis['total_trades']:
+                analysis['strategy'] = strategy_name or 'all'
+                if symbol and not strategy_name:
+                    analysis['symbol'] = symbol
+            return analysis
             
         except Exception as e:
             logger.error(f"Error analyzing performance: {e}")
@@ -147,11 +213,11 @@ class PerformanceOptimizer:
             Optimized parameters dictionary
         """
         try:
-            # Analyze performance for this strategy
-            performance = self.analyze_performance(strategy_name)
+            # Analyze recent performance for this strategy
+            performance = self.analyze_performance(strategy_name, recent=True)
             
-            # Simple optimization based on performance
-            # TODO: Implement more sophisticated optimization (grid search, genetic algorithm, etc.)
+            # Simple optimization based on live performance
+            # (backtest-driven search over historical data: see search_parameters)
             optimized = parameters.copy()
             
             # Adjust based on win rate
@@ -186,13 +252,109 @@ class PerformanceOptimizer:
             logger.error(f"Error optimizing parameters: {e}")
             return parameters
     
-    def _save_performance_data(self):
-        """Save performance data to file"""
+    def search_parameters(self, strategy_name: str, param_grid: Dict[str, List],
+                          symbol: str, timeframe: str = "H1", method: str = "grid",
+                          n_samples: int = 100, bars=None) -> Dict:
+        """
+        Search strategy parameters by backtesting them on historical data
+        
+        Args:
+            strategy_name: Strategy name ('technical', 'scalping' or display name)
+            param_grid: Dictionary of parameter name -> candidate values, e.g.
+                rsi_oversold, rsi_overbought, bb_std, risk_reward_ratio, min_confidence
+            symbol: Trading symbol
+            timeframe: Timeframe
+            method: 'grid' (every combination), 'random' (n_samples combinations)
+                or 'tpe' (n_samples combinations chosen by a TPE model)
+            n_samples: Number of random / TPE combinations
+            bars: BAR_DTYPE array (None = load the full stored history)
+            
+        Returns:
+            Best parameters (empty dict if no candidate qualified)
+        """
+        try:
+            from .backtester import Backtester
+            from .parameter_search import ParameterSearch
+            
+            if bars is None:
+                from .utils.data_collector import DataCollector
+                bars = DataCollector().load_range(symbol, timeframe)
+            
+            search_config = self.config.get('parameter_search', {})
+            backtester = Backtester([], search_config.get('backtest', {}))
+            if len(bars) <= backtester.config['warmup_bars']:
+                logger.warning(f"Not enough history to optimize {strategy_name} on {symbol} {timeframe}")
+                return {}
+            
+            search = ParameterSearch(
+                strategy_name,
+                backtester.prepare(symbol, timeframe, bars),
+                config=search_config,
+                backtest_config=search_config.get('backtest', {}),
+                cache_file=self.data_dir / "optimization_cache.json"
+            )
+            if method == 'tpe':
+                result = search.run_tpe(param_grid, n_samples)
+            else:
+                if method == 'random':
+                    candidates = search.random_samples(param_grid, n_samples)
+                else:
+                    candidates = search.grid(param_grid)
+                result = search.run(candidates)
+            
+            self.optimization_results[strategy_name] = {
+                'timestamp': datetime.now().isoformat(),
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'method': method,
+                'optimized': result['best_params'],
+                'score': result['best_score'],
+                'evaluated': result['evaluated'],
+                'cached': result['cached'],
+                'top_results': [
+                    {k: v for k, v in r.items() if k != 'trades'} for r in result['results'][:10]
+                ]
+            }
+            
+            return result['best_params'] or {}
+            
+        except Exception as e:
+            logger.error(f"Error searching parameters: {e}")
+            return {}
+    
+    def _load_performance_data(self):
+        """Rebuild the recent window and running statistics from the saved performance files"""
+        loaded = 0
+        for performance_file in sorted(self.data_dir.glob("performance_*.ndjson")):
+            try:
+                with open(performance_file, 'r') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            self._record(json.loads(line))
+                            loaded += 1
+                        except ValueError:
+                            logger.warning(f"Skipping unreadable line in {performance_file.name}")
+            except OSError as e:
+                logger.error(f"Error loading performance data from {performance_file}: {e}")
+        
+        if loaded:
+            logger.info(f"Loaded {loaded} tracked trades from performance files")
+    
+    def _save_performance_data(self, entry: Dict):
+        """
+        Append one trade to today's performance file (one JSON object per line)
+        
+        Args:
+            entry: Performance entry
+        """
         try:
-            performance_file = self.data_dir / f"performance_{datetime.now().strftime('%Y%m%d')}.json"
+            performance_file = self.data_dir / f"performance_{datetime.now().strftime('%Y%m%d')}.ndjson"
             
-            with open(performance_file, 'w') as f:
-                json.dump(self.performance_history, f, indent=2)
+            with open(performance_file, 'a') as f:
+                f.write(json.dumps(entry, default=str) + '\n')
             
         except Exception as e:
             logger.error(f"Error saving performance data: {e}")
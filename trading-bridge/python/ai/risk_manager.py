@@ -3,12 +3,24 @@ AI Risk Manager
 Intelligent risk management using machine learning
 """
 import logging
+import math
 from typing import Dict, Optional, List
 from datetime import datetime
 
+import numpy as np
+
+from .utils.correlation import CorrelationTracker
+from .utils.risk_state import RiskState, PositionRecord, STATE_FILE, to_record
+from .utils.symbol_specs import get_symbol_specs
+
 logger = logging.getLogger(__name__)
 
 
+def _direction(action: Optional[str]) -> float:
+    """+1 for long, -1 for short exposure"""
+    return -1.0 if str(action).upper() == 'SELL' else 1.0
+
+
 class AIRiskManager:
     """
     AI-powered risk management
@@ -26,11 +38,35 @@ class AIRiskManager:
         self.max_risk_per_trade = self.config.get('max_risk_per_trade', 1.0)  # 1% default
         self.max_portfolio_risk = self.config.get('max_portfolio_risk', 5.0)  # 5% default
         self.min_confidence = self.config.get('min_confidence', 0.6)  # Minimum confidence to trade
-        self.active_positions = {}
+        self.atr_stop_multiplier = self.config.get('atr_stop_multiplier', 1.5)  # Stop distance in ATRs
+        self.stop_loss_percent = self.config.get('stop_loss_percent', 0.5)  # Stop distance without ATR
+        self.account_balance: Optional[float] = None  # Latest broker balance, used when none is passed
+        self.symbol_specs = get_symbol_specs()
         self.risk_history = []
+        
+        # Open positions keyed by position ID, restored from the last snapshot
+        self.state = RiskState(
+            path=self.config.get('risk_state_file', STATE_FILE),
+            risk_fn=self._position_risk
+        )
+        self.state.load()
+        
+        # Return correlations across traded symbols, updated once per bar
+        self.correlation_timeframe = self.config.get('correlation_timeframe', '1h')
+        self.correlation = CorrelationTracker(
+            halflife=self.config.get('correlation_halflife', 60),
+            min_observations=self.config.get('correlation_min_observations', 20)
+        )
+        self._portfolio_cache = None  # (key, symbols, weights, variance)
+    
+    @property
+    def active_positions(self) -> Dict[str, Dict]:
+        """Tracked positions as dictionaries keyed by position ID"""
+        return self.state.to_dict()
     
     def assess_risk(self, symbol: str, action: str, confidence: float, 
-                   account_balance: Optional[float] = None) -> Dict:
+                   account_balance: Optional[float] = None, price: Optional[float] = None,
+                   atr: Optional[float] = None) -> Dict:
         """
         Assess risk for a trading signal
         
@@ -39,6 +75,8 @@ class AIRiskManager:
             action: Trading action (BUY/SELL)
             confidence: Signal confidence (0-1)
             account_balance: Account balance (optional)
+            price: Latest close (optional; a live quote takes precedence, see _entry_levels)
+            atr: Latest average true range of the signal's timeframe (optional)
             
         Returns:
             Risk assessment dictionary:
@@ -66,10 +104,15 @@ class AIRiskManager:
                 }
             
             # Calculate position size
-            lot_size = self._calculate_position_size(symbol, action, confidence, risk_score, account_balance)
+            price, stop_distance = self._entry_levels(symbol, action, price, atr)
+            lot_size = self._calculate_position_size(
+                symbol, action, confidence, risk_score, account_balance, stop_distance
+            )
+            if lot_size <= 0.0:
+                return self._rejection(risk_score, 'Minimum lot would exceed the per-trade risk limit')
             
             # Calculate stop loss and take profit
-            result = self._calculate_stop_loss_take_profit(symbol, action, confidence)
+            result = self._calculate_stop_loss_take_profit(symbol, action, confidence, price, stop_distance)
             if len(result) == 3:
                 stop_loss, take_profit, risk_reward_ratio = result
             else:
@@ -77,7 +120,7 @@ class AIRiskManager:
                 risk_reward_ratio = 2.5  # Default R:R ratio
             
             # Check portfolio risk
-            portfolio_risk = self._check_portfolio_risk(symbol, lot_size)
+            portfolio_risk = self._check_portfolio_risk(symbol, lot_size, action)
             
             if portfolio_risk > self.max_portfolio_risk:
                 # Adjust lot size to stay within portfolio risk limit
@@ -90,6 +133,7 @@ class AIRiskManager:
                 'max_risk': self.max_risk_per_trade,
                 'stop_loss': stop_loss,
                 'take_profit': take_profit,
+                'entry_price': price,
                 'risk_reward_ratio': risk_reward_ratio if 'risk_reward_ratio' in locals() else 2.5,
                 'portfolio_risk': portfolio_risk,
                 'risk_reasoning': f'Risk assessment: score={risk_score:.2f}, confidence={confidence:.2f}, R:R={risk_reward_ratio if "risk_reward_ratio" in locals() else 2.5:.1f}',
@@ -108,6 +152,142 @@ class AIRiskManager:
                 'approved': False
             }
     
+    def assess_batch(self, signals: List[Dict], account_balance: Optional[float] = None) -> List[Dict]:
+        """
+        Assess all candidate signals of a cycle against one portfolio budget
+        
+        Signals are ranked by confidence per unit of risk score and the
+        remaining portfolio risk budget is allocated greedily: each signal
+        gets its full per-trade risk if the correlated portfolio risk stays
+        within max_portfolio_risk, otherwise the largest fraction that fits.
+        Outcomes therefore do not depend on the order signals arrive in.
+        
+        Args:
+            signals: Signal dictionaries (symbol, action, confidence and
+                optionally price and atr)
+            account_balance: Account balance (optional)
+            
+        Returns:
+            Risk assessments aligned with ``signals`` (same keys as
+            assess_risk, plus 'rank' and 'allocated_risk')
+        """
+        results: List[Optional[Dict]] = [None] * len(signals)
+        candidates = []
+        
+        for i, signal in enumerate(signals):
+            symbol = signal.get('symbol')
+            action = signal.get('action')
+            confidence = signal.get('confidence', 0.5)
+            try:
+                risk_score = self._calculate_risk_score(symbol, action, confidence)
+                if risk_score > 0.7 or confidence < self.min_confidence:
+                    results[i] = self._rejection(
+                        risk_score, 'Risk too high - trade not recommended' if risk_score > 0.7
+                        else f'Confidence {confidence:.2f} below minimum'
+                    )
+                    continue
+                
+                price, stop_distance = self._entry_levels(symbol, action, signal.get('price'), signal.get('atr'))
+                lot_size = self._calculate_position_size(
+                    symbol, action, confidence, risk_score, account_balance, stop_distance
+                )
+                if lot_size <= 0.0:
+                    results[i] = self._rejection(
+                        risk_score, 'Minimum lot would exceed the per-trade risk limit'
+                    )
+                    continue
+                stop_loss, take_profit, risk_reward_ratio = self._calculate_stop_loss_take_profit(
+                    symbol, action, confidence, price, stop_distance
+                )
+                candidates.append({
+                    'index': i,
+                    'symbol': symbol,
+                    'action': action,
+                    'confidence': confidence,
+                    'risk_score': risk_score,
+                    'lot_size': lot_size,
+                    'stop_loss': stop_loss,
+                    'take_profit': take_profit,
+                    'entry_price': price,
+                    'risk_reward_ratio': risk_reward_ratio
+                })
+            except Exception as e:
+                logger.error(f"Error in risk assessment for {symbol}: {e}")
+                results[i] = self._rejection(1.0, f'Risk assessment error: {str(e)}')
+        
+        # Best confidence per unit of risk first
+        candidates.sort(key=lambda c: c['confidence'] / max(c['risk_score'], 1e-6), reverse=True)
+        
+        symbols, weights, variance = self._portfolio_variance()
+        symbols = list(symbols)
+        weights = list(weights)
+        budget = self.max_portfolio_risk
+        
+        for rank, candidate in enumerate(candidates, start=1):
+            direction = _direction(candidate['action'])
+            requested = self.max_risk_per_trade
+            
+            # Largest risk t in [0, requested] with V + 2*t*d*c + t^2 <= budget^2
+            if symbols:
+                rho = self._effective_correlations(
+                    candidate['symbol'], symbols, direction, np.asarray(weights)
+                )
+                cross = direction * float(np.dot(rho, weights))
+            else:
+                cross = 0.0
+            discriminant = cross * cross - variance + budget * budget
+            allowed = -cross + math.sqrt(discriminant) if discriminant > 0 else 0.0
+            allocated = min(requested, max(allowed, 0.0))
+            
+            spec = self.symbol_specs.get(candidate['symbol'])
+            lot_size = spec.round_lot(candidate['lot_size'] * allocated / requested) if requested > 0 else 0.0
+            if lot_size <= 0.0:
+                result = self._rejection(candidate['risk_score'], 'Portfolio risk budget exhausted')
+                result['rank'] = rank
+                results[candidate['index']] = result
+                continue
+            
+            allocated = requested * lot_size / candidate['lot_size']
+            x = direction * allocated
+            variance += 2.0 * x * cross * direction + x * x
+            symbols.append(candidate['symbol'])
+            weights.append(x)
+            
+            if allocated < requested:
+                logger.warning(f"Adjusted lot size for {candidate['symbol']} due to portfolio risk limit")
+            
+            results[candidate['index']] = {
+                'risk_score': candidate['risk_score'],
+                'recommended_lot_size': lot_size,
+                'max_risk': self.max_risk_per_trade,
+                'stop_loss': candidate['stop_loss'],
+                'take_profit': candidate['take_profit'],
+                'entry_price': candidate['entry_price'],
+                'risk_reward_ratio': candidate['risk_reward_ratio'],
+                'portfolio_risk': math.sqrt(max(variance, 0.0)),
+                'allocated_risk': allocated,
+                'rank': rank,
+                'risk_reasoning': (f"Batch risk assessment: rank={rank}/{len(candidates)}, "
+                                   f"score={candidate['risk_score']:.2f}, "
+                                   f"confidence={candidate['confidence']:.2f}, "
+                                   f"R:R={candidate['risk_reward_ratio']:.1f}"),
+                'approved': True
+            }
+        
+        return results
+    
+    def _rejection(self, risk_score: float, reasoning: str) -> Dict:
+        """Assessment for a signal that must not be traded"""
+        return {
+            'risk_score': risk_score,
+            'recommended_lot_size': 0.0,
+            'max_risk': 0.0,
+            'stop_loss': None,
+            'take_profit': None,
+            'risk_reasoning': reasoning,
+            'approved': False
+        }
+    
     def _calculate_risk_score(self, symbol: str, action: str, confidence: float) -> float:
         """
         Calculate risk score for a trade
@@ -127,17 +307,18 @@ class AIRiskManager:
         risk_score += (1.0 - confidence) * 0.3
         
         # Check for existing positions in same symbol
-        if symbol in self.active_positions:
+        if self.state.has_symbol(symbol):
             risk_score += 0.2  # Additional risk for multiple positions
         
         # Check correlation with existing positions
-        correlation_risk = self._check_correlation_risk(symbol)
+        correlation_risk = self._check_correlation_risk(symbol, action)
         risk_score += correlation_risk * 0.2
         
         return min(max(risk_score, 0.0), 1.0)
     
     def _calculate_position_size(self, symbol: str, action: str, confidence: float,
-                               risk_score: float, account_balance: Optional[float]) -> float:
+                               risk_score: float, account_balance: Optional[float],
+                               stop_distance: Optional[float] = None) -> float:
         """
         Calculate recommended position size
         
@@ -147,20 +328,37 @@ class AIRiskManager:
             confidence: Signal confidence
             risk_score: Risk score
             account_balance: Account balance
+            stop_distance: Entry to stop loss distance in price units (optional)
             
         Returns:
-            Recommended lot size
+            Recommended lot size; 0.0 when the exact risk-based size rounds
+            below the symbol's minimum lot (trading min_lot would risk more
+            than max_risk_per_trade)
         """
         # Base lot size
         base_lot_size = 0.01
+        spec = self.symbol_specs.get(symbol)
+        account_balance = account_balance or self.account_balance
+        exact = False
         
         if account_balance:
             # Calculate lot size based on account balance and risk
             risk_amount = account_balance * (self.max_risk_per_trade / 100)
-            # Simplified calculation (would need pip value, etc. for accurate calculation)
-            lot_size = risk_amount / 1000  # Simplified
-            lot_size = max(lot_size, 0.01)  # Minimum lot size
-            lot_size = min(lot_size, 10.0)  # Maximum lot size
+            lot_size = None
+            if stop_distance is None:
+                stop_distance = self._stop_distance(self.symbol_specs.get_price(symbol), None)
+            if stop_distance:
+                # Exact: amount lost at the stop for one lot, in the account currency
+                lot_size = self.symbol_specs.lot_size_for_risk(symbol, risk_amount, stop_distance)
+            if lot_size is not None:
+                exact = True
+                if lot_size <= 0.0:
+                    return 0.0
+            else:
+                # Simplified calculation until a price/conversion rate is known
+                lot_size = risk_amount / 1000
+                lot_size = min(lot_size, 10.0)  # Maximum lot size
+                lot_size = max(lot_size, spec.min_lot)  # Minimum lot size
         else:
             lot_size = base_lot_size
         
@@ -170,12 +368,68 @@ class AIRiskManager:
         # Adjust based on risk score (lower risk = can trade larger)
         lot_size = lot_size * (1.0 - risk_score * 0.5)
         
-        # Round to 2 decimal places
-        lot_size = round(lot_size, 2)
+        # Round down to the symbol's lot step
+        lot_size = spec.round_lot(lot_size)
+        if exact:
+            return lot_size  # 0.0 if scaling took it below the minimum lot
+        
+        return max(lot_size, spec.min_lot)  # Ensure minimum lot size
+    
+    def _entry_levels(self, symbol: str, action: str, price: Optional[float],
+                      atr: Optional[float]) -> tuple:
+        """
+        Reference entry price and stop distance for a new position
+        
+        The latest live quote is preferred (ask for buys, bid for sells):
+        the analysis close can be a bar old. The stop distance is widened to
+        clear the spread plus the broker's stops level, so the EA can place
+        the levels as received.
+        
+        Args:
+            symbol: Trading symbol
+            action: Trading action
+            price: Analysis close (used when no quote has been pushed)
+            atr: Latest average true range
+            
+        Returns:
+            Tuple of (entry price, stop distance); either may be None
+        """
+        quote = self.symbol_specs.get_quote(symbol)
+        if quote:
+            bid, ask = quote
+            price = ask if _direction(action) > 0 else bid
+            spread = ask - bid
+        else:
+            price = price or self.symbol_specs.get_price(symbol)
+            spread = 0.0
         
-        return max(lot_size, 0.01)  # Ensure minimum lot size
+        stop_distance = self._stop_distance(price, atr)
+        if stop_distance:
+            spec = self.symbol_specs.get(symbol)
+            stop_distance = max(stop_distance, spread + spec.min_stop_distance + spec.point)
+        return price, stop_distance
+    
+    def _stop_distance(self, price: Optional[float], atr: Optional[float]) -> Optional[float]:
+        """
+        Distance from entry to stop loss in price units
+        
+        Args:
+            price: Latest close
+            atr: Latest average true range
+            
+        Returns:
+            atr_stop_multiplier ATRs, stop_loss_percent of the price while no
+            ATR is available, or None without a price
+        """
+        if atr is not None and math.isfinite(atr) and atr > 0:
+            return atr * self.atr_stop_multiplier
+        if price:
+            return price * self.stop_loss_percent / 100
+        return None
     
-    def _calculate_stop_loss_take_profit(self, symbol: str, action: str, confidence: float) -> tuple:
+    def _calculate_stop_loss_take_profit(self, symbol: str, action: str, confidence: float,
+                                         price: Optional[float] = None,
+                                         stop_distance: Optional[float] = None) -> tuple:
         """
         Calculate stop loss and take profit levels
         
@@ -183,12 +437,15 @@ class AIRiskManager:
             symbol: Trading symbol
             action: Trading action
             confidence: Signal confidence
+            price: Reference entry price (see _entry_levels)
+            stop_distance: Entry to stop loss distance in price units
             
         Returns:
             Tuple of (stop_loss, take_profit, risk_reward_ratio)
-            Note: stop_loss and take_profit are None - they should be calculated
-            at execution time based on entry price. risk_reward_ratio is provided
-            for the EA to calculate TP from SL.
+            Note: stop_loss and take_profit are absolute prices rounded to the
+            symbol's digits, so the EA can place the order as received. They
+            are None if no price is known yet; the EA then falls back to its
+            own calculation.
         """
         # Default risk/reward ratios based on confidence
         # Higher confidence = better risk/reward ratio
@@ -199,50 +456,183 @@ class AIRiskManager:
         else:
             risk_reward_ratio = 2.0  # 1:2 ratio
         
-        # Return None for SL/TP prices - they will be calculated at execution time
-        # The risk_reward_ratio will be used by the EA to calculate TP from SL
-        # This is because we need the entry price to calculate absolute SL/TP prices
-        stop_loss = None  # Will be calculated at execution time based on entry price
-        take_profit = None  # Will be calculated at execution time: TP = Entry ± (SL_distance * R:R)
+        if not price or not stop_distance:
+            return None, None, risk_reward_ratio
+        
+        # TP = Entry ± (SL_distance * R:R)
+        direction = _direction(action)
+        digits = self.symbol_specs.get(symbol).digits
+        stop_loss = round(price - direction * stop_distance, digits)
+        take_profit = round(price + direction * stop_distance * risk_reward_ratio, digits)
         
         return stop_loss, take_profit, risk_reward_ratio
     
-    def _check_portfolio_risk(self, symbol: str, lot_size: float) -> float:
+    def _check_portfolio_risk(self, symbol: str, lot_size: float, action: str = 'BUY') -> float:
         """
         Check total portfolio risk
         
+        Position risks are combined through the return correlation matrix,
+        sqrt(w' R w) with signed risk weights, so offsetting or uncorrelated
+        positions count for less than the plain sum. Pairs without enough
+        history are treated as fully correlated in the same direction (the
+        plain sum).
+        
         Args:
             symbol: Trading symbol
             lot_size: Position size
+            action: Trading action of the new position
             
         Returns:
             Total portfolio risk percentage
         """
-        # Calculate current portfolio risk
-        current_risk = sum([pos.get('risk', 0.0) for pos in self.active_positions.values()])
-        
         # Add new position risk
         new_position_risk = self.max_risk_per_trade  # Simplified
-        total_risk = current_risk + new_position_risk
+        x = new_position_risk * _direction(action)
+        
+        symbols, weights, variance = self._portfolio_variance()
+        if not symbols:
+            return new_position_risk
+        
+        # Marginal change for one candidate: O(n) in the number of positions
+        rho = self._effective_correlations(symbol, symbols, x, weights)
+        variance += 2.0 * x * float(np.dot(rho, weights)) + x * x
+        
+        return math.sqrt(max(variance, 0.0))
+    
+    def _portfolio_variance(self) -> tuple:
+        """
+        Risk-weighted variance of the open positions (cached until positions
+        or correlations change)
         
-        return total_risk
+        Returns:
+            (symbols, signed risk weights, w' R w)
+        """
+        key = (self.state.version, self.correlation.version)
+        if self._portfolio_cache is not None and self._portfolio_cache[0] == key:
+            return self._portfolio_cache[1:]
+        
+        records = self.state.records()
+        symbols = [record.symbol for record in records]
+        weights = np.array([record.risk * _direction(record.action) for record in records])
+        variance = 0.0
+        if symbols:
+            matrix = self.correlation.correlation_matrix(symbols)
+            unknown = np.isnan(matrix)
+            matrix[unknown] = np.outer(np.sign(weights), np.sign(weights))[unknown]
+            variance = float(weights @ matrix @ weights)
+        
+        self._portfolio_cache = (key, symbols, weights, variance)
+        return symbols, weights, variance
+    
+    def _effective_correlations(self, symbol: str, symbols: List[str], x: float,
+                                weights: np.ndarray) -> np.ndarray:
+        """Correlations with unknown pairs replaced by same-direction 1.0"""
+        rho = self.correlation.correlations(symbol, symbols)
+        unknown = np.isnan(rho)
+        rho[unknown] = (np.sign(x) * np.sign(weights))[unknown]
+        return rho
     
-    def _check_correlation_risk(self, symbol: str) -> float:
+    def _check_correlation_risk(self, symbol: str, action: str = 'BUY') -> float:
         """
         Check correlation risk with existing positions
         
         Args:
             symbol: Trading symbol
+            action: Trading action
             
         Returns:
-            Correlation risk score (0-1)
+            Correlation risk score (0-1): the strongest correlation with an
+            open position in the same effective direction
         """
-        # TODO: Implement correlation analysis
-        # Check if symbol is highly correlated with existing positions
-        # Higher correlation = higher risk
+        records = self.state.records()
+        if not records:
+            return 0.0
+        
+        symbols = [record.symbol for record in records]
+        directions = np.array([_direction(record.action) for record in records])
         
-        # Placeholder
-        return 0.0
+        rho = self.correlation.correlations(symbol, symbols)
+        aligned = rho * directions * _direction(action)
+        aligned = aligned[~np.isnan(aligned)]
+        if aligned.size == 0:
+            return 0.0
+        return float(min(max(aligned.max(), 0.0), 1.0))
+    
+    def update_prices(self, bar_time: str, prices: Dict[str, float]) -> int:
+        """
+        Feed one bar of closes into the correlation tracker
+        
+        Args:
+            bar_time: Bar identifier
+            prices: Symbol -> close price
+            
+        Returns:
+            Number of symbols updated
+        """
+        return self.correlation.update(bar_time, prices)
+    
+    def _position_risk(self, record: PositionRecord) -> float:
+        """
+        Risk of an open position as a percentage of the account balance
+        
+        Args:
+            record: Tracked position
+            
+        Returns:
+            Amount lost at the stop loss, or max_risk_per_trade if the stop or
+            balance is unknown (0.0 once the stop is at or beyond entry)
+        """
+        if not (record.stop_loss and record.open_price and self.account_balance):
+            return self.max_risk_per_trade
+        distance = (record.open_price - record.stop_loss) * _direction(record.action)
+        if distance <= 0:
+            return 0.0
+        value = self.symbol_specs.value_per_lot(record.symbol, distance)
+        if value is None:
+            return self.max_risk_per_trade
+        return value * record.volume / self.account_balance * 100
+    
+    def reconcile_positions(self, positions: List, broker: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Reconcile tracked positions with a broker snapshot
+        
+        Args:
+            positions: Broker Position objects or EA position dictionaries
+            broker: Broker the snapshot is from (None = all positions)
+            
+        Returns:
+            Dictionary of 'added', 'updated' and 'removed' position IDs
+        """
+        return self.state.reconcile(positions, broker)
+    
+    def apply_execution(self, report: Dict) -> Optional[str]:
+        """
+        Apply an execution report (OPEN, MODIFY or CLOSE) from the EA
+        
+        Args:
+            report: Execution report dictionary (see RiskState.apply_execution)
+            
+        Returns:
+            'added', 'updated' or 'removed', or None if nothing changed
+        """
+        return self.state.apply_execution(report)
+    
+    def set_account_balance(self, balance: float):
+        """
+        Update the balance used for sizing and position risk
+        
+        Args:
+            balance: Account balance in the account currency
+        """
+        previous = self.account_balance
+        self.account_balance = balance
+        # Position risks are percentages of the balance
+        if not previous or abs(balance - previous) > previous * 0.01:
+            self.state.refresh_risk()
+    
+    def save_state(self) -> bool:
+        """Persist tracked positions if they changed"""
+        return self.state.save()
     
     def add_position(self, symbol: str, position_data: Dict):
         """
@@ -250,25 +640,23 @@ class AIRiskManager:
         
         Args:
             symbol: Trading symbol
-            position_data: Position information
-        """
-        self.active_positions[symbol] = {
-            'symbol': symbol,
-            'timestamp': datetime.now().isoformat(),
-            'risk': position_data.get('risk', 0.0),
-            'lot_size': position_data.get('lot_size', 0.0),
-            **position_data
-        }
+            position_data: Position information (position_id, action/type,
+                lot_size/volume, open_price, stop_loss, take_profit, risk)
+        """
+        record = to_record({'symbol': symbol, **position_data})
+        self.state.upsert(record, position_data.get('risk'))
     
-    def remove_position(self, symbol: str):
+    def remove_position(self, position_id: str):
         """
         Remove position from tracking
         
         Args:
-            symbol: Trading symbol
+            position_id: Position ID (a symbol removes every position on it)
         """
-        if symbol in self.active_positions:
-            del self.active_positions[symbol]
+        if not self.state.remove(position_id):
+            for record in self.state.records():
+                if record.symbol == position_id:
+                    self.state.remove(record.position_id)
     
     def get_portfolio_risk(self) -> Dict:
         """
@@ -277,15 +665,17 @@ class AIRiskManager:
         Returns:
             Portfolio risk information
         """
-        total_risk = sum([pos.get('risk', 0.0) for pos in self.active_positions.values()])
-        position_count = len(self.active_positions)
+        records = self.state.records()
+        total_risk = sum(record.risk for record in records)
+        position_count = len(records)
         
         return {
             'total_risk': total_risk,
             'max_allowed_risk': self.max_portfolio_risk,
             'position_count': position_count,
             'risk_percentage': (total_risk / self.max_portfolio_risk * 100) if self.max_portfolio_risk > 0 else 0,
-            'positions': list(self.active_positions.keys())
+            'positions': [record.position_id for record in records],
+            'symbols': sorted({record.symbol for record in records})
         }
 
 
@@ -45,8 +45,13 @@ class BaseStrategy(ABC):
         """
         Get list of required indicators for this strategy
         
+        Only indicators some active strategy (or the analyzer itself)
+        requires are computed, so every indicator read from
+        market_data['indicators'] must be declared here.
+        
         Returns:
-            List of indicator names
+            List of indicator names (see analyzers.indicators.INDICATOR_GRAPH
+            and INDICATOR_ALIASES)
         """
         pass
     
@@ -63,6 +68,10 @@ class BaseStrategy(ABC):
         required_fields = ['action', 'symbol', 'confidence']
         return all(field in signal for field in required_fields)
     
+    def close(self):
+        """Release resources held by the strategy (e.g. shared models)"""
+        pass
+    
     def get_status(self) -> Dict:
         """Get strategy status"""
         return {
@@ -5,10 +5,14 @@ Machine learning-based trading strategy
 from typing import Dict, Optional
 import logging
 from .base_strategy import BaseStrategy
+from .registry import register_strategy
+from ..utils.analysis_cache import get_analysis_cache
+from ..utils.feature_store import FEATURE_INDICATORS
 
 logger = logging.getLogger(__name__)
 
 
+@register_strategy('ml_strategy')
 class MLStrategy(BaseStrategy):
     """
     Machine learning-based trading strategy
@@ -23,8 +27,9 @@ class MLStrategy(BaseStrategy):
             config: Strategy configuration
         """
         super().__init__("ML Strategy", config)
-        self.price_predictor = None
-        self.signal_classifier = None
+        self._predictor_handle = None
+        self._classifier_handle = None
+        self.analysis_cache = get_analysis_cache()
         self._initialize_components()
     
     def _initialize_components(self):
@@ -32,13 +37,36 @@ class MLStrategy(BaseStrategy):
         try:
             from ai.models.price_predictor import PricePredictor
             from ai.models.signal_classifier import SignalClassifier
+            from ai.models.model_registry import get_model_registry, MODEL_DIR
             
-            self.price_predictor = PricePredictor()
-            self.signal_classifier = SignalClassifier()
+            # Share the engine's model instances instead of loading our own
+            registry = get_model_registry()
+            self._predictor_handle = registry.acquire(
+                'price_predictor', PricePredictor, str(MODEL_DIR / "price_predictor.npz")
+            )
+            self._classifier_handle = registry.acquire(
+                'signal_classifier', SignalClassifier, str(MODEL_DIR / "signal_classifier.pkl")
+            )
             
         except ImportError as e:
             logger.warning(f"ML components not available: {e}")
     
+    @property
+    def price_predictor(self):
+        """Current shared PricePredictor"""
+        return self._predictor_handle.model if self._predictor_handle else None
+    
+    @property
+    def signal_classifier(self):
+        """Current shared SignalClassifier"""
+        return self._classifier_handle.model if self._classifier_handle else None
+    
+    def close(self):
+        """Release the shared model references"""
+        for handle in (self._predictor_handle, self._classifier_handle):
+            if handle is not None:
+                handle.release()
+    
     def generate_signal(self, symbol: str, market_data: Dict) -> Optional[Dict]:
         """
         Generate trading signal using ML
@@ -54,15 +82,22 @@ class MLStrategy(BaseStrategy):
             return None
         
         try:
-            # Get price prediction
+            # Get price prediction (shared with the engine for this bar)
             timeframe = market_data.get('timeframe', 'H1')
-            prediction = self.price_predictor.predict(symbol, timeframe)
+            cache_key = self.analysis_cache.make_key(symbol, timeframe, market_data.get('bar_time'))
+            prediction = self.analysis_cache.get_or_compute(
+                cache_key, 'prediction',
+                lambda: self.price_predictor.predict(symbol, timeframe)
+            )
             
             if 'error' in prediction:
                 return None
             
             # Classify signal
-            signals = self.signal_classifier.classify(market_data, prediction)
+            signals = self.analysis_cache.get_or_compute(
+                cache_key, 'signals',
+                lambda: self.signal_classifier.classify(market_data, prediction)
+            )
             
             if not signals:
                 return None
@@ -91,8 +126,8 @@ class MLStrategy(BaseStrategy):
             return None
     
     def get_required_indicators(self) -> list:
-        """Get required indicators"""
-        return ['price', 'volume', 'prediction']
+        """Get required indicators (the signal classifier's features)"""
+        return list(FEATURE_INDICATORS)
 
 
 
@@ -0,0 +1,103 @@
+"""
+Strategy Registry
+Strategy plugins and the indicators the active strategies require
+"""
+import logging
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Set, Type
+
+from .base_strategy import BaseStrategy
+
+logger = logging.getLogger(__name__)
+
+# Config section name -> strategy class, in registration (import) order
+_PLUGINS: Dict[str, Type[BaseStrategy]] = {}
+
+
+def register_strategy(key: str) -> Callable[[Type[BaseStrategy]], Type[BaseStrategy]]:
+    """
+    Class decorator registering a strategy plugin
+
+    Args:
+        key: Configuration section of the strategy (e.g. 'technical_strategy')
+
+    Returns:
+        Decorator returning the class unchanged
+    """
+    def decorator(strategy_class: Type[BaseStrategy]) -> Type[BaseStrategy]:
+        _PLUGINS[key] = strategy_class
+        return strategy_class
+    return decorator
+
+
+def strategy_plugins() -> Dict[str, Type[BaseStrategy]]:
+    """Registered strategy classes keyed by configuration section"""
+    return dict(_PLUGINS)
+
+
+class StrategyRegistry:
+    """
+    Strategies in use by a service
+
+    Iterates like a list of strategies. ``required_indicators`` is the union
+    of what the active strategies declare, so the analyzer computes only
+    indicators some strategy reads.
+    """
+
+    def __init__(self):
+        """Initialize registry"""
+        self._strategies: Dict[str, BaseStrategy] = {}
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[BaseStrategy]:
+        return iter(list(self._strategies.values()))
+
+    def __len__(self) -> int:
+        return len(self._strategies)
+
+    def register(self, strategy: BaseStrategy):
+        """
+        Add a strategy (replaces one with the same name)
+
+        Args:
+            strategy: Strategy instance
+        """
+        with self._lock:
+            self._strategies[strategy.name] = strategy
+        logger.debug(f"Registered {strategy.name}: {strategy.get_required_indicators()}")
+
+    def unregister(self, name: str) -> bool:
+        """
+        Remove a strategy
+
+        Args:
+            name: Strategy name
+
+        Returns:
+            True if it was registered
+        """
+        with self._lock:
+            return self._strategies.pop(name, None) is not None
+
+    def get(self, name: str) -> Optional[BaseStrategy]:
+        """Get a strategy by name"""
+        return self._strategies.get(name)
+
+    def active(self) -> List[BaseStrategy]:
+        """Strategies that are currently active"""
+        return [strategy for strategy in self if strategy.is_active]
+
+    def required_indicators(self) -> Set[str]:
+        """
+        Indicators declared by the active strategies
+
+        Returns:
+            Indicator names (aliases are resolved by the indicator pipeline)
+        """
+        names = set()
+        for strategy in self.active():
+            try:
+                names.update(strategy.get_required_indicators() or ())
+            except Exception as e:
+                logger.error(f"Error reading indicators of {strategy.name}: {e}")
+        return names
@@ -5,10 +5,12 @@ Small time scalping strategy (5mn, 15mn, 30mn)
 from typing import Dict, Optional
 import logging
 from .base_strategy import BaseStrategy
+from .registry import register_strategy
 
 logger = logging.getLogger(__name__)
 
 
+@register_strategy('scalping_strategy')
 class ScalpingStrategy(BaseStrategy):
     """
     Scalping strategy for 5m, 15m, 30m timeframes
@@ -26,6 +28,16 @@ class ScalpingStrategy(BaseStrategy):
         self.indicators = ['RSI', 'STOCH', 'BB']
         self.scalping_timeframes = ['5m', '15m', '30m', 'M5', 'M15', 'M30']
 
+        # Tunable thresholds (see PerformanceOptimizer.search_parameters)
+        self.rsi_oversold = self.config.get('rsi_oversold', 30)
+        self.rsi_overbought = self.config.get('rsi_overbought', 70)
+        self.rsi_extreme_oversold = self.config.get('rsi_extreme_oversold', 20)
+        self.rsi_extreme_overbought = self.config.get('rsi_extreme_overbought', 80)
+        self.stoch_oversold = self.config.get('stoch_oversold', 20)
+        self.stoch_overbought = self.config.get('stoch_overbought', 80)
+        self.bb_tolerance = self.config.get('bb_tolerance', 0.0005)
+        self.min_confidence = self.config.get('min_confidence', 0.5)
+
     def generate_signal(self, symbol: str, market_data: Dict) -> Optional[Dict]:
         """
         Generate trading signal using scalping logic
@@ -54,11 +66,11 @@ class ScalpingStrategy(BaseStrategy):
             rsi = indicators.get('RSI')
             rsi_signal = 0 # -1 sell, 1 buy
             if rsi is not None:
-                if rsi < 30:
+                if rsi < self.rsi_oversold:
                     rsi_signal = 1
                     reasoning_parts.append(f'RSI oversold ({rsi:.1f})')
                     confidence += 0.3
-                elif rsi > 70:
+                elif rsi > self.rsi_overbought:
                     rsi_signal = -1
                     reasoning_parts.append(f'RSI overbought ({rsi:.1f})')
                     confidence += 0.3
@@ -70,11 +82,11 @@ class ScalpingStrategy(BaseStrategy):
                 k = stoch.get('k')
                 d = stoch.get('d')
                 if k is not None:
-                    if k < 20:
+                    if k < self.stoch_oversold:
                         stoch_signal = 1
                         reasoning_parts.append(f'Stoch oversold (K={k:.1f})')
                         confidence += 0.2
-                    elif k > 80:
+                    elif k > self.stoch_overbought:
                         stoch_signal = -1
                         reasoning_parts.append(f'Stoch overbought (K={k:.1f})')
                         confidence += 0.2
@@ -85,11 +97,11 @@ class ScalpingStrategy(BaseStrategy):
             if bb and close_price:
                 lower = bb.get('lower')
                 upper = bb.get('upper')
-                if lower and close_price <= lower * 1.0005: # Near or below lower band
+                if lower and close_price <= lower * (1 + self.bb_tolerance): # Near or below lower band
                     bb_signal = 1
                     reasoning_parts.append('Price at lower BB')
                     confidence += 0.2
-                elif upper and close_price >= upper * 0.9995: # Near or above upper band
+                elif upper and close_price >= upper * (1 - self.bb_tolerance): # Near or above upper band
                     bb_signal = -1
                     reasoning_parts.append('Price at upper BB')
                     confidence += 0.2
@@ -109,16 +121,16 @@ class ScalpingStrategy(BaseStrategy):
 
             # Special case: Strong RSI extreme
             if rsi is not None:
-                if rsi < 20 and signal_action != 'SELL':
+                if rsi < self.rsi_extreme_oversold and signal_action != 'SELL':
                     signal_action = 'BUY'
                     confidence = max(confidence, 0.7)
                     reasoning_parts.append('Extreme RSI oversold')
-                elif rsi > 80 and signal_action != 'BUY':
+                elif rsi > self.rsi_extreme_overbought and signal_action != 'BUY':
                     signal_action = 'SELL'
                     confidence = max(confidence, 0.7)
                     reasoning_parts.append('Extreme RSI overbought')
 
-            if signal_action != 'HOLD' and confidence >= 0.5:
+            if signal_action != 'HOLD' and confidence >= self.min_confidence:
                 signal = {
                     'action': signal_action,
                     'symbol': symbol,
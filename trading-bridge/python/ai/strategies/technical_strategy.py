@@ -5,10 +5,12 @@ AI-enhanced technical analysis trading strategy
 from typing import Dict, Optional
 import logging
 from .base_strategy import BaseStrategy
+from .registry import register_strategy
 
 logger = logging.getLogger(__name__)
 
 
+@register_strategy('technical_strategy')
 class TechnicalStrategy(BaseStrategy):
     """
     AI-enhanced technical analysis strategy
@@ -23,7 +25,12 @@ class TechnicalStrategy(BaseStrategy):
             config: Strategy configuration
         """
         super().__init__("Technical Analysis Strategy", config)
-        self.indicators = config.get('indicators', ['RSI', 'MACD', 'MA'])
+        self.indicators = self.config.get('indicators', ['RSI', 'MACD', 'MA'])
+
+        # Tunable thresholds (see PerformanceOptimizer.search_parameters)
+        self.rsi_oversold = self.config.get('rsi_oversold', 30)
+        self.rsi_overbought = self.config.get('rsi_overbought', 70)
+        self.min_signal_strength = self.config.get('min_signal_strength', 0.5)
     
     def generate_signal(self, symbol: str, market_data: Dict) -> Optional[Dict]:
         """
@@ -49,11 +56,11 @@ class TechnicalStrategy(BaseStrategy):
             # RSI analysis
             if 'RSI' in indicators:
                 rsi = indicators['RSI']
-                if rsi < 30:
+                if rsi < self.rsi_oversold:
                     signal_strength += 0.3
                     signal_action = 'BUY'
                     reasoning_parts.append('RSI oversold')
-                elif rsi > 70:
+                elif rsi > self.rsi_overbought:
                     signal_strength += 0.3
                     signal_action = 'SELL'
                     reasoning_parts.append('RSI overbought')
@@ -90,7 +97,7 @@ class TechnicalStrategy(BaseStrategy):
                 signal_strength += 0.2
             
             # Generate signal if strength is sufficient
-            if signal_strength >= 0.5:
+            if signal_strength >= self.min_signal_strength:
                 signal = {
                     'action': signal_action,
                     'symbol': symbol,
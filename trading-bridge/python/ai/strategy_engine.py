@@ -3,10 +3,13 @@ AI Strategy Engine
 Main AI coordinator for trading system
 """
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from .utils.analysis_cache import get_analysis_cache
+from .utils.feature_store import FEATURE_INDICATORS, get_feature_store, prediction_features
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +31,10 @@ class AIStrategyEngine:
         self.market_data = {}
         self.performance_history = []
         self.is_initialized = False
+        self.analysis_cache = get_analysis_cache()
+        self.feature_store = get_feature_store()
+        self.last_market_prices = {'bars': {}, 'latest': {}}  # From the latest analyze_batch
+        self.strategy_registry = None  # Service strategies whose indicators are computed
         
         # Initialize components
         self._initialize_components()
@@ -39,11 +46,20 @@ class AIStrategyEngine:
             from .analyzers.market_analyzer import AIMarketAnalyzer
             from .models.price_predictor import PricePredictor
             from .models.signal_classifier import SignalClassifier
+            from .models.model_registry import get_model_registry, MODEL_DIR
             from .risk_manager import AIRiskManager
             
             self.market_analyzer = AIMarketAnalyzer()
-            self.price_predictor = PricePredictor()
-            self.signal_classifier = SignalClassifier()
+            self.market_analyzer.set_indicator_requirements(self.required_indicators)
+            
+            # Models are shared process-wide and loaded on first use
+            registry = get_model_registry()
+            self._predictor_handle = registry.acquire(
+                'price_predictor', PricePredictor, str(MODEL_DIR / "price_predictor.npz")
+            )
+            self._classifier_handle = registry.acquire(
+                'signal_classifier', SignalClassifier, str(MODEL_DIR / "signal_classifier.pkl")
+            )
             self.risk_manager = AIRiskManager()
             
             self.is_initialized = True
@@ -54,6 +70,48 @@ class AIStrategyEngine:
             logger.warning("Running in limited mode - install AI dependencies")
             self.is_initialized = False
     
+    @property
+    def price_predictor(self):
+        """Current shared PricePredictor"""
+        return self._predictor_handle.model
+    
+    @property
+    def signal_classifier(self):
+        """Current shared SignalClassifier"""
+        return self._classifier_handle.model
+    
+    def set_live_source(self, source):
+        """
+        Analyze and predict from live bars
+        
+        Args:
+            source: Object with get_live_bars(symbol, timeframe, count), e.g.
+                DataCollector or SharedBarPlane
+        """
+        if not self.is_initialized:
+            return
+        from .models.price_predictor import set_bar_source
+        self.market_analyzer.set_live_source(source)
+        set_bar_source(source)
+    
+    def set_strategy_registry(self, registry):
+        """
+        Compute the indicators required by a service's strategies
+        
+        Args:
+            registry: StrategyRegistry
+        """
+        self.strategy_registry = registry
+    
+    def required_indicators(self) -> set:
+        """Indicators the engine and the registered strategies read"""
+        names = {'ATR'}  # Stop distances
+        if getattr(self.signal_classifier, 'is_trained', False):
+            names.update(FEATURE_INDICATORS)
+        if self.strategy_registry is not None:
+            names.update(self.strategy_registry.required_indicators())
+        return names
+    
     def analyze_market(self, symbol: str, timeframe: str = "H1") -> Dict:
         """
         AI-powered comprehensive market analysis
@@ -83,28 +141,7 @@ class AIStrategyEngine:
         try:
             # Use market analyzer
             analysis = self.market_analyzer.analyze(symbol, timeframe)
-            
-            # Get price prediction
-            prediction = self.price_predictor.predict(symbol, timeframe)
-            
-            # Classify signals
-            signals = self.signal_classifier.classify(analysis, prediction)
-            
-            # Combine results
-            result = {
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'timestamp': datetime.now().isoformat(),
-                'sentiment': analysis.get('sentiment', 'neutral'),
-                'trend': analysis.get('trend', {}),
-                'volatility': analysis.get('volatility', 0.0),
-                'prediction': prediction,
-                'signals': signals,
-                'confidence': self._calculate_confidence(analysis, prediction, signals)
-            }
-            
-            logger.debug(f"Market analysis completed for {symbol}")
-            return result
+            return self._combine_analysis(symbol, timeframe, analysis)
             
         except Exception as e:
             logger.error(f"Error in market analysis: {e}")
@@ -117,6 +154,184 @@ class AIStrategyEngine:
                 'confidence': 0.0
             }
     
+    def analyze_batch(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict]:
+        """
+        Analyze many (symbol, timeframe) pairs with one batched prediction
+        
+        Args:
+            pairs: List of (symbol, timeframe) tuples
+            
+        Returns:
+            Dictionary of (symbol, timeframe) -> market analysis
+        """
+        if not self.is_initialized:
+            return {pair: self.analyze_market(*pair) for pair in pairs}
+        
+        analyses = {}
+        for symbol, timeframe in pairs:
+            try:
+                analyses[(symbol, timeframe)] = self.market_analyzer.analyze(symbol, timeframe)
+            except Exception as e:
+                logger.error(f"Error analyzing {symbol} {timeframe}: {e}")
+        
+        # Single forward pass for every bar that has no prediction yet
+        windows = {}
+        cache_keys = {}
+        for pair, analysis in analyses.items():
+            cache_key = self.analysis_cache.make_key(pair[0], pair[1], analysis.get('bar_time'))
+            cache_keys[pair] = cache_key
+            if cache_key is None or self.analysis_cache.get(cache_key, 'prediction') is not None:
+                continue
+            closes = self.analysis_cache.get(cache_key, 'closes')
+            if closes is not None:
+                windows[pair] = closes
+        
+        if windows:
+            try:
+                predictions = self.price_predictor.predict_batch(windows)
+                for pair, prediction in predictions.items():
+                    if 'error' not in prediction:
+                        self.analysis_cache.put(cache_keys[pair], 'prediction', prediction)
+            except Exception as e:
+                logger.error(f"Error in batched price prediction: {e}")
+        
+        self.last_market_prices = self._market_prices(cache_keys, analyses)
+        self.update_market_prices(self.last_market_prices)
+        
+        # Score every pair with one classifier call when a trained model exists
+        pending = []
+        for pair, cache_key in cache_keys.items():
+            prediction = self.analysis_cache.get(cache_key, 'prediction')
+            if prediction is None or self.analysis_cache.get(cache_key, 'signals') is not None:
+                continue
+            self.feature_store.update(pair, prediction_features(prediction))
+            pending.append(pair)
+        
+        if pending:
+            try:
+                features, present = self.feature_store.matrix(pending)
+                batch_signals = self.signal_classifier.classify_batch(features)
+                if batch_signals is not None:
+                    for pair, signals in zip(present, batch_signals):
+                        self.analysis_cache.put(cache_keys[pair], 'signals', signals)
+            except Exception as e:
+                logger.error(f"Error in batched signal classification: {e}")
+        
+        results = {}
+        for pair in pairs:
+            if pair not in analyses:
+                results[pair] = {'error': 'Analysis failed', 'signals': [], 'confidence': 0.0}
+                continue
+            try:
+                results[pair] = self._combine_analysis(pair[0], pair[1], analyses[pair])
+            except Exception as e:
+                logger.error(f"Error in market analysis: {e}")
+                results[pair] = {'error': str(e), 'signals': [], 'confidence': 0.0}
+        return results
+    
+    def _market_prices(self, cache_keys: Dict, analyses: Dict) -> Dict:
+        """
+        Collect the prices the risk manager tracks from one batch of analyses
+        
+        Args:
+            cache_keys: (symbol, timeframe) -> analysis cache key
+            analyses: (symbol, timeframe) -> analyzer output
+            
+        Returns:
+            Dictionary with 'bars' (bar time -> symbol -> last completed close
+            on the correlation timeframe) and 'latest' (symbol -> latest close)
+        """
+        timeframe = self.risk_manager.correlation_timeframe
+        by_bar = {}
+        latest = {}
+        for (symbol, tf), analysis in analyses.items():
+            if 'close_price' in analysis:
+                latest[symbol] = float(analysis['close_price'])
+            if tf != timeframe or cache_keys.get((symbol, tf)) is None:
+                continue
+            closes = self.analysis_cache.get(cache_keys[(symbol, tf)], 'closes')
+            if closes is None or len(closes) == 0:
+                continue
+            # The analyzer drops the forming bar, so the last close is final and
+            # belongs to the analysis bar time
+            by_bar.setdefault(analysis['bar_time'], {})[symbol] = float(closes[-1])
+        return {'bars': by_bar, 'latest': latest}
+    
+    def update_market_prices(self, market_prices: Dict):
+        """
+        Feed prices into the risk manager: one joint correlation update per
+        bar time and the latest closes for currency conversion
+        
+        Args:
+            market_prices: Output of _market_prices (possibly merged across
+                analysis workers)
+        """
+        for bar_time, prices in market_prices.get('bars', {}).items():
+            try:
+                self.risk_manager.update_prices(bar_time, prices)
+            except Exception as e:
+                logger.error(f"Error updating correlations: {e}")
+        for symbol, price in market_prices.get('latest', {}).items():
+            self.risk_manager.symbol_specs.update_price(symbol, price)
+    
+    def _combine_analysis(self, symbol: str, timeframe: str, analysis: Dict) -> Dict:
+        """
+        Combine analyzer output with prediction and classification
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            analysis: AIMarketAnalyzer result
+            
+        Returns:
+            Market analysis dictionary
+        """
+        # Reuse results already computed for this bar
+        cache_key = self.analysis_cache.make_key(symbol, timeframe, analysis.get('bar_time'))
+        cached = self.analysis_cache.get(cache_key, 'result')
+        if cached is not None:
+            return cached
+        
+        # Get price prediction
+        prediction = self.analysis_cache.get_or_compute(
+            cache_key, 'prediction',
+            lambda: self._predict(symbol, timeframe, cache_key)
+        )
+        
+        # Classify signals
+        signals = self.analysis_cache.get_or_compute(
+            cache_key, 'signals',
+            lambda: self.signal_classifier.classify(analysis, prediction)
+        )
+        
+        # Combine results
+        result = {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'timestamp': datetime.now().isoformat(),
+            'bar_time': analysis.get('bar_time'),
+            'sentiment': analysis.get('sentiment', 'neutral'),
+            'trend': analysis.get('trend', {}),
+            'volatility': analysis.get('volatility', 0.0),
+            'close_price': analysis.get('close_price'),
+            'atr': analysis.get('indicators', {}).get('ATR'),
+            'prediction': prediction,
+            'signals': signals,
+            'confidence': self._calculate_confidence(analysis, prediction, signals)
+        }
+        self.analysis_cache.put(cache_key, 'result', result)
+        
+        logger.debug(f"Market analysis completed for {symbol}")
+        return result
+    
+    def _predict(self, symbol: str, timeframe: str, cache_key) -> Dict:
+        """Predict from the analyzer's cached closes when available"""
+        closes = self.analysis_cache.get(cache_key, 'closes')
+        if closes is not None:
+            pair = (symbol, timeframe)
+            return self.price_predictor.predict_batch({pair: closes})[pair]
+        return self.price_predictor.predict(symbol, timeframe)
+    
     def generate_signal(self, symbol: str, timeframe: str = "H1") -> Optional[Dict]:
         """
         Generate AI trading signal
@@ -163,7 +378,9 @@ class AIStrategyEngine:
             risk_assessment = self.risk_manager.assess_risk(
                 symbol=symbol,
                 action=best_signal.get('action'),
-                confidence=best_signal.get('confidence', 0.0)
+                confidence=best_signal.get('confidence', 0.0),
+                price=analysis.get('close_price'),
+                atr=analysis.get('atr')
             )
             
             # Build signal
@@ -190,7 +407,8 @@ class AIStrategyEngine:
         AI risk assessment for trading signal
         
         Args:
-            signal: Trading signal dictionary
+            signal: Trading signal dictionary (optional 'price' and 'atr'
+                give absolute stop loss / take profit levels)
             
         Returns:
             Risk assessment dictionary:
@@ -213,7 +431,9 @@ class AIStrategyEngine:
             return self.risk_manager.assess_risk(
                 symbol=signal.get('symbol'),
                 action=signal.get('action'),
-                confidence=signal.get('confidence', 0.5)
+                confidence=signal.get('confidence', 0.5),
+                price=signal.get('price'),
+                atr=signal.get('atr')
             )
         except Exception as e:
             logger.error(f"Error in risk assessment: {e}")
@@ -223,6 +443,82 @@ class AIStrategyEngine:
                 'max_risk': 1.0
             }
     
+    def assess_batch(self, signals: List[Dict]) -> List[Dict]:
+        """
+        AI risk assessment for all candidate signals of a cycle
+        
+        Args:
+            signals: Trading signal dictionaries
+            
+        Returns:
+            Risk assessments aligned with ``signals``
+        """
+        if not self.is_initialized:
+            return [self.assess_risk(signal) for signal in signals]
+        
+        try:
+            return self.risk_manager.assess_batch(signals)
+        except Exception as e:
+            logger.error(f"Error in batch risk assessment: {e}")
+            return [self.assess_risk(signal) for signal in signals]
+    
+    def set_account_balance(self, balance: float, currency: Optional[str] = None):
+        """
+        Update the account balance and currency used for position sizing
+        
+        Args:
+            balance: Account balance
+            currency: Account currency (optional)
+        """
+        if not self.is_initialized:
+            return
+        if currency:
+            self.risk_manager.symbol_specs.account_currency = currency
+        self.risk_manager.set_account_balance(balance)
+    
+    def reconcile_positions(self, positions: List, broker: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Reconcile the risk manager's positions with a broker snapshot
+        
+        Args:
+            positions: Broker Position objects or EA position dictionaries
+            broker: Broker the snapshot is from (None = all positions)
+            
+        Returns:
+            Dictionary of 'added', 'updated' and 'removed' position IDs
+        """
+        if not self.is_initialized:
+            return {'added': [], 'updated': [], 'removed': []}
+        try:
+            return self.risk_manager.reconcile_positions(positions, broker)
+        except Exception as e:
+            logger.error(f"Error reconciling positions: {e}")
+            return {'added': [], 'updated': [], 'removed': []}
+    
+    def apply_execution(self, report: Dict) -> Optional[str]:
+        """
+        Apply an execution report from the EA to the risk manager's positions
+        
+        Args:
+            report: Execution report dictionary
+            
+        Returns:
+            'added', 'updated' or 'removed', or None if nothing changed
+        """
+        if not self.is_initialized:
+            return None
+        try:
+            return self.risk_manager.apply_execution(report)
+        except Exception as e:
+            logger.error(f"Error applying execution report: {e}")
+            return None
+    
+    def save_risk_state(self) -> bool:
+        """Persist the risk manager's positions if they changed"""
+        if not self.is_initialized:
+            return False
+        return self.risk_manager.save_state()
+    
     def update_models(self, performance_data: Dict):
         """
         Update AI models based on performance data
@@ -245,12 +541,38 @@ class AIStrategyEngine:
             if len(self.performance_history) > 1000:
                 self.performance_history = self.performance_history[-1000:]
             
-            # Update models (implement retraining logic)
+            self.refresh_models()
+            
             logger.info("Performance data recorded for model updates")
             
         except Exception as e:
             logger.error(f"Error updating models: {e}")
     
+    def refresh_models(self) -> Dict[str, int]:
+        """
+        Hot-swap shared models whose trained files changed on disk
+        
+        Returns:
+            Dictionary of model name -> new version for swapped models
+        """
+        if not self.is_initialized:
+            return {}
+        try:
+            from .models.model_registry import get_model_registry
+            swapped = get_model_registry().refresh()
+            for name, version in swapped.items():
+                logger.info(f"Model {name} updated to version {version}")
+            return swapped
+        except Exception as e:
+            logger.error(f"Error refreshing models: {e}")
+            return {}
+    
+    def release_models(self):
+        """Release the engine's shared model references"""
+        for handle in (getattr(self, '_predictor_handle', None), getattr(self, '_classifier_handle', None)):
+            if handle is not None:
+                handle.release()
+    
     def _calculate_confidence(self, analysis: Dict, prediction: Dict, signals: List) -> float:
         """
         Calculate overall confidence score
@@ -286,12 +608,23 @@ class AIStrategyEngine:
             'initialized': self.is_initialized,
             'components': {
                 'market_analyzer': hasattr(self, 'market_analyzer'),
-                'price_predictor': hasattr(self, 'price_predictor'),
-                'signal_classifier': hasattr(self, 'signal_classifier'),
+                # Handle presence only; reading the model would load it
+                'price_predictor': getattr(self, '_predictor_handle', None) is not None,
+                'signal_classifier': getattr(self, '_classifier_handle', None) is not None,
                 'risk_manager': hasattr(self, 'risk_manager')
             },
-            'performance_history_size': len(self.performance_history)
+            'performance_history_size': len(self.performance_history),
+            'analysis_cache': self.analysis_cache.get_stats(),
+            'models': self._get_model_stats()
         }
+    
+    def _get_model_stats(self) -> Dict:
+        """Get shared model registry statistics"""
+        try:
+            from .models.model_registry import get_model_registry
+            return get_model_registry().get_stats()
+        except ImportError:
+            return {}
 
 
 
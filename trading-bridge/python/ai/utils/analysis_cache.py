@@ -0,0 +1,168 @@
+"""
+Analysis Cache
+Memoizes analysis, prediction and classification results per closed bar
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str]
+
+
+class AnalysisCache:
+    """
+    Bounded LRU cache keyed by (symbol, timeframe, last bar timestamp)
+
+    Each key holds named slots ('analysis', 'prediction', 'signals', ...)
+    so the engine and every strategy share the same objects for a bar
+    instead of recomputing them.
+    """
+
+    def __init__(self, max_size: int = 512):
+        """
+        Initialize analysis cache
+
+        Args:
+            max_size: Maximum number of (symbol, timeframe, bar) entries
+        """
+        self.max_size = max(1, max_size)
+        self._entries: 'OrderedDict[CacheKey, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(symbol: str, timeframe: str, bar_time: Optional[Any]) -> Optional[CacheKey]:
+        """
+        Build cache key
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            bar_time: Timestamp of the last closed bar
+
+        Returns:
+            Cache key or None if the bar timestamp is unknown
+        """
+        if bar_time is None:
+            return None
+        return (symbol, timeframe, str(bar_time))
+
+    def get(self, key: Optional[CacheKey], slot: str) -> Optional[Any]:
+        """
+        Get cached value
+
+        Args:
+            key: Cache key
+            slot: Slot name within the entry
+
+        Returns:
+            Cached value or None
+        """
+        if key is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or slot not in entry:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[slot]
+
+    def put(self, key: Optional[CacheKey], slot: str, value: Any):
+        """
+        Store value in cache
+
+        Args:
+            key: Cache key
+            slot: Slot name within the entry
+            value: Value to store
+        """
+        if key is None:
+            return
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {}
+                self._entries[key] = entry
+            entry[slot] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Optional[CacheKey], slot: str, compute: Callable[[], Any]) -> Any:
+        """
+        Get cached value or compute and store it
+
+        Args:
+            key: Cache key (None disables caching for this call)
+            slot: Slot name within the entry
+            compute: Callable producing the value on a miss
+
+        Returns:
+            Cached or freshly computed value
+        """
+        value = self.get(key, slot)
+        if value is not None:
+            return value
+
+        value = compute()
+        # Don't memoize failures so the next caller can retry
+        if not (isinstance(value, dict) and 'error' in value):
+            self.put(key, slot, value)
+        return value
+
+    def clear(self):
+        """Clear all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups > 0 else 0.0
+            }
+
+
+# Singleton instance
+_analysis_cache = None
+
+def get_analysis_cache() -> AnalysisCache:
+    """Get singleton instance of AnalysisCache"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisCache()
+        _register_metrics(_analysis_cache)
+    return _analysis_cache
+
+
+def _register_metrics(cache: AnalysisCache):
+    """Expose cache statistics through the metrics registry"""
+    registry = get_metrics_registry()
+    registry.counter('analysis_cache_hits', 'Analysis cache hits').set_function(
+        lambda: cache.get_stats()['hits'])
+    registry.counter('analysis_cache_misses', 'Analysis cache misses').set_function(
+        lambda: cache.get_stats()['misses'])
+    registry.gauge('analysis_cache_hit_ratio', 'Analysis cache hit ratio').set_function(
+        lambda: cache.get_stats()['hit_rate'])
+    registry.gauge('analysis_cache_entries', 'Bars held in the analysis cache').set_function(
+        lambda: cache.get_stats()['size'])
@@ -0,0 +1,148 @@
+"""
+Bar Reader
+NumPy views over memory-mapped historical bars
+"""
+import logging
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from .bar_store import BAR_DTYPE, BarStore, Timestamp, to_epoch
+
+logger = logging.getLogger(__name__)
+
+
+class BarReader:
+    """
+    Read-only OHLCV view over the memory-mapped partitions of a series
+
+    The reader keeps one read-only map per monthly partition, so opening it
+    copies nothing and writes nothing to disk. Time-range slices are views;
+    a column spanning several partitions is gathered into one array when it
+    is read (one field, not whole records).
+    """
+
+    def __init__(self, records: Union[np.ndarray, Sequence[np.ndarray]]):
+        """
+        Initialize bar reader
+
+        Args:
+            records: BAR_DTYPE array or memory map, or a list of them in time order
+        """
+        segments = [records] if isinstance(records, np.ndarray) else list(records)
+        for segment in segments:
+            if segment.dtype != BAR_DTYPE:
+                raise ValueError(f"Expected bar records with dtype {BAR_DTYPE}, got {segment.dtype}")
+        self.segments = [segment for segment in segments if len(segment)]
+
+    @classmethod
+    def from_store(cls, store: BarStore, symbol: str, timeframe: str) -> 'BarReader':
+        """
+        Open a reader over the full stored history
+
+        Args:
+            store: Bar store
+            symbol: Trading symbol
+            timeframe: Timeframe
+
+        Returns:
+            BarReader
+        """
+        return cls(store.partitions(symbol, timeframe))
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.segments)
+
+    @property
+    def records(self) -> np.ndarray:
+        """All bars as one array (a view when the data lies in one partition)"""
+        if not self.segments:
+            return np.empty(0, dtype=BAR_DTYPE)
+        if len(self.segments) == 1:
+            return self.segments[0]
+        return np.concatenate(self.segments)
+
+    def column(self, field: str) -> np.ndarray:
+        """
+        One column over every partition
+
+        Args:
+            field: Column name
+
+        Returns:
+            View when the data lies in one partition, else a gathered copy
+        """
+        if not self.segments:
+            return np.empty(0, dtype=BAR_DTYPE[field])
+        if len(self.segments) == 1:
+            return self.segments[0][field]
+        return np.concatenate([segment[field] for segment in self.segments])
+
+    @property
+    def time(self) -> np.ndarray:
+        """Bar open times (epoch seconds)"""
+        return self.column('time')
+
+    @property
+    def open(self) -> np.ndarray:
+        """Open prices"""
+        return self.column('open')
+
+    @property
+    def high(self) -> np.ndarray:
+        """High prices"""
+        return self.column('high')
+
+    @property
+    def low(self) -> np.ndarray:
+        """Low prices"""
+        return self.column('low')
+
+    @property
+    def close(self) -> np.ndarray:
+        """Close prices"""
+        return self.column('close')
+
+    @property
+    def volume(self) -> np.ndarray:
+        """Volumes"""
+        return self.column('volume')
+
+    def range(self, start: Timestamp = None, end: Timestamp = None) -> 'BarReader':
+        """
+        Narrow the reader to a time range (no copy)
+
+        Args:
+            start: Range start (inclusive)
+            end: Range end (inclusive)
+
+        Returns:
+            BarReader over the slices
+        """
+        start, end = to_epoch(start), to_epoch(end)
+        slices = []
+        for segment in self.segments:
+            times = segment['time']
+            lo = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+            hi = len(times) if end is None else int(np.searchsorted(times, end, side='right'))
+            if hi > lo:
+                slices.append(segment[lo:hi])
+        return BarReader(slices)
+
+    def windows(self, length: int, field: str = 'close', step: Optional[int] = None) -> np.ndarray:
+        """
+        Sliding windows over one column (no copy within one partition)
+
+        Args:
+            length: Window length in bars
+            field: Column name
+            step: Stride between windows (default 1)
+
+        Returns:
+            Read-only array of shape (windows, length)
+        """
+        column = self.column(field)
+        if len(column) < length:
+            return np.empty((0, length), dtype=column.dtype)
+        view = np.lib.stride_tricks.sliding_window_view(column, length)
+        return view[::step] if step else view
@@ -0,0 +1,351 @@
+"""
+Historical Bar Store
+Columnar on-disk OHLCV storage using memory-mapped NumPy records
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HISTORICAL_DIR = Path(__file__).parent.parent.parent.parent / "data" / "historical"
+
+# Fixed-width bar record (time is epoch seconds, UTC)
+BAR_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+Timestamp = Union[int, float, str, datetime, None]
+
+
+def to_epoch(value: Timestamp) -> Optional[int]:
+    """
+    Convert a timestamp to epoch seconds
+
+    Args:
+        value: Epoch seconds, ISO string or datetime
+
+    Returns:
+        Epoch seconds or None
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, str):
+        return to_epoch(datetime.fromisoformat(value.replace('Z', '+00:00')))
+    return int(value)
+
+
+def bars_to_array(bars: Iterable[Dict]) -> np.ndarray:
+    """
+    Convert OHLCV dictionaries to a BAR_DTYPE array
+
+    Args:
+        bars: Dictionaries with time/timestamp, open, high, low, close, volume
+
+    Returns:
+        Structured array sorted by time
+    """
+    bars = list(bars)
+    records = np.zeros(len(bars), dtype=BAR_DTYPE)
+    for i, bar in enumerate(bars):
+        records[i] = (
+            to_epoch(bar.get('time', bar.get('timestamp'))),
+            bar.get('open', 0.0),
+            bar.get('high', 0.0),
+            bar.get('low', 0.0),
+            bar.get('close', 0.0),
+            bar.get('volume', 0.0),
+        )
+    return np.sort(records, order='time', kind='stable')
+
+
+def array_to_bars(records: np.ndarray) -> List[Dict]:
+    """
+    Convert a BAR_DTYPE array to OHLCV dictionaries
+
+    Args:
+        records: Structured bar array
+
+    Returns:
+        List of dictionaries with an ISO 'timestamp'
+    """
+    return [
+        {
+            'timestamp': datetime.fromtimestamp(int(r['time']), tz=timezone.utc).isoformat(),
+            'open': float(r['open']),
+            'high': float(r['high']),
+            'low': float(r['low']),
+            'close': float(r['close']),
+            'volume': float(r['volume']),
+        }
+        for r in records
+    ]
+
+
+class BarStore:
+    """
+    Columnar historical bar store
+
+    Layout: ``{root}/{symbol}_{timeframe}/{YYYYMM}.bin`` files of BAR_DTYPE
+    records, plus an ``index.json`` sidecar with row counts and time bounds
+    per month. Appends write only new records; reads memory-map the
+    partitions that overlap the requested range.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize bar store
+
+        Args:
+            root: Storage root directory
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / f"{symbol}_{timeframe}"
+
+    def _load_index(self, series_dir: Path) -> Dict:
+        index_file = series_dir / "index.json"
+        if not index_file.exists():
+            return {'dtype': BAR_DTYPE.descr, 'partitions': {}}
+        with open(index_file, 'r') as f:
+            return json.load(f)
+
+    def _save_index(self, series_dir: Path, index: Dict):
+        # Write-then-rename so readers never see a partial index
+        tmp_file = series_dir / "index.json.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_file, series_dir / "index.json")
+
+    def append(self, symbol: str, timeframe: str, bars: Union[np.ndarray, Iterable[Dict]]) -> int:
+        """
+        Store bars; newer bars are appended, older ones (backfill) are merged
+        into their monthly partitions
+
+        Bars whose timestamp is already stored are skipped, so re-saving
+        overlapping data is cheap and live bars are not overwritten.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            bars: BAR_DTYPE array or OHLCV dictionaries
+
+        Returns:
+            Number of bars written
+        """
+        records = bars if isinstance(bars, np.ndarray) else bars_to_array(bars)
+        if len(records) == 0:
+            return 0
+        records = np.sort(records.astype(BAR_DTYPE, copy=False), order='time', kind='stable')
+
+        with self._lock:
+            series_dir = self._series_dir(symbol, timeframe)
+            series_dir.mkdir(parents=True, exist_ok=True)
+            index = self._load_index(series_dir)
+            partitions = index['partitions']
+
+            # Drop duplicate timestamps within the batch (keep the last one)
+            times = records['time']
+            records = records[np.append(times[1:] != times[:-1], True)]
+
+            inserted = 0
+            if partitions:
+                last_time = max(p['last'] for p in partitions.values())
+                older = records[records['time'] <= last_time]
+                records = records[records['time'] > last_time]
+                if len(older):
+                    inserted = self._merge_older(series_dir, partitions, older)
+            if len(records) == 0:
+                if inserted:
+                    self._save_index(series_dir, index)
+                    logger.debug(f"Inserted {inserted} older bars into {symbol} {timeframe}")
+                return inserted
+
+            months = records['time'].astype('datetime64[s]').astype('datetime64[M]')
+            for month in np.unique(months):
+                chunk = records[months == month]
+                name = str(month).replace('-', '')
+                partition = partitions.get(name, {'rows': 0, 'first': int(chunk['time'][0])})
+                with open(series_dir / f"{name}.bin", 'ab') as f:
+                    # Discard any torn write not recorded in the index
+                    f.truncate(partition['rows'] * BAR_DTYPE.itemsize)
+                    f.write(chunk.tobytes())
+
+                partition['rows'] += len(chunk)
+                partition['last'] = int(chunk['time'][-1])
+                partitions[name] = partition
+
+            self._save_index(series_dir, index)
+
+        logger.debug(f"Appended {len(records)} bars to {symbol} {timeframe}"
+                     f"{f' (and inserted {inserted} older)' if inserted else ''}")
+        return len(records) + inserted
+
+    def _merge_older(self, series_dir: Path, partitions: Dict, records: np.ndarray) -> int:
+        """
+        Merge bars older than the newest stored bar into their partitions (lock held)
+
+        Each affected month is rewritten to a temporary file and swapped in,
+        so readers still mapping the old file keep a consistent view.
+
+        Args:
+            series_dir: Series directory
+            partitions: Partition index (updated in place)
+            records: Sorted, de-duplicated bars
+
+        Returns:
+            Number of bars inserted (timestamps already stored are skipped)
+        """
+        inserted = 0
+        months = records['time'].astype('datetime64[s]').astype('datetime64[M]')
+        for month in np.unique(months):
+            chunk = records[months == month]
+            name = str(month).replace('-', '')
+            partition = partitions.get(name)
+            path = series_dir / f"{name}.bin"
+
+            if partition is not None and partition['rows']:
+                existing = np.fromfile(path, dtype=BAR_DTYPE, count=partition['rows'])
+                chunk = chunk[~np.isin(chunk['time'], existing['time'])]
+                if len(chunk) == 0:
+                    continue
+                merged = np.concatenate((existing, chunk))
+                merged = merged[np.argsort(merged['time'], kind='stable')]
+            else:
+                merged = chunk
+
+            tmp_file = series_dir / f"{name}.bin.tmp"
+            merged.tofile(tmp_file)
+            os.replace(tmp_file, path)
+            partitions[name] = {
+                'rows': len(merged),
+                'first': int(merged['time'][0]),
+                'last': int(merged['time'][-1])
+            }
+            inserted += len(chunk)
+        return inserted
+
+    def partitions(self, symbol: str, timeframe: str, start: Optional[int] = None,
+                   end: Optional[int] = None) -> List[np.memmap]:
+        """
+        Memory-map partitions overlapping a time range
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            start: Range start (epoch seconds, inclusive)
+            end: Range end (epoch seconds, inclusive)
+
+        Returns:
+            List of read-only memory maps in time order
+        """
+        series_dir = self._series_dir(symbol, timeframe)
+        index = self._load_index(series_dir)
+
+        maps = []
+        for name in sorted(index['partitions']):
+            partition = index['partitions'][name]
+            if start is not None and partition['last'] < start:
+                continue
+            if end is not None and partition['first'] > end:
+                continue
+            if partition['rows'] == 0:
+                continue
+            # Map only the rows recorded in the index (ignores a torn final write)
+            maps.append(np.memmap(series_dir / f"{name}.bin", dtype=BAR_DTYPE, mode='r',
+                                  shape=(partition['rows'],)))
+        return maps
+
+    def read(self, symbol: str, timeframe: str, start: Timestamp = None,
+             end: Timestamp = None) -> np.ndarray:
+        """
+        Read bars in a time range
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            start: Range start (inclusive)
+            end: Range end (inclusive)
+
+        Returns:
+            BAR_DTYPE array (a view when the range lies in one partition)
+        """
+        start, end = to_epoch(start), to_epoch(end)
+        slices = []
+        for records in self.partitions(symbol, timeframe, start, end):
+            times = records['time']
+            lo = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+            hi = len(records) if end is None else int(np.searchsorted(times, end, side='right'))
+            if hi > lo:
+                slices.append(records[lo:hi])
+
+        if not slices:
+            return np.empty(0, dtype=BAR_DTYPE)
+        if len(slices) == 1:
+            return slices[0]
+        return np.concatenate(slices)
+
+    def tail(self, symbol: str, timeframe: str, count: int) -> np.ndarray:
+        """
+        Read the most recent bars
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            count: Number of bars
+
+        Returns:
+            BAR_DTYPE array of at most ``count`` bars in time order
+        """
+        slices = []
+        remaining = count
+        # Map from the newest partition back until enough rows are covered
+        for records in reversed(self.partitions(symbol, timeframe)):
+            if remaining <= 0:
+                break
+            slices.append(records[-remaining:])
+            remaining -= len(slices[-1])
+
+        if not slices:
+            return np.empty(0, dtype=BAR_DTYPE)
+        if len(slices) == 1:
+            return slices[0]
+        return np.concatenate(slices[::-1])
+
+    def last_time(self, symbol: str, timeframe: str) -> Optional[int]:
+        """
+        Get timestamp of the last stored bar
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+
+        Returns:
+            Epoch seconds or None if empty
+        """
+        partitions = self._load_index(self._series_dir(symbol, timeframe))['partitions']
+        if not partitions:
+            return None
+        return max(p['last'] for p in partitions.values())
+
+    def get_info(self, symbol: str, timeframe: str) -> Dict:
+        """Get partition index for a series"""
+        return self._load_index(self._series_dir(symbol, timeframe))
@@ -0,0 +1,148 @@
+"""
+Correlation Tracker
+Exponentially weighted return covariance across traded symbols
+"""
+import logging
+import math
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class CorrelationTracker:
+    """
+    Incrementally maintained EWMA covariance of per-bar log returns
+
+    Each bar costs one rank-1 update of the observed symbols' block
+    (RiskMetrics-style, zero-mean returns). Correlation lookups for one
+    symbol against k others read k matrix entries, so per-signal checks are
+    O(k) instead of a full recompute.
+    """
+
+    def __init__(self, halflife: float = 60.0, min_observations: int = 20, capacity: int = 16):
+        """
+        Initialize tracker
+
+        Args:
+            halflife: Bars after which an observation's weight halves
+            min_observations: Joint returns needed before a correlation is reported
+            capacity: Initial number of symbol slots (grows as needed)
+        """
+        self.decay = 0.5 ** (1.0 / halflife)
+        self.min_observations = min_observations
+        self.index: Dict[str, int] = {}
+        self.cov = np.zeros((capacity, capacity))
+        self.counts = np.zeros((capacity, capacity), dtype=np.int64)
+        self.last_price = np.full(capacity, np.nan)
+        self.last_time: List[Optional[str]] = [None] * capacity
+        self.version = 0  # Incremented on every update, for caching derived values
+        self._lock = threading.Lock()
+
+    def _slot(self, symbol: str) -> int:
+        """Get (or allocate) a symbol's row/column"""
+        slot = self.index.get(symbol)
+        if slot is not None:
+            return slot
+
+        slot = len(self.index)
+        capacity = len(self.last_price)
+        if slot >= capacity:
+            grow = capacity
+            self.cov = np.pad(self.cov, ((0, grow), (0, grow)))
+            self.counts = np.pad(self.counts, ((0, grow), (0, grow)))
+            self.last_price = np.concatenate([self.last_price, np.full(grow, np.nan)])
+            self.last_time.extend([None] * grow)
+        self.index[symbol] = slot
+        return slot
+
+    def update(self, bar_time: str, prices: Dict[str, float]) -> int:
+        """
+        Add one bar of closing prices
+
+        Call once per bar with every symbol's close for that bar so returns
+        are observed jointly. Symbols already updated for ``bar_time`` are
+        ignored.
+
+        Args:
+            bar_time: Bar identifier (e.g. ISO open time)
+            prices: Symbol -> close price
+
+        Returns:
+            Number of symbols whose return was added
+        """
+        with self._lock:
+            slots = []
+            returns = []
+            for symbol, price in prices.items():
+                if price is None or not price > 0:
+                    continue
+                slot = self._slot(symbol)
+                if self.last_time[slot] == bar_time:
+                    continue
+                previous = self.last_price[slot]
+                self.last_price[slot] = price
+                self.last_time[slot] = bar_time
+                if not np.isnan(previous):
+                    slots.append(slot)
+                    returns.append(math.log(price / previous))
+
+            if not slots:
+                return 0
+
+            idx = np.asarray(slots, dtype=np.intp)
+            r = np.asarray(returns)
+            block = np.ix_(idx, idx)
+            self.cov[block] = self.decay * self.cov[block] + (1.0 - self.decay) * np.outer(r, r)
+            self.counts[block] += 1
+            self.version += 1
+            return len(slots)
+
+    def correlations(self, symbol: str, others: Sequence[str]) -> np.ndarray:
+        """
+        Correlations of one symbol with several others
+
+        Args:
+            symbol: Reference symbol
+            others: Symbols to compare against
+
+        Returns:
+            Array aligned with ``others``; NaN where history is insufficient
+            (1.0 for the symbol itself)
+        """
+        result = np.full(len(others), np.nan)
+        i = self.index.get(symbol)
+        if i is not None and len(others):
+            j = np.array([self.index.get(other, -1) for other in others], dtype=np.intp)
+            valid = j >= 0
+            j_valid = j[valid]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rho = self.cov[i, j_valid] / np.sqrt(self.cov[i, i] * self.cov[j_valid, j_valid])
+            rho[self.counts[i, j_valid] < self.min_observations] = np.nan
+            result[valid] = np.clip(rho, -1.0, 1.0)
+        result[[k for k, other in enumerate(others) if other == symbol]] = 1.0
+        return result
+
+    def correlation_matrix(self, symbols: Sequence[str]) -> np.ndarray:
+        """
+        Correlation matrix for a set of symbols
+
+        Args:
+            symbols: Symbols (rows/columns in this order)
+
+        Returns:
+            Square array with NaN where history is insufficient
+        """
+        return np.vstack([self.correlations(symbol, symbols) for symbol in symbols]) \
+            if symbols else np.zeros((0, 0))
+
+    def get_status(self) -> Dict:
+        """Get tracker status"""
+        n = len(self.index)
+        return {
+            'symbols': list(self.index),
+            'updates': self.version,
+            'min_joint_observations': int(self.counts[:n, :n].min()) if n else 0
+        }
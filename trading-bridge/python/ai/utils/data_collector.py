@@ -7,6 +7,14 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
+import threading
+import time
+
+import numpy as np
+
+from .bar_store import BAR_DTYPE, HISTORICAL_DIR, BarStore, array_to_bars, to_epoch
+from .bar_reader import BarReader
+from .realtime_bars import BarAggregator, iter_ticks
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +32,22 @@ class DataCollector:
             config: Configuration dictionary
         """
         self.config = config or {}
-        self.data_dir = Path(__file__).parent.parent.parent.parent / "data" / "historical"
+        self.data_dir = HISTORICAL_DIR
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.bar_store = BarStore(self.data_dir)
         self.collected_data = {}
+        
+        # Real-time ingestion: ticks -> bounded per-symbol bar buffers -> batched store writes
+        realtime_config = self.config.get('realtime', {})
+        self.aggregator = BarAggregator(realtime_config.get('buffer_size', 1000))
+        self.flush_size = realtime_config.get('flush_size', 50)
+        self.flush_interval = realtime_config.get('flush_interval', 60)
+        self._last_flush = time.monotonic()
+        self._flush_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._writer_stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self.last_tick_received: Dict[str, float] = {}  # symbol -> time.monotonic()
     
     def collect_historical_data(self, symbol: str, timeframe: str = "H1", 
                                periods: int = 1000) -> List[Dict]:
@@ -59,22 +80,133 @@ class DataCollector:
             logger.error(f"Error collecting historical data: {e}")
             return []
     
-    def collect_realtime_data(self, symbol: str, timeframe: str = "H1"):
+    def collect_realtime_data(self, symbol: str, timeframe: str = "H1") -> bool:
         """
-        Collect real-time market data
+        Start collecting real-time market data
+        
+        Ticks pushed by the EA (see ingest_ticks) are aggregated into bars for
+        every registered symbol/timeframe. The bar buffer is seeded from the
+        stored history so live analysis does not wait for it to fill.
         
         Args:
             symbol: Trading symbol
             timeframe: Timeframe
+            
+        Returns:
+            True if the symbol/timeframe is being collected
         """
         try:
-            # TODO: Implement real-time data streaming
-            # This should continuously collect and store real-time price data
-            
-            logger.debug(f"Collecting real-time data: {symbol} {timeframe}")
+            registered = self.aggregator.register(symbol, timeframe)
+            if registered:
+                history = self.bar_store.tail(symbol, timeframe, self.aggregator.capacity)
+                seeded = self.aggregator.seed(symbol, timeframe, history)
+                logger.debug(f"Collecting real-time data: {symbol} {timeframe} ({seeded} stored bars)")
+            return registered
             
         except Exception as e:
             logger.error(f"Error collecting real-time data: {e}")
+            return False
+    
+    def ingest_ticks(self, ticks: List[Dict]) -> int:
+        """
+        Aggregate a batch of ticks into bars
+        
+        Args:
+            ticks: Tick dictionaries (symbol, time, bid/ask or price, volume)
+            
+        Returns:
+            Number of ticks accepted
+        """
+        accepted = 0
+        received_at = time.monotonic()
+        for symbol, timestamp, price, volume in iter_ticks(ticks):
+            self.aggregator.add_tick(symbol, timestamp, price, volume)
+            self.last_tick_received[symbol] = received_at
+            accepted += 1
+        
+        if self._writer is not None:
+            # Disk writes happen on the writer thread, not the bridge thread
+            if self.aggregator.pending_count() >= self.flush_size:
+                self._flush_requested.set()
+        elif (self.aggregator.pending_count() >= self.flush_size or
+                time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+        
+        return accepted
+    
+    def start_writer(self):
+        """Flush completed bars from a background thread every flush_interval"""
+        if self._writer is not None:
+            return
+        self._writer_stop.clear()
+        self._writer = threading.Thread(target=self._writer_loop, name='bar-writer', daemon=True)
+        self._writer.start()
+    
+    def stop_writer(self):
+        """Stop the writer thread and flush what is left"""
+        writer = self._writer
+        if writer is not None:
+            self._writer_stop.set()
+            self._flush_requested.set()
+            writer.join(timeout=10)
+            self._writer = None
+        self.flush()
+    
+    def _writer_loop(self):
+        """Background writer: flush on request (flush_size) or every flush_interval"""
+        while not self._writer_stop.is_set():
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            self.flush()
+    
+    def flush(self) -> int:
+        """
+        Write completed real-time bars to the bar store
+        
+        Returns:
+            Number of bars written
+        """
+        with self._flush_lock:
+            written = 0
+            for (symbol, timeframe), records in self.aggregator.drain_pending().items():
+                try:
+                    written += self.bar_store.append(symbol, timeframe, records)
+                except Exception as e:
+                    logger.error(f"Error flushing real-time bars for {symbol} {timeframe}: {e}")
+            self._last_flush = time.monotonic()
+        
+        if written:
+            logger.debug(f"Flushed {written} real-time bars")
+        return written
+    
+    def publish_to(self, plane):
+        """
+        Mirror real-time bars into a shared-memory plane read by other processes
+        
+        Bars already buffered are copied first; afterwards every bar update
+        is written as it happens.
+        
+        Args:
+            plane: SharedBarPlane created by this (the single writing) process
+        """
+        for (symbol, timeframe) in list(self.aggregator.rings):
+            for bar in self.aggregator.get_bars(symbol, timeframe, include_partial=False):
+                plane.publish((symbol, timeframe), bar, None)
+        self.aggregator.listener = plane.publish
+    
+    def get_live_bars(self, symbol: str, timeframe: str, count: Optional[int] = None) -> np.ndarray:
+        """
+        Get the most recent bars from the real-time buffer
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            count: Number of bars (None = all buffered)
+            
+        Returns:
+            BAR_DTYPE array including the bar currently forming
+        """
+        return self.aggregator.get_bars(symbol, timeframe, count)
     
     def preprocess_data(self, raw_data: List[Dict]) -> List[Dict]:
         """
@@ -104,33 +236,28 @@ class DataCollector:
     
     def _save_data(self, symbol: str, timeframe: str, data: List[Dict]):
         """
-        Save collected data to file
+        Append collected data to the bar store
         
         Args:
             symbol: Trading symbol
             timeframe: Timeframe
-            data: Data to save
+            data: OHLCV dictionaries to save
         """
         try:
-            filename = f"{symbol}_{timeframe}_{datetime.now().strftime('%Y%m%d')}.json"
-            filepath = self.data_dir / filename
-            
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
-            
-            logger.debug(f"Saved data to {filepath}")
+            written = self.bar_store.append(symbol, timeframe, data)
+            logger.debug(f"Saved {written} bars for {symbol} {timeframe}")
             
         except Exception as e:
             logger.error(f"Error saving data: {e}")
     
     def load_data(self, symbol: str, timeframe: str, date: Optional[str] = None) -> List[Dict]:
         """
-        Load saved data
+        Load saved data for one day
         
         Args:
             symbol: Trading symbol
             timeframe: Timeframe
-            date: Date string (YYYYMMDD) or None for latest
+            date: Date string (YYYYMMDD) or None for today
             
         Returns:
             List of data dictionaries
@@ -139,46 +266,74 @@ class DataCollector:
             if date is None:
                 date = datetime.now().strftime('%Y%m%d')
             
-            filename = f"{symbol}_{timeframe}_{date}.json"
-            filepath = self.data_dir / filename
+            day_start = datetime.strptime(date, '%Y%m%d')
+            day_end = day_start + timedelta(days=1)
+            records = self.bar_store.read(symbol, timeframe, day_start, to_epoch(day_end) - 1)
             
-            if not filepath.exists():
-                logger.warning(f"Data file not found: {filepath}")
+            if len(records) == 0:
+                logger.warning(f"No data found for {symbol} {timeframe} on {date}")
                 return []
             
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            
-            logger.debug(f"Loaded {len(data)} data points from {filepath}")
-            return data
+            logger.debug(f"Loaded {len(records)} data points for {symbol} {timeframe} on {date}")
+            return array_to_bars(records)
             
         except Exception as e:
             logger.error(f"Error loading data: {e}")
             return []
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    
+    def load_range(self, symbol: str, timeframe: str, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> np.ndarray:
+        """
+        Load bars in a time range as a structured array
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            start: Range start (inclusive, None = first bar)
+            end: Range end (inclusive, None = last bar)
+            
+        Returns:
+            BAR_DTYPE array with time/open/high/low/close/volume fields
+        """
+        try:
+            return self.bar_store.read(symbol, timeframe, start, end)
+        except Exception as e:
+            logger.error(f"Error loading data range: {e}")
+            return np.empty(0, dtype=BAR_DTYPE)
+    
+    def open_reader(self, symbol: str, timeframe: str) -> BarReader:
+        """
+        Open a reader over the full stored history
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            
+        Returns:
+            BarReader over the read-only memory-mapped partitions
+        """
+        return BarReader.from_store(self.bar_store, symbol, timeframe)
+    
+    def migrate_legacy_json(self) -> int:
+        """
+        Import daily JSON files ({symbol}_{timeframe}_{YYYYMMDD}.json) into the bar store
+        
+        Migrated files are renamed with a .migrated suffix.
+        
+        Returns:
+            Number of bars imported
+        """
+        imported = 0
+        for filepath in sorted(self.data_dir.glob("*_*_*.json")):
+            try:
+                symbol, timeframe, _ = filepath.stem.rsplit('_', 2)
+                with open(filepath, 'r') as f:
+                    data = json.load(f)
+                imported += self.bar_store.append(symbol, timeframe, data)
+                filepath.rename(filepath.with_suffix('.json.migrated'))
+            except Exception as e:
+                logger.error(f"Error migrating {filepath}: {e}")
+        
+        if imported:
+            logger.info(f"Migrated {imported} bars from legacy JSON files")
+        return imported
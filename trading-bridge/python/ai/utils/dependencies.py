@@ -0,0 +1,52 @@
+"""
+Optional Dependency Helpers
+Probe heavy libraries without importing them
+"""
+import importlib
+import importlib.util
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_availability: Dict[str, bool] = {}
+
+
+def module_available(name: str) -> bool:
+    """
+    Check whether a module can be imported, without importing it
+
+    Args:
+        name: Top-level module name (e.g., 'tensorflow')
+
+    Returns:
+        True if the module is installed
+    """
+    if name not in _availability:
+        try:
+            _availability[name] = importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            _availability[name] = False
+    return _availability[name]
+
+
+def import_optional(name: str) -> Optional[Any]:
+    """
+    Import an optional module on first real use
+
+    Args:
+        name: Module name
+
+    Returns:
+        Imported module or None if unavailable
+    """
+    if not module_available(name.split('.')[0]):
+        return None
+
+    try:
+        return importlib.import_module(name)
+    except Exception as e:
+        # Installed but broken (e.g., missing native libraries)
+        logger.warning(f"Failed to import {name}: {e}")
+        _availability[name.split('.')[0]] = False
+        return None
@@ -0,0 +1,254 @@
+"""
+Feature Store
+Columnar per-symbol feature matrix for batched model scoring
+"""
+import logging
+import threading
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Fixed feature schema - column order is part of any trained model
+FEATURE_SCHEMA: Tuple[str, ...] = (
+    'rsi',
+    'macd_hist',
+    'bb_position',
+    'stoch_k',
+    'ema_spread',
+    'sentiment',
+    'trend_direction',
+    'trend_strength',
+    'volatility',
+    'prediction_direction',
+    'prediction_confidence',
+    'prediction_change_percent',
+)
+FEATURE_INDEX: Dict[str, int] = {name: i for i, name in enumerate(FEATURE_SCHEMA)}
+
+# Analyzer indicators the features are derived from
+FEATURE_INDICATORS: Tuple[str, ...] = ('RSI', 'MACD', 'BB', 'STOCH', 'EMA_50', 'EMA_200')
+
+_SENTIMENT = {'bullish': 1.0, 'bearish': -1.0}
+_DIRECTION = {'up': 1.0, 'down': -1.0}
+
+
+def indicator_features(analysis: Dict) -> Dict[str, float]:
+    """
+    Extract analyzer features
+
+    Args:
+        analysis: AIMarketAnalyzer result
+
+    Returns:
+        Dictionary of feature name -> value
+    """
+    indicators = analysis.get('indicators', {}) or {}
+    trend = analysis.get('trend', {}) or {}
+    features = {
+        'rsi': 0.0,
+        'macd_hist': 0.0,
+        'bb_position': 0.0,
+        'stoch_k': 0.0,
+        'ema_spread': 0.0,
+        'sentiment': _SENTIMENT.get(analysis.get('sentiment'), 0.0),
+        'trend_direction': _DIRECTION.get(trend.get('direction'), 0.0),
+        'trend_strength': trend.get('strength', 0.0),
+        'volatility': analysis.get('volatility', 0.0),
+    }
+
+    if indicators.get('RSI') is not None:
+        features['rsi'] = (indicators['RSI'] - 50.0) / 50.0
+
+    macd = indicators.get('MACD')
+    close = analysis.get('close_price')
+    if macd and macd.get('hist') is not None and close:
+        features['macd_hist'] = macd['hist'] / close * 1000.0
+
+    bb = indicators.get('BB')
+    if bb and close and bb.get('upper') is not None and bb.get('lower') is not None:
+        width = bb['upper'] - bb['lower']
+        if width > 0:
+            features['bb_position'] = (close - bb['lower']) / width * 2.0 - 1.0
+
+    stoch = indicators.get('STOCH')
+    if stoch and stoch.get('k') is not None:
+        features['stoch_k'] = (stoch['k'] - 50.0) / 50.0
+
+    ema_50 = indicators.get('EMA_50')
+    ema_200 = indicators.get('EMA_200')
+    if ema_50 is not None and ema_200:
+        features['ema_spread'] = (ema_50 - ema_200) / ema_200 * 100.0
+
+    return features
+
+
+def prediction_features(prediction: Dict) -> Dict[str, float]:
+    """
+    Extract price prediction features
+
+    Args:
+        prediction: PricePredictor result
+
+    Returns:
+        Dictionary of feature name -> value
+    """
+    return {
+        'prediction_direction': _DIRECTION.get(prediction.get('direction'), 0.0),
+        'prediction_confidence': prediction.get('confidence', 0.0),
+        'prediction_change_percent': prediction.get('price_change_percent', 0.0),
+    }
+
+
+def vectorize(analysis: Dict, prediction: Dict) -> np.ndarray:
+    """
+    Build one feature row outside the store (used for training)
+
+    Args:
+        analysis: Market analysis
+        prediction: Price prediction
+
+    Returns:
+        Array of shape (len(FEATURE_SCHEMA),) with missing features as 0
+    """
+    row = np.zeros(len(FEATURE_SCHEMA), dtype=np.float64)
+    for name, value in {**indicator_features(analysis), **prediction_features(prediction)}.items():
+        row[FEATURE_INDEX[name]] = value
+    return np.nan_to_num(row)
+
+
+def feature_matrix(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Build feature rows for a whole series at once (used for backtests)
+
+    Mirrors indicator_features/prediction_features column by column.
+
+    Args:
+        columns: Arrays keyed by 'RSI', 'MACD.hist', 'BB.upper', 'BB.lower',
+            'STOCH.k', 'EMA_50', 'EMA_200', 'close', 'sentiment',
+            'trend_direction', 'trend_strength', 'volatility',
+            'prediction_direction', 'prediction_confidence',
+            'prediction_change_percent' (missing arrays are treated as 0)
+
+    Returns:
+        Array of shape (rows, len(FEATURE_SCHEMA))
+    """
+    close = columns['close']
+    rows = np.zeros((len(close), len(FEATURE_SCHEMA)), dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if 'RSI' in columns:
+            rows[:, FEATURE_INDEX['rsi']] = (columns['RSI'] - 50.0) / 50.0
+        if 'MACD.hist' in columns:
+            rows[:, FEATURE_INDEX['macd_hist']] = columns['MACD.hist'] / close * 1000.0
+        if 'BB.upper' in columns and 'BB.lower' in columns:
+            width = columns['BB.upper'] - columns['BB.lower']
+            position = (close - columns['BB.lower']) / width * 2.0 - 1.0
+            rows[:, FEATURE_INDEX['bb_position']] = np.where(width > 0, position, 0.0)
+        if 'STOCH.k' in columns:
+            rows[:, FEATURE_INDEX['stoch_k']] = (columns['STOCH.k'] - 50.0) / 50.0
+        if 'EMA_50' in columns and 'EMA_200' in columns:
+            spread = (columns['EMA_50'] - columns['EMA_200']) / columns['EMA_200'] * 100.0
+            rows[:, FEATURE_INDEX['ema_spread']] = spread
+
+    for name in ('sentiment', 'trend_direction', 'trend_strength', 'volatility',
+                 'prediction_direction', 'prediction_confidence', 'prediction_change_percent'):
+        if name in columns:
+            rows[:, FEATURE_INDEX[name]] = columns[name]
+
+    return np.nan_to_num(rows, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+class FeatureStore:
+    """
+    Columnar feature store
+
+    One row per (symbol, timeframe) and one column per FEATURE_SCHEMA entry,
+    updated in place as the indicator pipeline and predictor produce values.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Initialize feature store
+
+        Args:
+            capacity: Initial number of rows (grows as needed)
+        """
+        self.values = np.zeros((capacity, len(FEATURE_SCHEMA)), dtype=np.float64)
+        self.updated_at = np.zeros(capacity, dtype=np.float64)
+        self.rows: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def _row(self, key: Hashable) -> int:
+        """Get or allocate row index for key (caller holds lock)"""
+        row = self.rows.get(key)
+        if row is None:
+            row = len(self.rows)
+            if row >= self.values.shape[0]:
+                capacity = self.values.shape[0] * 2
+                self.values = np.resize(self.values, (capacity, len(FEATURE_SCHEMA)))
+                self.values[row:] = 0.0
+                self.updated_at = np.resize(self.updated_at, capacity)
+                self.updated_at[row:] = 0.0
+            self.rows[key] = row
+        return row
+
+    def update(self, key: Hashable, features: Dict[str, float], timestamp: float = 0.0):
+        """
+        Update features for a key in place
+
+        Args:
+            key: Row key, usually (symbol, timeframe)
+            features: Dictionary of feature name -> value (unknown names ignored)
+            timestamp: Update time (epoch seconds)
+        """
+        with self._lock:
+            row = self._row(key)
+            for name, value in features.items():
+                column = FEATURE_INDEX.get(name)
+                if column is not None and value is not None:
+                    self.values[row, column] = value
+            if timestamp:
+                self.updated_at[row] = timestamp
+
+    def matrix(self, keys: List[Hashable]) -> Tuple[np.ndarray, List[Hashable]]:
+        """
+        Gather feature rows for scoring
+
+        Args:
+            keys: Keys to include
+
+        Returns:
+            Tuple of (feature matrix, keys present in the store)
+        """
+        with self._lock:
+            present = [key for key in keys if key in self.rows]
+            indexes = np.fromiter((self.rows[key] for key in present), dtype=np.intp, count=len(present))
+            return np.nan_to_num(self.values[indexes]), present
+
+    def get(self, key: Hashable) -> Optional[Dict[str, float]]:
+        """
+        Get features for a key as a dictionary
+
+        Args:
+            key: Row key
+
+        Returns:
+            Dictionary of feature name -> value or None
+        """
+        with self._lock:
+            row = self.rows.get(key)
+            if row is None:
+                return None
+            return dict(zip(FEATURE_SCHEMA, self.values[row].tolist()))
+
+
+# Singleton instance
+_feature_store = None
+
+def get_feature_store() -> FeatureStore:
+    """Get singleton instance of FeatureStore"""
+    global _feature_store
+    if _feature_store is None:
+        _feature_store = FeatureStore()
+    return _feature_store
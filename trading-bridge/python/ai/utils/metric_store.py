@@ -0,0 +1,169 @@
+"""
+Metric Store
+Fixed-size numeric ring buffers and per-minute aggregate buckets
+"""
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class NumericRing:
+    """
+    Ring buffer of numeric records with an epoch 'time' column
+
+    Records are stored column-wise in one float64 array so window statistics
+    are vectorized over at most ``capacity`` rows.
+    """
+
+    def __init__(self, fields: Sequence[str], capacity: int = 1000):
+        """
+        Initialize ring
+
+        Args:
+            fields: Numeric field names (besides 'time')
+            capacity: Maximum number of records kept
+        """
+        self.fields = ('time',) + tuple(fields)
+        self.index = {name: i for i, name in enumerate(self.fields)}
+        self.capacity = capacity
+        self.values = np.full((capacity, len(self.fields)), np.nan)
+        self.head = 0
+        self.count = 0
+
+    def append(self, timestamp: float, **values: float):
+        """
+        Append a record (missing fields are NaN)
+
+        Args:
+            timestamp: Epoch seconds
+            **values: Field values
+        """
+        row = self.values[self.head]
+        row[:] = np.nan
+        row[0] = timestamp
+        for name, value in values.items():
+            if value is not None:
+                row[self.index[name]] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a field over the stored records (unordered view)"""
+        return self.values[:self.count, self.index[name]]
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class MinuteBuckets:
+    """
+    Pre-aggregated per-minute sums over a fixed retention window
+
+    Each slot holds the sums for one wall-clock minute; a slot is reset when
+    its minute is reused, so window totals are a sum over at most
+    ``retention_minutes`` slots regardless of event volume.
+    """
+
+    def __init__(self, fields: Sequence[str], retention_minutes: int = 1440):
+        """
+        Initialize buckets
+
+        Args:
+            fields: Summed field names
+            retention_minutes: Number of minutes retained
+        """
+        self.fields = tuple(fields)
+        self.index = {name: i for i, name in enumerate(self.fields)}
+        self.retention = retention_minutes
+        self.minutes = np.full(retention_minutes, -1, dtype=np.int64)
+        self.sums = np.zeros((retention_minutes, len(self.fields)))
+
+    def add(self, timestamp: float, **values: float):
+        """
+        Add values to the bucket of a timestamp
+
+        Args:
+            timestamp: Epoch seconds
+            **values: Field increments
+        """
+        minute = int(timestamp // 60)
+        slot = minute % self.retention
+        if self.minutes[slot] != minute:
+            self.minutes[slot] = minute
+            self.sums[slot] = 0.0
+        for name, value in values.items():
+            if value is not None:
+                self.sums[slot, self.index[name]] += value
+
+    def totals(self, window_seconds: float, now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Sum buckets within a trailing window
+
+        Args:
+            window_seconds: Window length (capped at the retention)
+            now: Current epoch seconds (defaults to time.time())
+
+        Returns:
+            Dictionary of field -> total
+        """
+        now_minute = int((now if now is not None else time.time()) // 60)
+        first_minute = now_minute - int(window_seconds // 60)
+        mask = (self.minutes > first_minute) & (self.minutes <= now_minute)
+        totals = self.sums[mask].sum(axis=0)
+        return dict(zip(self.fields, totals.tolist()))
+
+
+class NdjsonWriter:
+    """Buffers small records and appends them to a daily NDJSON file"""
+
+    def __init__(self, directory: Path, prefix: str, flush_size: int = 100):
+        """
+        Initialize writer
+
+        Args:
+            directory: Output directory
+            prefix: File name prefix ({prefix}_{YYYYMMDD}.ndjson)
+            flush_size: Buffered records that trigger a flush
+        """
+        self.directory = directory
+        self.prefix = prefix
+        self.flush_size = flush_size
+        self.pending: List[str] = []
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict):
+        """Buffer a record, flushing when the buffer is full"""
+        line = json.dumps(record, separators=(',', ':'), default=str)
+        with self._lock:
+            self.pending.append(line)
+            full = len(self.pending) >= self.flush_size
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Append buffered records to today's file
+
+        Returns:
+            Number of records written
+        """
+        with self._lock:
+            lines, self.pending = self.pending, []
+        if not lines:
+            return 0
+
+        path = self.directory / f"{self.prefix}_{time.strftime('%Y%m%d')}.ndjson"
+        try:
+            with open(path, 'a') as f:
+                f.write('\n'.join(lines) + '\n')
+        except OSError as e:
+            logger.error(f"Error writing {path}: {e}")
+            return 0
+        return len(lines)
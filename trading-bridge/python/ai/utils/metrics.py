@@ -0,0 +1,77 @@
+"""
+Metrics Hook
+Lets AI components record metrics without depending on the service's utils package
+"""
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from .dependencies import import_optional
+
+_registry: Optional[Any] = None
+
+
+class _NullMetric:
+    """Metric (and labelled child) that records nothing"""
+
+    def labels(self, *values, **kwargs):
+        return self
+
+    def inc(self, amount: float = 1.0):
+        pass
+
+    def dec(self, amount: float = 1.0):
+        pass
+
+    def set(self, value: float):
+        pass
+
+    def observe(self, value: float):
+        pass
+
+    def set_function(self, function):
+        pass
+
+    @contextmanager
+    def time(self):
+        yield
+
+
+class _NullRegistry:
+    """Registry used when no metrics registry is available"""
+
+    _metric = _NullMetric()
+
+    def counter(self, *args, **kwargs) -> _NullMetric:
+        return self._metric
+
+    def gauge(self, *args, **kwargs) -> _NullMetric:
+        return self._metric
+
+    def histogram(self, *args, **kwargs) -> _NullMetric:
+        return self._metric
+
+
+def set_metrics_registry(registry: Optional[Any]):
+    """
+    Inject the registry AI components report to
+
+    Args:
+        registry: MetricsRegistry-compatible object (None = resolve again)
+    """
+    global _registry
+    _registry = registry
+
+
+def get_metrics_registry():
+    """
+    Get the injected registry, else the service registry if importable,
+    else a registry that records nothing
+    """
+    global _registry
+    if _registry is None:
+        metrics = import_optional('utils.metrics')
+        if metrics is not None and hasattr(metrics, 'MetricsRegistry'):
+            _registry = metrics.get_metrics_registry()
+        else:
+            _registry = _NullRegistry()
+    return _registry
@@ -3,13 +3,20 @@ AI Performance Monitor
 Monitors AI system performance and metrics
 """
 import logging
+import threading
+import time
 from typing import Dict, List, Optional
 from datetime import datetime
 from pathlib import Path
-import json
+
+import numpy as np
+
+from .metric_store import MinuteBuckets, NdjsonWriter, NumericRing
 
 logger = logging.getLogger(__name__)
 
+_ACTIONS = {'BUY': 1.0, 'SELL': -1.0, 'HOLD': 0.0}
+
 
 class PerformanceMonitor:
     """
@@ -24,14 +31,18 @@ class PerformanceMonitor:
             config: Configuration dictionary
         """
         self.config = config or {}
-        self.metrics = {
-            'predictions': [],
-            'signals': [],
-            'trades': [],
-            'performance': {}
-        }
+        capacity = self.config.get('history_size', 1000)
+        
+        # Recent numeric records and per-minute aggregates (retained for one day)
+        self.predictions = NumericRing(('predicted_price', 'actual_price', 'accuracy', 'confidence'), capacity)
+        self.signals = NumericRing(('action', 'confidence', 'executed'), capacity)
+        self.buckets = MinuteBuckets(('predictions', 'accuracy_sum', 'accuracy_count', 'signals', 'executed'))
+        self.metrics = {'performance': {}}
+        self._lock = threading.Lock()
+        
         self.log_dir = Path(__file__).parent.parent.parent.parent / "logs"
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = NdjsonWriter(self.log_dir, "ai_performance", self.config.get('flush_size', 100))
     
     def record_prediction(self, symbol: str, prediction: Dict, actual_price: Optional[float] = None):
         """
@@ -43,25 +54,40 @@ class PerformanceMonitor:
             actual_price: Actual price (for accuracy calculation)
         """
         try:
-            entry = {
-                'timestamp': datetime.now().isoformat(),
-                'symbol': symbol,
-                'prediction': prediction,
-                'actual_price': actual_price,
-                'accuracy': None
-            }
+            now = time.time()
+            predicted = prediction.get('predicted_price')
+            accuracy = None
             
             # Calculate accuracy if actual price available
-            if actual_price and prediction.get('predicted_price'):
-                predicted = prediction.get('predicted_price')
+            if actual_price and predicted:
                 error = abs(predicted - actual_price) / actual_price if actual_price > 0 else 1.0
-                entry['accuracy'] = 1.0 - min(error, 1.0)
+                accuracy = 1.0 - min(error, 1.0)
             
-            self.metrics['predictions'].append(entry)
+            with self._lock:
+                self.predictions.append(
+                    now,
+                    predicted_price=predicted,
+                    actual_price=actual_price,
+                    accuracy=accuracy,
+                    confidence=prediction.get('confidence')
+                )
+                self.buckets.add(
+                    now,
+                    predictions=1,
+                    accuracy_sum=accuracy or 0.0,
+                    accuracy_count=1 if accuracy is not None else 0
+                )
             
-            # Keep only recent predictions (last 1000)
-            if len(self.metrics['predictions']) > 1000:
-                self.metrics['predictions'] = self.metrics['predictions'][-1000:]
+            self.writer.write({
+                'type': 'prediction',
+                'time': now,
+                'symbol': symbol,
+                'predicted_price': predicted,
+                'actual_price': actual_price,
+                'accuracy': accuracy,
+                'direction': prediction.get('direction'),
+                'confidence': prediction.get('confidence')
+            })
             
             logger.debug(f"Recorded prediction for {symbol}")
             
@@ -78,18 +104,28 @@ class PerformanceMonitor:
             executed: Whether signal was executed
         """
         try:
-            entry = {
-                'timestamp': datetime.now().isoformat(),
-                'symbol': symbol,
-                'signal': signal,
-                'executed': executed
-            }
+            now = time.time()
+            action = signal.get('action', 'HOLD')
             
-            self.metrics['signals'].append(entry)
+            with self._lock:
+                self.signals.append(
+                    now,
+                    action=_ACTIONS.get(action, 0.0),
+                    confidence=signal.get('confidence'),
+                    executed=1.0 if executed else 0.0
+                )
+                self.buckets.add(now, signals=1, executed=1 if executed else 0)
             
-            # Keep only recent signals (last 1000)
-            if len(self.metrics['signals']) > 1000:
-                self.metrics['signals'] = self.metrics['signals'][-1000:]
+            # Numeric fields only - nested market analysis is not persisted
+            self.writer.write({
+                'type': 'signal',
+                'time': now,
+                'symbol': symbol,
+                'action': action,
+                'confidence': signal.get('confidence'),
+                'strategy': signal.get('strategy'),
+                'executed': executed
+            })
             
             logger.debug(f"Recorded signal for {symbol}")
             
@@ -104,13 +140,14 @@ class PerformanceMonitor:
             Metrics dictionary
         """
         try:
-            metrics = {
-                'prediction_accuracy': self._calculate_prediction_accuracy(),
-                'signal_success_rate': self._calculate_signal_success_rate(),
-                'total_signals': len(self.metrics['signals']),
-                'executed_signals': len([s for s in self.metrics['signals'] if s.get('executed', False)]),
-                'total_predictions': len(self.metrics['predictions'])
-            }
+            with self._lock:
+                metrics = {
+                    'prediction_accuracy': self._calculate_prediction_accuracy(),
+                    'signal_success_rate': self._calculate_signal_success_rate(),
+                    'total_signals': len(self.signals),
+                    'executed_signals': int(np.nansum(self.signals.column('executed'))),
+                    'total_predictions': len(self.predictions)
+                }
             
             self.metrics['performance'] = metrics
             return metrics
@@ -121,16 +158,13 @@ class PerformanceMonitor:
     
     def _calculate_prediction_accuracy(self) -> float:
         """Calculate average prediction accuracy"""
-        predictions_with_accuracy = [
-            p for p in self.metrics['predictions'] 
-            if p.get('accuracy') is not None
-        ]
+        accuracy = self.predictions.column('accuracy')
+        accuracy = accuracy[~np.isnan(accuracy)]
         
-        if not predictions_with_accuracy:
+        if len(accuracy) == 0:
             return 0.0
         
-        avg_accuracy = sum([p['accuracy'] for p in predictions_with_accuracy]) / len(predictions_with_accuracy)
-        return avg_accuracy
+        return float(accuracy.mean())
     
     def _calculate_signal_success_rate(self) -> float:
         """Calculate signal success rate"""
@@ -139,14 +173,11 @@ class PerformanceMonitor:
         return 0.0
     
     def save_metrics(self):
-        """Save metrics to file"""
+        """Append buffered metric records to file"""
         try:
-            metrics_file = self.log_dir / f"ai_performance_{datetime.now().strftime('%Y%m%d')}.json"
-            
-            with open(metrics_file, 'w') as f:
-                json.dump(self.metrics, f, indent=2)
-            
-            logger.info(f"Metrics saved to {metrics_file}")
+            written = self.writer.flush()
+            if written:
+                logger.info(f"Saved {written} metric record(s) to {self.log_dir}")
             
         except Exception as e:
             logger.error(f"Error saving metrics: {e}")
@@ -154,39 +185,17 @@ class PerformanceMonitor:
     def get_summary(self) -> Dict:
         """Get performance summary"""
         metrics = self.calculate_metrics()
+        with self._lock:
+            last_day = self.buckets.totals(86400)
         
         return {
             'timestamp': datetime.now().isoformat(),
             'metrics': metrics,
-            'recent_predictions': len([p for p in self.metrics['predictions'] if 
-                                     (datetime.now() - datetime.fromisoformat(p['timestamp'])).days < 1]),
-            'recent_signals': len([s for s in self.metrics['signals'] if 
-                                  (datetime.now() - datetime.fromisoformat(s['timestamp'])).days < 1])
+            'recent_predictions': int(last_day['predictions']),
+            'recent_signals': int(last_day['signals']),
+            'recent_executed_signals': int(last_day['executed']),
+            'recent_prediction_accuracy': (
+                last_day['accuracy_sum'] / last_day['accuracy_count']
+                if last_day['accuracy_count'] else 0.0
+            )
         }
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
@@ -0,0 +1,271 @@
+"""
+Real-time Bar Aggregation
+Builds OHLCV bars from live ticks into bounded in-memory ring buffers
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .bar_store import BAR_DTYPE, to_epoch
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAME_SECONDS = {
+    'M1': 60, '1m': 60,
+    'M5': 300, '5m': 300,
+    'M15': 900, '15m': 900,
+    'M30': 1800, '30m': 1800,
+    'H1': 3600, '1h': 3600,
+    'H4': 14400, '4h': 14400,
+    'D1': 86400, '1d': 86400,
+}
+
+
+class BarRingBuffer:
+    """Fixed-capacity ring buffer of BAR_DTYPE records"""
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize ring buffer
+
+        Args:
+            capacity: Maximum number of bars kept
+        """
+        self.capacity = capacity
+        self.records = np.zeros(capacity, dtype=BAR_DTYPE)
+        self.head = 0  # Next write position
+        self.count = 0
+
+    def append(self, bar: np.void):
+        """Append one bar, overwriting the oldest when full"""
+        self.records[self.head] = bar
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Get the most recent bars in time order
+
+        Args:
+            n: Number of bars (None = all)
+
+        Returns:
+            BAR_DTYPE array (copy)
+        """
+        n = self.count if n is None else min(n, self.count)
+        if n == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        start = (self.head - n) % self.capacity
+        if start + n <= self.capacity:
+            return self.records[start:start + n].copy()
+        return np.concatenate((self.records[start:], self.records[:self.head]))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class BarAggregator:
+    """
+    Aggregates ticks into bars for registered (symbol, timeframe) pairs
+
+    Completed bars go into a per-pair ring buffer and a pending list that is
+    flushed to the historical store in batches.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize bar aggregator
+
+        Args:
+            capacity: Ring buffer size per (symbol, timeframe)
+        """
+        self.capacity = capacity
+        self.timeframes: Dict[str, List[str]] = {}
+        self.rings: Dict[Tuple[str, str], BarRingBuffer] = {}
+        self.current: Dict[Tuple[str, str], np.ndarray] = {}
+        self.pending: Dict[Tuple[str, str], List[np.void]] = {}
+        self.last_tick_time: Dict[str, float] = {}
+        self.seeded: Dict[Tuple[str, str], int] = {}  # Last bar time loaded by seed()
+        # Called as listener((symbol, timeframe), closed_bar_or_None, current_bar)
+        # after every bar update, e.g. SharedBarPlane.publish
+        self.listener: Optional[Callable] = None
+        self._lock = threading.Lock()
+
+    def register(self, symbol: str, timeframe: str) -> bool:
+        """
+        Start aggregating a symbol/timeframe
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe (e.g., 'M5', '1h')
+
+        Returns:
+            True if the timeframe is supported
+        """
+        if timeframe not in TIMEFRAME_SECONDS:
+            logger.warning(f"Unsupported timeframe for real-time bars: {timeframe}")
+            return False
+
+        with self._lock:
+            timeframes = self.timeframes.setdefault(symbol, [])
+            if timeframe not in timeframes:
+                timeframes.append(timeframe)
+                self.rings[(symbol, timeframe)] = BarRingBuffer(self.capacity)
+                self.pending[(symbol, timeframe)] = []
+        return True
+
+    def add_tick(self, symbol: str, timestamp: float, price: float, volume: float = 1.0):
+        """
+        Apply one tick to every registered timeframe of a symbol
+
+        Args:
+            symbol: Trading symbol
+            timestamp: Tick time (epoch seconds)
+            price: Tick price
+            volume: Tick volume
+        """
+        with self._lock:
+            timeframes = self.timeframes.get(symbol)
+            if not timeframes:
+                return
+            self.last_tick_time[symbol] = timestamp
+
+            for timeframe in timeframes:
+                key = (symbol, timeframe)
+                seconds = TIMEFRAME_SECONDS[timeframe]
+                bar_time = int(timestamp) - int(timestamp) % seconds
+                bar = self.current.get(key)
+
+                if bar is not None and bar_time < bar['time']:
+                    continue  # Late tick for an already closed bar
+
+                if bar is None and bar_time <= self.seeded.get(key, -1):
+                    continue  # Bar already loaded from the store
+
+                closed = None
+                if bar is None or bar_time > bar['time']:
+                    if bar is not None:
+                        closed = bar[()]
+                        self.rings[key].append(closed)
+                        self.pending[key].append(closed.copy())
+                    bar = np.array((bar_time, price, price, price, price, volume), dtype=BAR_DTYPE)
+                    self.current[key] = bar
+                else:
+                    if price > bar['high']:
+                        bar['high'] = price
+                    if price < bar['low']:
+                        bar['low'] = price
+                    bar['close'] = price
+                    bar['volume'] += volume
+
+                if self.listener is not None:
+                    self.listener(key, closed, bar)
+
+    def seed(self, symbol: str, timeframe: str, bars: np.ndarray) -> int:
+        """
+        Preload closed bars (e.g. stored history) into an empty ring
+
+        Bars still forming at the current time are skipped; live ticks
+        rebuild them.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe (must be registered)
+            bars: BAR_DTYPE array in time order
+
+        Returns:
+            Number of bars loaded
+        """
+        key = (symbol, timeframe)
+        seconds = TIMEFRAME_SECONDS.get(timeframe)
+        with self._lock:
+            ring = self.rings.get(key)
+            if ring is None or len(ring) or key in self.current or not len(bars):
+                return 0
+            bars = bars[bars['time'] + seconds <= time.time()][-ring.capacity:]
+            for bar in bars:
+                ring.append(bar)
+            if len(bars):
+                self.seeded[key] = int(bars['time'][-1])
+            return len(bars)
+
+    def get_bars(self, symbol: str, timeframe: str, n: Optional[int] = None,
+                 include_partial: bool = True) -> np.ndarray:
+        """
+        Get recent bars
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            n: Number of bars (None = all buffered)
+            include_partial: Include the bar still being formed
+
+        Returns:
+            BAR_DTYPE array in time order
+        """
+        key = (symbol, timeframe)
+        with self._lock:
+            ring = self.rings.get(key)
+            if ring is None:
+                return np.empty(0, dtype=BAR_DTYPE)
+
+            current = self.current.get(key) if include_partial else None
+            if current is None:
+                return ring.latest(n)
+
+            closed = ring.latest(None if n is None else max(n - 1, 0))
+            return np.concatenate((closed, current.reshape(1)))
+
+    def drain_pending(self) -> Dict[Tuple[str, str], np.ndarray]:
+        """
+        Take all completed bars not yet flushed
+
+        Returns:
+            Dictionary of (symbol, timeframe) -> BAR_DTYPE array
+        """
+        with self._lock:
+            drained = {}
+            for key, bars in self.pending.items():
+                if bars:
+                    drained[key] = np.array(bars, dtype=BAR_DTYPE)
+                    self.pending[key] = []
+            return drained
+
+    def pending_count(self) -> int:
+        """Number of completed bars awaiting flush"""
+        with self._lock:
+            return sum(len(bars) for bars in self.pending.values())
+
+
+def parse_tick(tick: Dict) -> Optional[Tuple[str, float, float, float]]:
+    """
+    Normalize a tick dictionary from the EA
+
+    Args:
+        tick: Dictionary with symbol, time, and bid/ask or price, optional volume
+
+    Returns:
+        Tuple of (symbol, epoch seconds, price, volume) or None if invalid
+    """
+    symbol = tick.get('symbol')
+    timestamp = to_epoch(tick.get('time', tick.get('timestamp')))
+    price = tick.get('price', tick.get('last'))
+    if price is None and tick.get('bid') is not None and tick.get('ask') is not None:
+        price = (float(tick['bid']) + float(tick['ask'])) / 2.0
+    if not symbol or timestamp is None or price is None:
+        return None
+    return symbol, float(timestamp), float(price), float(tick.get('volume', 1.0))
+
+
+def iter_ticks(ticks: Iterable[Dict]):
+    """Yield normalized ticks, skipping invalid entries"""
+    for tick in ticks:
+        try:
+            parsed = parse_tick(tick)
+        except (TypeError, ValueError):
+            parsed = None
+        if parsed is not None:
+            yield parsed
@@ -0,0 +1,342 @@
+"""
+Risk State
+Open positions keyed by position ID, reconciled against broker snapshots
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, fields, astuple
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = Path(__file__).parent.parent.parent.parent / "data" / "risk_state.json"
+
+
+@dataclass
+class PositionRecord:
+    """Open position as tracked for risk"""
+    position_id: str
+    symbol: str
+    action: str  # BUY or SELL
+    volume: float
+    open_price: float = 0.0
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    broker: Optional[str] = None
+    signal_id: Optional[str] = None
+    risk: float = 0.0  # Percent of balance lost at the stop
+    updated_at: float = 0.0  # Epoch seconds of the last change
+
+    def fingerprint(self) -> tuple:
+        """Fields whose change requires a risk update"""
+        return (self.symbol, self.action, self.volume, self.open_price,
+                self.stop_loss, self.take_profit)
+
+
+_FIELDS = [f.name for f in fields(PositionRecord)]
+
+
+def _get(source: Any, *names: str, default=None):
+    """Read the first present attribute/key of a Position or dictionary"""
+    for name in names:
+        value = source.get(name) if isinstance(source, dict) else getattr(source, name, None)
+        if value is not None:
+            return value
+    return default
+
+
+def _price(value) -> Optional[float]:
+    """Price field where 0 means 'not set' (MT5 convention)"""
+    return float(value) if value else None
+
+
+def to_record(position: Any, broker: Optional[str] = None) -> Optional[PositionRecord]:
+    """
+    Build a record from a broker Position or an EA position/report dictionary
+
+    Args:
+        position: Object or dictionary with symbol, type/action, volume and
+            optionally position_id, open_price, stop_loss, take_profit
+        broker: Broker name (overrides the position's own)
+
+    Returns:
+        PositionRecord, or None without a symbol
+    """
+    symbol = _get(position, 'symbol')
+    if not symbol:
+        return None
+    action = str(_get(position, 'type', 'action', default='BUY')).upper()
+    broker = broker or _get(position, 'broker')
+    # Netting accounts/brokers without tickets: one position per symbol and side
+    position_id = _get(position, 'position_id', 'ticket') or f"{broker}:{symbol}:{action}"
+    return PositionRecord(
+        position_id=str(position_id),
+        symbol=symbol,
+        action=action,
+        volume=float(_get(position, 'volume', 'lot_size', default=0.0)),
+        open_price=float(_get(position, 'open_price', 'price', default=0.0)),
+        stop_loss=_price(_get(position, 'stop_loss', 'sl')),
+        take_profit=_price(_get(position, 'take_profit', 'tp')),
+        broker=broker,
+        signal_id=_get(position, 'signal_id'),
+        updated_at=time.time()
+    )
+
+
+class RiskState:
+    """
+    Positions keyed by ID with diff-based reconciliation and persistence
+
+    Broker snapshots are diffed against the tracked positions: only added or
+    changed positions are re-evaluated (through ``risk_fn``) and positions
+    missing from the snapshot are dropped. Execution reports from the EA
+    apply single changes between snapshots. The state is saved as a compact
+    JSON snapshot so a restart resumes with the last known positions.
+    """
+
+    def __init__(self, path: Optional[Path] = STATE_FILE,
+                 risk_fn: Optional[Callable[[PositionRecord], float]] = None,
+                 grace_period: float = 10.0):
+        """
+        Initialize state
+
+        Args:
+            path: Snapshot file (None disables persistence)
+            risk_fn: Computes a position's risk percent when it is added or changed
+            grace_period: Seconds a position changed by an execution report is
+                kept even if a snapshot does not include it yet
+        """
+        self.path = Path(path) if path else None
+        self.risk_fn = risk_fn
+        self.grace_period = grace_period
+        self.positions: Dict[str, PositionRecord] = {}
+        self.version = 0  # Incremented on every change, for caching derived values
+        self._reported: Dict[str, float] = {}  # Position ID -> time of the last execution report
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def records(self) -> List[PositionRecord]:
+        """Current positions (copy of the list)"""
+        with self._lock:
+            return list(self.positions.values())
+
+    def has_symbol(self, symbol: str) -> bool:
+        """Check whether any position is open on a symbol"""
+        return any(record.symbol == symbol for record in self.records())
+
+    def _store(self, record: PositionRecord, risk: Optional[float] = None):
+        """Evaluate risk and store a new or changed record (lock held)"""
+        if risk is not None:
+            record.risk = risk
+        elif self.risk_fn is not None:
+            try:
+                record.risk = self.risk_fn(record)
+            except Exception as e:
+                logger.error(f"Error computing risk for position {record.position_id}: {e}")
+        self.positions[record.position_id] = record
+
+    def _changed(self):
+        """Mark state as changed (lock held)"""
+        self.version += 1
+        self._dirty = True
+
+    def upsert(self, record: PositionRecord, risk: Optional[float] = None) -> bool:
+        """
+        Add or replace one position
+
+        Args:
+            record: Position record
+            risk: Risk percent (None = computed by risk_fn)
+
+        Returns:
+            True if the state changed
+        """
+        with self._lock:
+            current = self.positions.get(record.position_id)
+            if (current is not None and current.fingerprint() == record.fingerprint()
+                    and (risk is None or risk == current.risk)):
+                return False
+            if current is not None:
+                record.signal_id = record.signal_id or current.signal_id
+            self._store(record, risk)
+            self._changed()
+            return True
+
+    def remove(self, position_id: str) -> bool:
+        """
+        Remove one position
+
+        Args:
+            position_id: Position ID
+
+        Returns:
+            True if the position was tracked
+        """
+        with self._lock:
+            if self.positions.pop(position_id, None) is None:
+                return False
+            self._changed()
+            return True
+
+    def refresh_risk(self):
+        """Re-evaluate every position's risk (e.g. after a balance change)"""
+        with self._lock:
+            for record in self.positions.values():
+                self._store(record)
+            self.version += 1
+
+    def reconcile(self, positions: Iterable[Any], broker: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Bring the state in line with a broker's position snapshot
+
+        Args:
+            positions: Broker Position objects or EA position dictionaries
+            broker: Broker the snapshot is from; only that broker's positions
+                are removed when missing (None = snapshot of all positions)
+
+        Returns:
+            Dictionary of 'added', 'updated' and 'removed' position IDs
+        """
+        incoming: Dict[str, PositionRecord] = {}
+        for position in positions:
+            record = to_record(position, broker)
+            if record is not None:
+                incoming[record.position_id] = record
+
+        added, updated, removed = [], [], []
+        now = time.time()
+        with self._lock:
+            for position_id, record in incoming.items():
+                current = self.positions.get(position_id)
+                if current is None:
+                    added.append(position_id)
+                elif current.fingerprint() != record.fingerprint():
+                    record.signal_id = record.signal_id or current.signal_id
+                    updated.append(position_id)
+                else:
+                    continue
+                self._store(record)
+
+            for position_id, current in list(self.positions.items()):
+                if position_id in incoming or (broker is not None and current.broker != broker):
+                    continue
+                if now - self._reported.get(position_id, 0.0) < self.grace_period:
+                    continue  # Reported by the EA, may be newer than the snapshot
+                del self.positions[position_id]
+                self._reported.pop(position_id, None)
+                removed.append(position_id)
+
+            if added or updated or removed:
+                self._changed()
+
+        if added or updated or removed:
+            logger.info(f"Reconciled positions{f' ({broker})' if broker else ''}: "
+                        f"{len(added)} added, {len(updated)} updated, {len(removed)} removed")
+        return {'added': added, 'updated': updated, 'removed': removed}
+
+    def apply_execution(self, report: Dict) -> Optional[str]:
+        """
+        Apply one execution report
+
+        Args:
+            report: Dictionary with 'event' (OPEN, MODIFY or CLOSE),
+                'position_id' and, for OPEN/MODIFY, the position fields
+                (symbol, type, volume, open_price, stop_loss, take_profit).
+                Partial closes are reported as MODIFY with the remaining volume.
+
+        Returns:
+            'added', 'updated' or 'removed', or None if nothing changed
+        """
+        event = str(report.get('event', '')).upper()
+        position_id = report.get('position_id')
+        if position_id is None:
+            return None
+        position_id = str(position_id)
+
+        if event not in ('OPEN', 'MODIFY', 'CLOSE'):
+            logger.warning(f"Unknown execution event: {event}")
+            return None
+        if event == 'CLOSE':
+            with self._lock:
+                self._reported.pop(position_id, None)
+            return 'removed' if self.remove(position_id) else None
+
+        with self._lock:
+            current = self.positions.get(position_id)
+            self._reported[position_id] = time.time()
+        merged = dict(vars(current)) if current is not None else {}
+        merged.update({k: v for k, v in report.items() if v is not None})
+        record = to_record(merged)
+        if record is None:
+            return None
+        if float(record.volume) <= 0:
+            return 'removed' if self.remove(position_id) else None
+        if not self.upsert(record):
+            return None
+        return 'added' if current is None else 'updated'
+
+    def load(self) -> int:
+        """
+        Load the last saved snapshot
+
+        Returns:
+            Number of positions loaded
+        """
+        if self.path is None or not self.path.exists():
+            return 0
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            names = data.get('fields', _FIELDS)
+            records = {}
+            for row in data.get('positions', []):
+                values = {name: value for name, value in zip(names, row) if name in _FIELDS}
+                record = PositionRecord(**values)
+                records[record.position_id] = record
+            with self._lock:
+                self.positions = records
+                self.version += 1
+            logger.info(f"Loaded {len(records)} position(s) from {self.path}")
+            return len(records)
+        except Exception as e:
+            logger.error(f"Error loading risk state: {e}")
+            return 0
+
+    def save(self, force: bool = False) -> bool:
+        """
+        Write the snapshot if the state changed since the last save
+
+        Args:
+            force: Write even if unchanged
+
+        Returns:
+            True if written
+        """
+        if self.path is None or not (self._dirty or force):
+            return False
+        with self._lock:
+            rows = [list(astuple(record)) for record in self.positions.values()]
+            self._dirty = False
+        data = {'saved_at': time.time(), 'fields': _FIELDS, 'positions': rows}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.path.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_file, self.path)
+            return True
+        except Exception as e:
+            self._dirty = True
+            logger.error(f"Error saving risk state: {e}")
+            return False
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Positions as dictionaries keyed by position ID"""
+        return {record.position_id: dict(vars(record)) for record in self.records()}
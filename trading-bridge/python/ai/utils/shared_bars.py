@@ -0,0 +1,269 @@
+"""
+Shared Bar Plane
+Shared-memory OHLCV ring buffers written by one process, read by many
+"""
+import logging
+import os
+import re
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .bar_store import BAR_DTYPE
+
+logger = logging.getLogger(__name__)
+
+# Segment header; 'seq' is odd while the writer is updating the segment
+HEADER_DTYPE = np.dtype([
+    ('seq', '<u8'),
+    ('capacity', '<i8'),  # 0 until the writer has initialized the segment
+    ('head', '<i8'),      # Next write position of closed bars
+    ('count', '<i8'),     # Closed bars stored
+    ('has_current', '<i8'),
+    ('updated', '<f8'),   # time.monotonic() of the last write
+])
+
+
+def segment_name(prefix: str, symbol: str, timeframe: str) -> str:
+    """Shared memory name for a symbol/timeframe"""
+    return re.sub(r'[^A-Za-z0-9_]', '_', f"{prefix}_{symbol}_{timeframe}")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without handing it to the resource tracker"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        segment = shared_memory.SharedMemory(name=name)
+        if os.name == 'posix':
+            # Older versions track attached segments too and would unlink the
+            # writer's segment when this (reader) process exits
+            from multiprocessing import resource_tracker
+            try:
+                resource_tracker.unregister(segment._name, 'shared_memory')
+            except Exception:
+                pass
+        return segment
+
+
+class SharedBarRing:
+    """
+    Ring buffer of BAR_DTYPE records in one shared memory segment
+
+    Layout: header, ``capacity`` closed-bar slots and one slot for the bar
+    still forming. A single writer brackets every update with two increments
+    of the sequence number (seqlock); readers copy without locking and retry
+    if the sequence was odd or changed during the copy.
+    """
+
+    def __init__(self, name: str, capacity: int = 1000, create: bool = False):
+        """
+        Create or attach to a segment
+
+        Args:
+            name: Shared memory name
+            capacity: Closed bars kept (writer only; readers use the segment's)
+            create: Create the segment (the single writer) instead of attaching
+
+        Raises:
+            FileNotFoundError: When attaching to a segment that does not exist
+        """
+        self.name = name
+        self.owner = create
+        if create:
+            size = HEADER_DTYPE.itemsize + (capacity + 1) * BAR_DTYPE.itemsize
+            try:
+                self.segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+            except FileExistsError:
+                # Left over from a writer that did not shut down cleanly
+                stale = _attach(name)
+                stale.close()
+                stale.unlink()
+                self.segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self.segment = _attach(name)
+
+        buf = self.segment.buf
+        self.header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=buf)[0]
+        self._seq = np.ndarray((1,), dtype='<u8', buffer=buf)
+
+        if create:
+            self.header['seq'] = 0
+            self.header['head'] = 0
+            self.header['count'] = 0
+            self.header['has_current'] = 0
+            self.header['capacity'] = capacity
+        else:
+            capacity = int(self.header['capacity'])
+        self.capacity = capacity
+        self.records = np.ndarray(
+            (capacity + 1,), dtype=BAR_DTYPE, buffer=buf, offset=HEADER_DTYPE.itemsize
+        )
+
+    @property
+    def sequence(self) -> int:
+        """Current sequence number (changes on every write)"""
+        return int(self._seq[0])
+
+    def publish(self, closed: Optional[np.void] = None, current: Optional[np.ndarray] = None):
+        """
+        Write a completed bar and/or the forming bar (writer only)
+
+        Args:
+            closed: Bar that just completed
+            current: Bar still forming
+        """
+        header = self.header
+        self._seq[0] += 1  # Odd: update in progress
+        if closed is not None:
+            head = int(header['head'])
+            self.records[head] = closed
+            header['head'] = (head + 1) % self.capacity
+            header['count'] = min(int(header['count']) + 1, self.capacity)
+        if current is not None:
+            self.records[self.capacity] = current
+            header['has_current'] = 1
+        header['updated'] = time.monotonic()
+        self._seq[0] += 1  # Even: consistent
+
+    def read(self, n: Optional[int] = None, include_partial: bool = True,
+             retries: int = 1000) -> np.ndarray:
+        """
+        Copy the most recent bars without locking
+
+        Args:
+            n: Number of bars (None = all)
+            include_partial: Include the bar still being formed
+            retries: Attempts before giving up on a busy writer
+
+        Returns:
+            BAR_DTYPE array in time order (empty if no consistent copy was
+            obtained)
+        """
+        header = self.header
+        for attempt in range(retries):
+            start_seq = int(self._seq[0])
+            if start_seq & 1:
+                time.sleep(0) if attempt < 10 else time.sleep(0.0001)
+                continue
+
+            head = int(header['head'])
+            count = int(header['count'])
+            partial = include_partial and header['has_current'] == 1
+            closed_wanted = count if n is None else min(max(n - (1 if partial else 0), 0), count)
+
+            start = (head - closed_wanted) % self.capacity
+            if start + closed_wanted <= self.capacity:
+                closed = self.records[start:start + closed_wanted].copy()
+            else:
+                closed = np.concatenate((self.records[start:self.capacity], self.records[:head]))
+            current = self.records[self.capacity:].copy() if partial else None
+
+            if int(self._seq[0]) == start_seq:
+                return closed if current is None else np.concatenate((closed, current))
+
+        logger.debug(f"No consistent read of {self.name} after {retries} attempts")
+        return np.empty(0, dtype=BAR_DTYPE)
+
+    def close(self):
+        """Detach; the writer also removes the segment"""
+        self.header = None
+        self._seq = None
+        self.records = None
+        self.segment.close()
+        if self.owner:
+            try:
+                self.segment.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedBarPlane:
+    """
+    Shared-memory bars for every symbol/timeframe
+
+    The ingestion process creates the plane with ``create=True`` and
+    installs ``publish`` as the BarAggregator listener. Analysis processes
+    attach with ``create=False`` and use the plane as the analyzer's live
+    source (``get_live_bars``), so bars are stored once and read by any
+    number of processes.
+    """
+
+    def __init__(self, prefix: str = "tbbars", capacity: int = 1000, create: bool = False):
+        """
+        Initialize plane
+
+        Args:
+            prefix: Segment name prefix shared by writer and readers
+            capacity: Closed bars per symbol/timeframe (writer only)
+            create: This process is the single writer
+        """
+        self.prefix = prefix
+        self.capacity = capacity
+        self.create = create
+        self.rings: Dict[Tuple[str, str], SharedBarRing] = {}
+
+    def ring(self, symbol: str, timeframe: str) -> Optional[SharedBarRing]:
+        """
+        Get a symbol/timeframe ring, creating (writer) or attaching (reader)
+
+        Returns:
+            Ring, or None if a reader finds no initialized segment yet
+        """
+        key = (symbol, timeframe)
+        ring = self.rings.get(key)
+        if ring is not None:
+            return ring
+        name = segment_name(self.prefix, symbol, timeframe)
+        try:
+            ring = SharedBarRing(name, self.capacity, create=self.create)
+        except FileNotFoundError:
+            return None
+        if ring.capacity <= 0:
+            ring.close()  # Writer has not initialized it yet
+            return None
+        self.rings[key] = ring
+        return ring
+
+    def publish(self, key: Tuple[str, str], closed: Optional[np.void], current: Optional[np.ndarray]):
+        """
+        Write bar updates for one symbol/timeframe (BarAggregator listener)
+
+        Args:
+            key: (symbol, timeframe)
+            closed: Bar that just completed, if any
+            current: Bar still forming
+        """
+        ring = self.ring(*key)
+        if ring is not None:
+            ring.publish(closed, current)
+
+    def get_live_bars(self, symbol: str, timeframe: str, count: Optional[int] = None) -> np.ndarray:
+        """
+        Get the most recent bars (same interface as DataCollector)
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            count: Number of bars (None = all buffered)
+
+        Returns:
+            BAR_DTYPE array including the bar currently forming
+        """
+        ring = self.ring(symbol, timeframe)
+        if ring is None:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return ring.read(count)
+
+    def sequence(self, symbol: str, timeframe: str) -> int:
+        """Write sequence of a symbol/timeframe (-1 if not available)"""
+        ring = self.ring(symbol, timeframe)
+        return ring.sequence if ring is not None else -1
+
+    def close(self):
+        """Detach from every segment (the writer also removes them)"""
+        for ring in self.rings.values():
+            ring.close()
+        self.rings.clear()
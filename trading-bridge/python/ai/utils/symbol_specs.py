@@ -0,0 +1,320 @@
+"""
+Symbol Specifications
+Contract specs and currency conversion for exact position sizing
+"""
+import json
+import logging
+import math
+import threading
+from dataclasses import dataclass, asdict, fields
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+SPEC_FILE = Path(__file__).parent.parent.parent.parent / "config" / "symbol_specs.json"
+
+METALS = {
+    # prefix: (contract_size, tick_size, digits)
+    'XAU': (100.0, 0.01, 2),
+    'XAG': (5000.0, 0.001, 3),
+    'XPT': (100.0, 0.01, 2),
+    'XPD': (100.0, 0.01, 2),
+}
+CRYPTO = ('BTC', 'ETH', 'LTC', 'XRP', 'BCH', 'SOL', 'ADA', 'DOGE')
+
+
+@dataclass
+class SymbolSpec:
+    """Contract specification of a tradable symbol"""
+    symbol: str
+    base_currency: str
+    quote_currency: str  # Profit currency
+    contract_size: float = 100000.0
+    tick_size: float = 0.00001
+    digits: int = 5
+    min_lot: float = 0.01
+    max_lot: float = 100.0
+    lot_step: float = 0.01
+    tick_value: Optional[float] = None  # Per lot in account currency, if reported by the terminal
+    stops_level: int = 0  # Minimum SL/TP distance from the market price in points
+
+    @property
+    def point(self) -> float:
+        """Smallest price increment at the quoted digits"""
+        return 10.0 ** -self.digits
+
+    @property
+    def min_stop_distance(self) -> float:
+        """Minimum SL/TP distance from the market price (SYMBOL_TRADE_STOPS_LEVEL)"""
+        return self.stops_level * self.point
+
+    @property
+    def pip_size(self) -> float:
+        """Pip size (one tick on 2/4-digit quotes, ten ticks on fractional 3/5-digit quotes)"""
+        return self.tick_size * 10 if self.digits in (3, 5) else self.tick_size
+
+    def round_lot(self, lots: float) -> float:
+        """
+        Round a lot size down to the lot step within the allowed range
+
+        Args:
+            lots: Unrounded lot size
+
+        Returns:
+            Lot size, or 0.0 if below the minimum lot
+        """
+        steps = math.floor(lots / self.lot_step + 1e-9)
+        lots = round(steps * self.lot_step, 8)
+        if lots < self.min_lot:
+            return 0.0
+        return min(lots, self.max_lot)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SymbolSpec':
+        """
+        Create spec from a dictionary (unknown keys are ignored)
+
+        Raises:
+            ValueError: If a lot or tick size is not positive
+        """
+        names = {f.name for f in fields(cls)}
+        spec = cls(**{k: v for k, v in data.items() if k in names})
+        for name in ('lot_step', 'min_lot', 'tick_size'):
+            value = getattr(spec, name)
+            if not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"{name} must be positive, got {value!r}")
+        return spec
+
+
+def infer_spec(symbol: str) -> SymbolSpec:
+    """
+    Default specification guessed from the symbol name
+
+    Args:
+        symbol: Symbol such as EURUSD, USDJPY, XAUUSD or BTCUSD (broker
+            suffixes like EURUSDm are ignored)
+
+    Returns:
+        Symbol specification
+    """
+    name = symbol.upper()
+    base, quote = name[:3], name[3:6]
+
+    if base in METALS:
+        contract_size, tick_size, digits = METALS[base]
+        return SymbolSpec(symbol, base, quote, contract_size, tick_size, digits)
+
+    for coin in CRYPTO:
+        if name.startswith(coin):
+            return SymbolSpec(symbol, coin, name[len(coin):len(coin) + 3], 1.0, 0.01, 2)
+
+    if quote == 'JPY':
+        return SymbolSpec(symbol, base, quote, tick_size=0.001, digits=3)
+    return SymbolSpec(symbol, base, quote)
+
+
+class SymbolSpecTable:
+    """
+    Cached symbol specifications with conversion to the account currency
+
+    Specs come from config/symbol_specs.json, from the EA (PUSH_SYMBOL_SPECS)
+    or are inferred from the symbol name. Latest prices are kept per symbol
+    so profit-currency amounts convert to the account currency through a
+    direct, inverse or USD cross rate; the latest live bid/ask (PUSH_TICKS)
+    is the reference price for new orders.
+    """
+
+    def __init__(self, account_currency: str = "USD"):
+        """
+        Initialize table
+
+        Args:
+            account_currency: Account deposit currency
+        """
+        self.account_currency = account_currency
+        self.specs: Dict[str, SymbolSpec] = {}
+        self.prices: Dict[str, float] = {}
+        self.quotes: Dict[str, Tuple[float, float]] = {}  # symbol -> (bid, ask)
+        self._lock = threading.Lock()
+
+    def load(self, path: Path = SPEC_FILE) -> int:
+        """
+        Load specs from a JSON file
+
+        Args:
+            path: File with {"account_currency": ..., "symbols": [spec, ...]}
+
+        Returns:
+            Number of specs loaded
+        """
+        if not path.exists():
+            return 0
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            self.account_currency = data.get('account_currency', self.account_currency)
+            return self.update_specs(data.get('symbols', []))
+        except Exception as e:
+            logger.error(f"Error loading symbol specs: {e}")
+            return 0
+
+    def update_specs(self, specs: list) -> int:
+        """
+        Add or replace specs
+
+        Args:
+            specs: Spec dictionaries (SymbolSpec fields; 'price' also updates the rate)
+
+        Returns:
+            Number of specs stored
+        """
+        stored = 0
+        for data in specs:
+            try:
+                spec = SymbolSpec.from_dict(data)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Invalid symbol spec {data.get('symbol')}: {e}")
+                continue
+            with self._lock:
+                self.specs[spec.symbol] = spec
+            if data.get('price'):
+                self.update_price(spec.symbol, data['price'])
+            stored += 1
+        return stored
+
+    def get(self, symbol: str) -> SymbolSpec:
+        """Get a symbol's spec (inferred and cached if unknown)"""
+        spec = self.specs.get(symbol)
+        if spec is None:
+            spec = infer_spec(symbol)
+            with self._lock:
+                spec = self.specs.setdefault(symbol, spec)
+        return spec
+
+    def update_price(self, symbol: str, price: float):
+        """Record the latest price of a symbol"""
+        if price and price > 0:
+            key = symbol.upper()
+            self.prices[key] = float(price)
+            if len(key) > 6 and key[:6].isalpha():
+                self.prices[key[:6]] = float(price)  # EURUSDm -> EURUSD for cross rates
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        """Latest known price of a symbol"""
+        return self.prices.get(symbol.upper())
+
+    def update_quotes(self, ticks: Iterable[Dict]) -> int:
+        """
+        Record the latest bid/ask from live ticks
+
+        Args:
+            ticks: Tick dictionaries with symbol, bid and ask
+
+        Returns:
+            Number of quotes recorded
+        """
+        recorded = 0
+        for tick in ticks:
+            try:
+                symbol, bid, ask = tick['symbol'], float(tick['bid']), float(tick['ask'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if bid > 0 and ask >= bid:
+                self.quotes[symbol.upper()] = (bid, ask)
+                self.update_price(symbol, (bid + ask) / 2.0)
+                recorded += 1
+        return recorded
+
+    def get_quote(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """Latest live (bid, ask) of a symbol, or None before its first tick"""
+        return self.quotes.get(symbol.upper())
+
+    def conversion_rate(self, currency: str) -> Optional[float]:
+        """
+        Rate converting an amount in ``currency`` to the account currency
+
+        Args:
+            currency: ISO currency code
+
+        Returns:
+            Multiplier, or None if no direct, inverse or USD cross rate is known
+        """
+        account = self.account_currency
+        rate = self.conversion_rate_between(currency, account)
+        if rate:
+            return rate
+        if 'USD' not in (currency, account):
+            to_usd = self.conversion_rate_between(currency, 'USD')
+            usd_to_account = self.conversion_rate_between('USD', account)
+            if to_usd and usd_to_account:
+                return to_usd * usd_to_account
+        return None
+
+    def conversion_rate_between(self, source: str, target: str) -> Optional[float]:
+        """Direct or inverse rate from one currency to another"""
+        if source == target:
+            return 1.0
+        direct = self.prices.get(source + target)
+        if direct:
+            return direct
+        inverse = self.prices.get(target + source)
+        return 1.0 / inverse if inverse else None
+
+    def value_per_lot(self, symbol: str, price_distance: float) -> Optional[float]:
+        """
+        Account-currency value of a price move for one lot
+
+        Args:
+            symbol: Trading symbol
+            price_distance: Price move (e.g. entry to stop loss)
+
+        Returns:
+            Value in the account currency, or None if no conversion rate is known
+        """
+        spec = self.get(symbol)
+        if spec.tick_value:
+            return price_distance / spec.tick_size * spec.tick_value
+        rate = self.conversion_rate(spec.quote_currency)
+        if rate is None:
+            return None
+        return price_distance * spec.contract_size * rate
+
+    def lot_size_for_risk(self, symbol: str, risk_amount: float, price_distance: float) -> Optional[float]:
+        """
+        Lot size that loses ``risk_amount`` over ``price_distance``
+
+        Args:
+            symbol: Trading symbol
+            risk_amount: Amount at risk in the account currency
+            price_distance: Distance from entry to stop loss in price units
+
+        Returns:
+            Lot size rounded to the symbol's lot step (0.0 if below the
+            minimum lot), or None if the value cannot be computed
+        """
+        if price_distance <= 0:
+            return None
+        value = self.value_per_lot(symbol, price_distance)
+        if not value:
+            return None
+        return self.get(symbol).round_lot(risk_amount / value)
+
+    def to_dict(self) -> Dict:
+        """Serialize specs (for the status API and config export)"""
+        return {
+            'account_currency': self.account_currency,
+            'symbols': [asdict(spec) for spec in self.specs.values()]
+        }
+
+
+# Singleton instance
+_symbol_specs = None
+
+def get_symbol_specs() -> SymbolSpecTable:
+    """Get singleton instance of SymbolSpecTable"""
+    global _symbol_specs
+    if _symbol_specs is None:
+        _symbol_specs = SymbolSpecTable()
+        _symbol_specs.load()
+    return _symbol_specs
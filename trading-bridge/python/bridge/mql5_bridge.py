@@ -26,6 +26,19 @@ except (ImportError, ValueError):
             sys.path.insert(0, str(bridge_dir))
         from signal_manager import SignalManager, TradeSignal
 
+try:
+    from utils.metrics import get_metrics_registry
+    from utils.latency_trace import get_signal_tracer
+    from utils.profiler import get_profiler
+    from ai.utils.symbol_specs import get_symbol_specs
+except ImportError:
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from utils.metrics import get_metrics_registry
+    from utils.latency_trace import get_signal_tracer
+    from utils.profiler import get_profiler
+    from ai.utils.symbol_specs import get_symbol_specs
+
 
 # Setup logging
 log_dir = Path(__file__).parent.parent.parent / "logs"
@@ -65,13 +78,41 @@ class MQL5Bridge:
         self.last_heartbeat = None
         self.heartbeat_timeout = 30  # seconds
         
+        # Receiver for PUSH_TICKS batches, e.g. DataCollector.ingest_ticks
+        self.tick_handler = None
+        
+        # Receivers for EXECUTION_REPORT and PUSH_POSITIONS, e.g. the risk manager's
+        # apply_execution(report) and reconcile_positions(positions, broker)
+        self.execution_handler = None
+        self.position_handler = None
+        
         # Statistics
         self.stats = {
             'signals_sent': 0,
             'signals_received': 0,
+            'ticks_received': 0,
+            'execution_reports': 0,
             'errors': 0,
             'reconnections': 0
         }
+        
+        # Latency and queue metrics
+        registry = get_metrics_registry()
+        self.request_latency = registry.histogram(
+            'bridge_request_duration_seconds', 'Bridge request handling time by action', ['action']
+        )
+        self.request_count = registry.counter(
+            'bridge_requests', 'Bridge requests by action and response status', ['action', 'status']
+        )
+        registry.gauge('signal_queue_depth', 'Signals waiting for the EA').set_function(
+            self.signal_manager.get_queue_size
+        )
+        registry.gauge('signal_queue_oldest_age_seconds', 'Age of the oldest queued signal').set_function(
+            self.signal_manager.get_oldest_age
+        )
+        
+        # Per-signal stage latencies (market data -> EA delivery)
+        self.tracer = get_signal_tracer()
     
     def start(self):
         """Start the bridge server"""
@@ -121,7 +162,11 @@ class MQL5Bridge:
                     continue
                 
                 # Process request
+                action = str(request.get('action', '')).upper() or 'NONE'
+                start = time.perf_counter()
                 response = self._process_request(request)
+                self.request_latency.labels(action).observe(time.perf_counter() - start)
+                self.request_count.labels(action, response.get('status', 'UNKNOWN')).inc()
                 
                 # Send response
                 self.socket.send_string(json.dumps(response))
@@ -155,6 +200,10 @@ class MQL5Bridge:
             count = request.get('count', None)
             signals = self.signal_manager.get_signals(count)
             signal_dicts = [s.to_dict() for s in signals]
+            delivered_at = time.monotonic()
+            for signal in signals:
+                signal.mark('delivered', delivered_at)
+                self.tracer.record(signal.signal_id, signal.symbol, signal.trace)
             self.stats['signals_sent'] += len(signals)
             logger.info(f"Sending {len(signals)} signals to MQL5")
             return {
@@ -182,6 +231,77 @@ class MQL5Bridge:
                 'queue_size': self.signal_manager.get_queue_size()
             }
         
+        elif action == 'PUSH_TICKS':
+            # Live ticks from MQL5 for real-time bar aggregation
+            ticks = request.get('ticks', [])
+            self.last_heartbeat = datetime.now()
+            self.connection_status = "connected"
+            # Latest bid/ask is the reference price for SL/TP of new orders
+            get_symbol_specs().update_quotes(ticks)
+            if self.tick_handler is None:
+                return {'status': 'OK', 'accepted': 0}
+            accepted = self.tick_handler(ticks)
+            self.stats['ticks_received'] += accepted
+            return {'status': 'OK', 'accepted': accepted}
+        
+        elif action == 'EXECUTION_REPORT':
+            # Position opened, modified or closed by the EA
+            reports = request.get('reports') or [request.get('report', {})]
+            self.stats['execution_reports'] += len(reports)
+            if self.execution_handler is None:
+                return {'status': 'OK', 'applied': 0}
+            applied = sum(1 for report in reports if self.execution_handler(report))
+            return {'status': 'OK', 'applied': applied}
+        
+        elif action == 'PUSH_POSITIONS':
+            # Full snapshot of the terminal's open positions
+            positions = request.get('positions', [])
+            if self.position_handler is None:
+                return {'status': 'OK'}
+            changes = self.position_handler(positions, request.get('broker'))
+            return {'status': 'OK', 'changes': {k: len(v) for k, v in changes.items()}}
+        
+        elif action == 'GET_SIGNAL_TRACE':
+            # Per-signal stage latencies, or p50/p95/p99 per stage
+            signal_id = request.get('signal_id')
+            if signal_id:
+                trace = self.tracer.get_trace(signal_id)
+                if trace is None:
+                    return {'status': 'ERROR', 'message': f'No trace for signal: {signal_id}'}
+                return {'status': 'OK', 'trace': trace}
+            return {
+                'status': 'OK',
+                'percentiles': self.tracer.get_percentiles(),
+                'recent': self.tracer.get_recent(int(request.get('count', 20)))
+            }
+        
+        elif action == 'PUSH_SYMBOL_SPECS':
+            # Contract specs from the terminal (SymbolInfo*) for exact position sizing
+            specs = get_symbol_specs()
+            if request.get('account_currency'):
+                specs.account_currency = request['account_currency']
+            stored = specs.update_specs(request.get('specs', []))
+            logger.info(f"Received {stored} symbol spec(s) from MQL5")
+            return {'status': 'OK', 'stored': stored}
+        
+        elif action == 'PROFILER':
+            # Runtime control of the stack sampler: START, STOP or STATUS
+            profiler = get_profiler()
+            command = request.get('command', 'STATUS').upper()
+            if command == 'START':
+                started = profiler.start(
+                    interval=float(request.get('interval', 0.02)),
+                    duration=request.get('duration'),
+                    threads=request.get('threads')
+                )
+                if not started:
+                    return {'status': 'ERROR', 'message': 'Profiler already running'}
+            elif command == 'STOP':
+                return {'status': 'OK', 'output': profiler.stop(), 'profiler': profiler.get_status()}
+            elif command != 'STATUS':
+                return {'status': 'ERROR', 'message': f'Unknown profiler command: {command}'}
+            return {'status': 'OK', 'profiler': profiler.get_status()}
+        
         elif action == 'GET_BRIDGE_STATUS':
             # Get bridge status
             return {
@@ -206,6 +326,7 @@ class MQL5Bridge:
         Returns:
             (success, error_message)
         """
+        signal.mark('queued')
         success, error = self.signal_manager.add_signal(signal)
         if success:
             logger.info(f"Signal queued: {signal.action} {signal.symbol} @ {signal.broker}")
@@ -7,6 +7,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 import json
+import time
 
 
 class TradeAction(Enum):
@@ -29,6 +30,8 @@ class TradeSignal:
     comment: str = ""
     timestamp: Optional[datetime] = None
     signal_id: Optional[str] = None
+    trace: Optional[Dict[str, float]] = None  # Stage -> time.monotonic()
+    price: Optional[float] = None  # Reference entry price SL/TP were computed from
     
     def __post_init__(self):
         """Initialize timestamp and signal_id if not provided"""
@@ -36,10 +39,24 @@ class TradeSignal:
             self.timestamp = datetime.now()
         if self.signal_id is None:
             self.signal_id = f"{self.symbol}_{self.action}_{int(self.timestamp.timestamp())}"
+        if self.trace is None:
+            self.trace = {}
+    
+    def mark(self, stage: str, at: Optional[float] = None):
+        """
+        Record when the signal reached a pipeline stage
+        
+        Args:
+            stage: Stage name (see utils.latency_trace.STAGES)
+            at: Monotonic timestamp (defaults to now)
+        """
+        self.trace[stage] = time.monotonic() if at is None else at
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert signal to dictionary"""
         data = asdict(self)
+        # Monotonic stage times are process-local; traces are served separately
+        data.pop('trace', None)
         if isinstance(data['timestamp'], datetime):
             data['timestamp'] = data['timestamp'].isoformat()
         return data
@@ -99,6 +116,19 @@ class TradeSignal:
             if self.stop_loss <= self.take_profit:
                 return False, "Stop loss must be greater than take profit for SELL"
         
+        # Validate SL/TP lie on the correct side of the reference entry price
+        if self.price:
+            if self.action.upper() == "BUY":
+                if self.stop_loss and self.stop_loss >= self.price:
+                    return False, "Stop loss must be below the entry price for BUY"
+                if self.take_profit and self.take_profit <= self.price:
+                    return False, "Take profit must be above the entry price for BUY"
+            elif self.action.upper() == "SELL":
+                if self.stop_loss and self.stop_loss <= self.price:
+                    return False, "Stop loss must be above the entry price for SELL"
+                if self.take_profit and self.take_profit >= self.price:
+                    return False, "Take profit must be below the entry price for SELL"
+        
         return True, None
 
 
@@ -178,6 +208,13 @@ class SignalManager:
         """Get current queue size"""
         return len(self.queue)
     
+    def get_oldest_age(self) -> float:
+        """Get age in seconds of the oldest queued signal (0 if empty)"""
+        queue = self.queue
+        if not queue:
+            return 0.0
+        return (datetime.now() - queue[0].timestamp).total_seconds()
+    
     def clear_queue(self):
         """Clear signal queue"""
         self.queue.clear()
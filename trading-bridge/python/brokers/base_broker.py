@@ -6,6 +6,8 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+from ai.utils.symbol_specs import get_symbol_specs
+
 
 @dataclass
 class BrokerConfig:
@@ -40,6 +42,8 @@ class Position:
     swap: float
     commission: float
     position_id: Optional[str] = None
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
 
 
 @dataclass
@@ -99,7 +103,7 @@ class BaseBroker(ABC):
         pass
     
     @abstractmethod
-    def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+    def get_positions(self, symbol: Optional[str] = None) -> Optional[List[Position]]:
         """
         Get open positions
         
@@ -107,7 +111,8 @@ class BaseBroker(ABC):
             symbol: Filter by symbol (None = all positions)
             
         Returns:
-            List of open positions
+            List of open positions, or None if the query failed (an empty
+            list means there are no open positions)
         """
         pass
     
@@ -162,7 +167,7 @@ class BaseBroker(ABC):
         return symbol and len(symbol) >= 3
     
     def calculate_lot_size(self, risk_percent: float, stop_loss_pips: float,
-                         account_balance: float) -> float:
+                         account_balance: float, symbol: Optional[str] = None) -> float:
         """
         Calculate lot size based on risk percentage
         
@@ -170,12 +175,19 @@ class BaseBroker(ABC):
             risk_percent: Risk percentage (e.g., 1.0 for 1%)
             stop_loss_pips: Stop loss in pips
             account_balance: Account balance
+            symbol: Trading symbol (enables exact sizing from its contract spec)
             
         Returns:
             Lot size
         """
         # Basic calculation - override in subclasses for broker-specific rules
         risk_amount = account_balance * (risk_percent / 100.0)
+        if symbol:
+            specs = get_symbol_specs()
+            distance = stop_loss_pips * specs.get(symbol).pip_size
+            lot_size = specs.lot_size_for_risk(symbol, risk_amount, distance)
+            if lot_size is not None:
+                return lot_size
         # Simplified calculation (should use pip value for symbol)
         lot_size = risk_amount / (stop_loss_pips * 10)  # Approximate
         return round(lot_size, 2)
@@ -1,6 +1,7 @@
 """
 Exness Broker API Implementation
 """
+import re
 import requests
 import time
 from typing import Dict, List, Optional, Any
@@ -8,16 +9,26 @@ from datetime import datetime
 
 from .base_broker import BaseBroker, BrokerConfig, OrderResult, Position, AccountInfo
 
+try:
+    from utils.metrics import get_metrics_registry
+except ImportError:  # brokers used without the service utils package: no metrics
+    get_metrics_registry = None
+
+# Collapse IDs in endpoint paths to keep metric label cardinality bounded
+_ENDPOINT_ID = re.compile(r'/[0-9][^/]*')
+
 
 class ExnessAPI(BaseBroker):
     """Exness broker API implementation"""
     
-    def __init__(self, config: BrokerConfig):
+    def __init__(self, config: BrokerConfig, metrics_registry=None):
         """
         Initialize Exness API
         
         Args:
             config: Broker configuration
+            metrics_registry: Registry for REST latency metrics (None = the
+                service registry if available, else no metrics)
         """
         super().__init__(config)
         self.session = requests.Session()
@@ -36,6 +47,20 @@ class ExnessAPI(BaseBroker):
         self.last_request_time = 0
         self.min_request_interval = 0.1  # 100ms between requests
         self.rate_limit = config.rate_limit or {'requests_per_minute': 60}
+        
+        # REST latency metrics
+        self.request_latency = None
+        self.request_errors = None
+        registry = metrics_registry or (get_metrics_registry() if get_metrics_registry else None)
+        if registry is not None:
+            self.request_latency = registry.histogram(
+                'broker_request_duration_seconds', 'Broker REST request time by endpoint',
+                ['broker', 'method', 'endpoint']
+            )
+            self.request_errors = registry.counter(
+                'broker_request_errors', 'Failed broker REST requests by endpoint',
+                ['broker', 'method', 'endpoint']
+            )
     
     def _rate_limit(self):
         """Apply rate limiting"""
@@ -60,14 +85,21 @@ class ExnessAPI(BaseBroker):
         self._rate_limit()
         
         url = f"{self.base_url}{endpoint}"
+        labels = (self.name, method.upper(), _ENDPOINT_ID.sub('/{id}', endpoint.split('?')[0]))
         
+        start = time.perf_counter()
         try:
             response = self.session.request(method, url, timeout=10, **kwargs)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
+            if self.request_errors is not None:
+                self.request_errors.labels(*labels).inc()
             # Don't expose API details in error
             return {'error': 'API request failed', 'details': str(e)}
+        finally:
+            if self.request_latency is not None:
+                self.request_latency.labels(*labels).observe(time.perf_counter() - start)
     
     def place_order(self, symbol: str, action: str, lot_size: float,
                    stop_loss: Optional[float] = None,
@@ -155,7 +187,7 @@ class ExnessAPI(BaseBroker):
             currency=response.get('currency', 'USD')
         )
     
-    def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+    def get_positions(self, symbol: Optional[str] = None) -> Optional[List[Position]]:
         """
         Get open positions from Exness
         
@@ -163,7 +195,7 @@ class ExnessAPI(BaseBroker):
             symbol: Filter by symbol (None = all)
             
         Returns:
-            List of positions
+            List of positions, or None if the request failed
         """
         endpoint = '/positions'
         if symbol:
@@ -172,7 +204,7 @@ class ExnessAPI(BaseBroker):
         response = self._make_request('GET', endpoint)
         
         if 'error' in response or 'positions' not in response:
-            return []
+            return None
         
         positions = []
         for pos_data in response.get('positions', []):
@@ -185,7 +217,10 @@ class ExnessAPI(BaseBroker):
                 profit=float(pos_data.get('profit', 0)),
                 swap=float(pos_data.get('swap', 0)),
                 commission=float(pos_data.get('commission', 0)),
-                position_id=pos_data.get('position_id')
+                position_id=pos_data.get('position_id'),
+                # 0 / missing = not set, as in the EA's PUSH_POSITIONS snapshot
+                stop_loss=float(pos_data['stop_loss']) if pos_data.get('stop_loss') else None,
+                take_profit=float(pos_data['take_profit']) if pos_data.get('take_profit') else None
             )
             positions.append(position)
         
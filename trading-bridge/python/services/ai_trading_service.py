@@ -40,6 +40,9 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+from utils.metrics import get_metrics_registry, start_metrics_server
+from utils.load_shedding import Priority
+
 # Import existing components
 try:
     from bridge.mql5_bridge import MQL5Bridge
@@ -55,15 +58,21 @@ except ImportError as e:
 # Import AI components
 try:
     from ai.strategy_engine import AIStrategyEngine
+    # Importing the strategy modules registers them as plugins
     from ai.strategies.ml_strategy import MLStrategy
     from ai.strategies.technical_strategy import TechnicalStrategy
     from ai.strategies.scalping_strategy import ScalpingStrategy
+    from ai.strategies.registry import StrategyRegistry, strategy_plugins
+    from ai.utils.data_collector import DataCollector
 except ImportError as e:
     logger.warning(f"AI components import error: {e}")
     AIStrategyEngine = None
     MLStrategy = None
     TechnicalStrategy = None
     ScalpingStrategy = None
+    StrategyRegistry = None
+    strategy_plugins = None
+    DataCollector = None
 
 
 class AITradingService:
@@ -86,25 +95,47 @@ class AITradingService:
         self.brokers = {}
         self.trader = None
         self.ai_engine = None
-        self.strategies = []
+        self.strategies = StrategyRegistry() if StrategyRegistry else []
+        self.data_collector = None
         self.running = False
         self.bridge_thread = None
         
         # Trading symbols to monitor
         self.symbols = self.config.get('symbols', [])
         
+        # Timeframes to analyze (Scalping + Standard)
+        self.timeframes = self.config.get('timeframes', ["5m", "15m", "30m", "1h"])
+        
         # Analysis interval (seconds)
         self.analysis_interval = self.config.get('analysis_interval', 300)  # 5 minutes default
         
         # Health check
         self.last_health_check = None
         self.health_check_interval = 60  # seconds
+        
+        # Load shedding (attached by the background service when resource monitoring is
+        # available; in AI mode this loop is the one that updates the policy)
+        self.resource_monitor = None
+        self.load_policy = None
+        
+        # Metrics endpoint (0 disables)
+        self.metrics_port = self.config.get('metrics_port', 9108)
+        self.metrics_server = None
+        self.stage_latency = get_metrics_registry().histogram(
+            'service_cycle_stage_seconds', 'Time spent in each service loop stage', ['stage']
+        )
     
     def start(self):
         """Start the AI trading service"""
         try:
             logger.info("Starting AI Trading Service...")
             
+            if self.metrics_port:
+                try:
+                    self.metrics_server = start_metrics_server(self.metrics_port)
+                except OSError as e:
+                    logger.warning(f"Metrics endpoint not started on port {self.metrics_port}: {e}")
+            
             # Initialize AI engine
             if AIStrategyEngine:
                 self.ai_engine = AIStrategyEngine(config=self.config.get('ai', {}))
@@ -119,7 +150,10 @@ class AITradingService:
             # Initialize bridge
             if MQL5Bridge:
                 self.bridge = MQL5Bridge(port=self.bridge_port)
-                self.bridge_thread = threading.Thread(target=self._run_bridge, daemon=True)
+                # EA execution reports and position snapshots keep risk state current
+                self.bridge.execution_handler = self.ai_engine.apply_execution
+                self.bridge.position_handler = self.ai_engine.reconcile_positions
+                self.bridge_thread = threading.Thread(target=self._run_bridge, name='bridge', daemon=True)
                 self.bridge_thread.start()
                 time.sleep(2)  # Wait for bridge to start
                 logger.info("MQL5 Bridge started")
@@ -143,6 +177,9 @@ class AITradingService:
             # Load symbols from config
             self._load_symbols()
             
+            # Aggregate live ticks from the EA into bars
+            self._start_realtime_collection()
+            
             # Start main loop
             self.running = True
             logger.info("AI Trading Service started")
@@ -158,30 +195,25 @@ class AITradingService:
             self.running = False
     
     def _initialize_strategies(self):
-        """Initialize trading strategies"""
-        try:
-            # ML Strategy
-            if MLStrategy:
-                ml_strategy = MLStrategy(config=self.config.get('ml_strategy', {}))
-                self.strategies.append(ml_strategy)
-                logger.info("ML Strategy initialized")
-            
-            # Technical Strategy
-            if TechnicalStrategy:
-                tech_strategy = TechnicalStrategy(config=self.config.get('technical_strategy', {}))
-                self.strategies.append(tech_strategy)
-                logger.info("Technical Strategy initialized")
-            
-            # Scalping Strategy
-            if ScalpingStrategy:
-                scalping_strategy = ScalpingStrategy(config=self.config.get('scalping_strategy', {}))
-                self.strategies.append(scalping_strategy)
-                logger.info("Scalping Strategy initialized")
-
-            logger.info(f"Initialized {len(self.strategies)} strategy(ies)")
-            
-        except Exception as e:
-            logger.error(f"Error initializing strategies: {e}")
+        """Initialize the registered strategy plugins (ML, technical, scalping, ...)"""
+        if not strategy_plugins:
+            return
+        
+        for key, strategy_class in strategy_plugins().items():
+            strategy_config = self.config.get(key, {})
+            if not strategy_config.get('enabled', True):
+                continue
+            try:
+                strategy = strategy_class(config=strategy_config)
+                self.strategies.register(strategy)
+                logger.info(f"{strategy.name} initialized")
+            except Exception as e:
+                logger.error(f"Error initializing {key}: {e}")
+        
+        # Indicators are computed only for what the strategies declare
+        if self.ai_engine:
+            self.ai_engine.set_strategy_registry(self.strategies)
+        logger.info(f"Initialized {len(self.strategies)} strategy(ies)")
     
     def _load_symbols(self):
         """Load trading symbols from configuration"""
@@ -208,6 +240,29 @@ class AITradingService:
             logger.error(f"Error loading symbols: {e}")
             self.symbols = ['EURUSD']  # Fallback
     
+    def _start_realtime_collection(self):
+        """Route EA ticks into real-time bars used by the market analyzer"""
+        if not DataCollector:
+            return
+        
+        try:
+            self.data_collector = DataCollector(config=self.config.get('data_collector', {}))
+            for symbol in self.symbols:
+                for timeframe in self.timeframes:
+                    self.data_collector.collect_realtime_data(symbol, timeframe)
+            
+            self.data_collector.start_writer()
+            if self.bridge:
+                self.bridge.tick_handler = self.data_collector.ingest_ticks
+            if self.ai_engine:
+                self.ai_engine.set_live_source(self.data_collector)
+            
+            logger.info("Real-time bar collection started")
+            
+        except Exception as e:
+            logger.error(f"Error starting real-time collection: {e}")
+            self.data_collector = None
+    
     def _run_bridge(self):
         """Run bridge in separate thread"""
         try:
@@ -222,15 +277,33 @@ class AITradingService:
         
         while self.running:
             try:
-                # Health check
-                self._health_check()
+                # Background loop does not run in AI mode: update shedding here
+                # (update() ignores cached readings it has already applied)
+                if self.load_policy and self.resource_monitor:
+                    self.load_policy.update(self.resource_monitor.check_resources())
+                
+                # Monitor positions and reconcile the risk manager's view
+                if self.trader and self._allows(Priority.HIGH):
+                    with self.stage_latency.labels('monitor_positions').time():
+                        positions = self.trader.monitor_positions()
+                        for broker_name, broker_positions in positions.items():
+                            self.ai_engine.reconcile_positions(broker_positions, broker_name)
+                        self.ai_engine.save_risk_state()
                 
                 # Analyze markets and generate signals
-                self._analyze_and_trade()
+                if self._allows(Priority.NORMAL):
+                    with self.stage_latency.labels('analyze_and_trade').time():
+                        self._analyze_and_trade()
+                
+                # Health check
+                if self._allows(Priority.LOW):
+                    with self.stage_latency.labels('health_check').time():
+                        self._health_check()
                 
-                # Monitor positions
-                if self.trader:
-                    self.trader.monitor_positions()
+                # Hot-swap retrained model files
+                if self.ai_engine and self._allows(Priority.LOW):
+                    with self.stage_latency.labels('model_refresh').time():
+                        self.ai_engine.refresh_models()
                 
                 # Sleep before next iteration
                 time.sleep(self.analysis_interval)
@@ -245,20 +318,52 @@ class AITradingService:
                 logger.error(traceback.format_exc())
                 time.sleep(10)  # Wait before retrying
     
+    def _allows(self, priority: Priority) -> bool:
+        """Check whether the load shedding policy lets work run"""
+        if self.load_policy is None:
+            return True
+        return self.load_policy.allows(priority)
+    
     def _analyze_and_trade(self):
         """Analyze markets and execute trades"""
         if not self.ai_engine:
             return
         
-        # Define timeframes to analyze (Scalping + Standard)
-        timeframes = ["5m", "15m", "30m", "1h"]
+        symbols = self.symbols
+        timeframes = self.timeframes
+        if self.load_policy:
+            # Reduced breadth under load: rotating symbol subset, coarse timeframes
+            symbols = self.load_policy.select_symbols(symbols)
+            timeframes = self.load_policy.select_timeframes(timeframes)
+
+        candidates = self._collect_candidates(symbols, timeframes)
+        self._assess_and_process(candidates)
+
+    def _collect_candidates(self, symbols: List[str], timeframes: List[str]) -> List[tuple]:
+        """
+        Analyze symbols and pick each pair's best strategy signal
 
-        for symbol in self.symbols:
+        Args:
+            symbols: Symbols to analyze
+            timeframes: Timeframes to analyze
+
+        Returns:
+            List of (symbol, signal, market_analysis, trace) for signals that
+            pass the minimum confidence
+        """
+        # Analyze every symbol/timeframe with one batched prediction pass
+        pairs = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+        # Snapshot tick arrival times first: ticks landing during analysis did not feed it
+        tick_received = dict(self.data_collector.last_tick_received) if self.data_collector else {}
+        analysis_start = time.monotonic()
+        analyses = self.ai_engine.analyze_batch(pairs)
+        analysis_done = time.monotonic()
+
+        candidates = []
+        for symbol in symbols:
             for timeframe in timeframes:
                 try:
-                    # Analyze market
-                    logger.debug(f"Analyzing {symbol} ({timeframe})...")
-                    market_analysis = self.ai_engine.analyze_market(symbol, timeframe=timeframe)
+                    market_analysis = analyses.get((symbol, timeframe), {'error': 'No analysis'})
 
                     if 'error' in market_analysis:
                         # Log warning only if it's not just "No market data" to avoid noise
@@ -270,7 +375,7 @@ class AITradingService:
                     best_signal = None
                     best_confidence = 0.0
 
-                    for strategy in self.strategies:
+                    for strategy in self.strategies.active():
                         try:
                             signal = strategy.generate_signal(symbol, market_analysis)
                             if signal and signal.get('confidence', 0.0) > best_confidence:
@@ -279,15 +384,51 @@ class AITradingService:
                         except Exception as e:
                             logger.error(f"Error in strategy {strategy.name}: {e}")
 
-                    # If we have a good signal, assess risk and execute
-                    if best_signal and best_confidence >= self.config.get('min_confidence', 0.6):
-                        self._process_signal(symbol, best_signal, market_analysis)
+                    # Keep good signals for one portfolio-level risk assessment
+                    if (best_signal and best_signal.get('action', 'HOLD') != 'HOLD' and
+                            best_confidence >= self.config.get('min_confidence', 0.6)):
+                        trace = {
+                            'analysis_start': analysis_start,
+                            'analysis_done': analysis_done,
+                            'strategy_done': time.monotonic()
+                        }
+                        if symbol in tick_received:
+                            trace['market_data'] = tick_received[symbol]
+                        # Latest close and ATR let the risk manager set absolute SL/TP
+                        best_signal = dict(
+                            best_signal,
+                            price=market_analysis.get('close_price'),
+                            atr=market_analysis.get('atr')
+                        )
+                        candidates.append((symbol, best_signal, market_analysis, trace))
 
                 except Exception as e:
                     logger.error(f"Error analyzing {symbol} {timeframe}: {e}")
+
+        return candidates
+
+    def _assess_and_process(self, candidates: List[tuple]):
+        """
+        Assess candidates against one portfolio risk budget and send the
+        approved signals
+
+        Args:
+            candidates: Output of _collect_candidates
+        """
+        if not candidates:
+            return
+
+        # Rank all candidates and split the portfolio risk budget in one pass
+        assessments = self.ai_engine.assess_batch([signal for _, signal, _, _ in candidates])
+        risk_done = time.monotonic()
+        for (symbol, signal, market_analysis, trace), risk_assessment in zip(candidates, assessments):
+            trace['risk_done'] = risk_done
+            self._process_signal(symbol, signal, market_analysis, trace, risk_assessment)
     
-    def _process_signal(self, symbol: str, signal: Dict, market_analysis: Dict):
-        """Process trading signal"""
+    def _process_signal(self, symbol: str, signal: Dict, market_analysis: Dict,
+                        trace: Optional[Dict[str, float]] = None,
+                        risk_assessment: Optional[Dict] = None):
+        """Process trading signal (assessing risk unless already assessed)"""
         try:
             action = signal.get('action', 'HOLD')
             confidence = signal.get('confidence', 0.0)
@@ -296,7 +437,10 @@ class AITradingService:
                 return
             
             # Assess risk
-            risk_assessment = self.ai_engine.assess_risk(signal)
+            if risk_assessment is None:
+                risk_assessment = self.ai_engine.assess_risk(signal)
+                if trace is not None:
+                    trace['risk_done'] = time.monotonic()
             
             if not risk_assessment.get('approved', False):
                 logger.info(f"Signal for {symbol} not approved by risk manager")
@@ -315,7 +459,9 @@ class AITradingService:
                 lot_size=lot_size,
                 stop_loss=stop_loss,
                 take_profit=take_profit,
-                comment=f"AI Signal: {signal.get('reasoning', '')} (confidence: {confidence:.2f})"
+                comment=f"AI Signal: {signal.get('reasoning', '')} (confidence: {confidence:.2f})",
+                trace=trace,
+                price=risk_assessment.get('entry_price')
             )
             
             # Send signal to bridge or execute directly
@@ -367,6 +513,8 @@ class AITradingService:
                 try:
                     account_info = broker.get_account_info()
                     logger.debug(f"{broker_name} account balance: {account_info.balance}")
+                    if self.ai_engine and broker_name == self.config.get('default_broker', 'EXNESS'):
+                        self.ai_engine.set_account_balance(account_info.balance, account_info.currency)
                 except Exception as e:
                     logger.warning(f"{broker_name} health check failed: {e}")
             
@@ -380,8 +528,30 @@ class AITradingService:
         if self.bridge:
             self.bridge.stop()
         
+        if self.data_collector:
+            self.data_collector.stop_writer()
+        
+        if self.ai_engine:
+            self.ai_engine.save_risk_state()
+        
+        self._release_models()
+        
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+            self.metrics_server = None
+        
         logger.info("AI Trading Service stopped")
     
+    def _release_models(self):
+        """Release the shared model references of the strategies and engine"""
+        for strategy in self.strategies:
+            try:
+                strategy.close()
+            except Exception as e:
+                logger.error(f"Error closing strategy {strategy.name}: {e}")
+        if self.ai_engine:
+            self.ai_engine.release_models()
+    
     def get_status(self) -> Dict:
         """Get service status"""
         status = {
@@ -399,6 +569,9 @@ class AITradingService:
         if self.ai_engine:
             status['ai_engine_status'] = self.ai_engine.get_status()
         
+        if self.load_policy:
+            status['load_shedding'] = self.load_policy.get_status()
+        
         return status
 
 
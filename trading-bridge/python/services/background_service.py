@@ -32,6 +32,7 @@ try:
     from brokers.broker_factory import BrokerFactory
     from trader.multi_symbol_trader import MultiSymbolTrader
     from utils.resource_monitor import ResourceMonitor
+    from utils.load_shedding import LoadSheddingPolicy, Priority
 except ImportError as e:
     # Log error but don't crash - allow service to start with minimal
     # functionality
@@ -46,6 +47,7 @@ except ImportError as e:
     BrokerFactory = None
     MultiSymbolTrader = None
     ResourceMonitor = None
+    LoadSheddingPolicy = None
 finally:
     # Restore original working directory
     try:
@@ -102,9 +104,16 @@ class BackgroundTradingService:
                 cpu_critical_threshold=85.0,
                 memory_warning_threshold=80.0,
                 memory_critical_threshold=90.0,
-                check_interval=30
+                check_interval=30,
+                profile_on_critical=os.environ.get(
+                    'TRADING_PROFILE_ON_CRITICAL') == '1'
             )
 
+        # Graded load shedding driven by the resource monitor
+        self.load_policy = None
+        if self.resource_monitor is not None:
+            self.load_policy = LoadSheddingPolicy()
+
         # Check if modules are available
         self.modules_available = MQL5Bridge is not None
 
@@ -133,7 +142,7 @@ class BackgroundTradingService:
 
             # Start bridge in separate thread
             self.bridge_thread = threading.Thread(
-                target=self._run_bridge, daemon=True)
+                target=self._run_bridge, name='bridge', daemon=True)
             self.bridge_thread.start()
 
             # Wait for bridge to start
@@ -189,25 +198,10 @@ class BackgroundTradingService:
                 # Check and adapt to resource usage
                 if self.resource_monitor:
                     resources = self.resource_monitor.check_resources()
-                    
-                    # Emergency brake if resources critical
-                    if resources['is_critical']:
-                        logger.warning(
-                            "CRITICAL: System resources exhausted - "
-                            "pausing heavy operations"
-                        )
-                        # Skip trading operations but keep monitoring
-                        time.sleep(resources['sleep_interval'])
-                        continue
-                
-                # Health check
-                self._health_check()
+                    self.load_policy.update(resources)
 
-                # Monitor positions
-                if self.trader:
-                    self.trader.monitor_positions()
-
-                # Check bridge status
+                # Bridge connectivity is on the signal delivery path - always
+                # checked
                 if self.bridge:
                     status = self.bridge.get_status()
                     if status['connection_status'] == 'disconnected':
@@ -215,6 +209,14 @@ class BackgroundTradingService:
                             "Bridge disconnected, attempting to reconnect...")
                         # Bridge will auto-reconnect on next request
 
+                # Monitor positions
+                if self.trader and self._allows(Priority.HIGH):
+                    self.trader.monitor_positions()
+
+                # Health check
+                if self._allows(Priority.LOW):
+                    self._health_check()
+
                 # Use adaptive sleep based on resource usage
                 if self.resource_monitor:
                     sleep_interval = self.resource_monitor.get_adaptive_sleep()
@@ -232,6 +234,12 @@ class BackgroundTradingService:
                 # Longer sleep on error to prevent resource exhaustion
                 time.sleep(30)
 
+    def _allows(self, priority) -> bool:
+        """Check whether the load shedding policy lets work run"""
+        if self.load_policy is None:
+            return True
+        return self.load_policy.allows(priority)
+
     def _service_loop_minimal(self):
         """Minimal service loop when modules not available"""
         while self.running:
@@ -280,9 +288,14 @@ class BackgroundTradingService:
     def _start_ai_service(self):
         """Start AI trading service"""
         try:
-            from services.ai_trading_service import AITradingService
+            from utils.import_budget import ImportTimer
             import json
 
+            with ImportTimer() as import_timer:
+                from services.ai_trading_service import AITradingService
+            import_timer.log_report(
+                verbose=os.environ.get('TRADING_IMPORT_REPORT') == '1')
+
             # Load AI config
             config_file = (
                 Path(__file__).parent.parent.parent / "config" /
@@ -292,8 +305,21 @@ class BackgroundTradingService:
                 with open(config_file, 'r') as f:
                     config = json.load(f)
 
-            self.ai_service = AITradingService(
-                bridge_port=self.bridge_port, config=config)
+            # TRADING_WORKERS=N (or "workers" in ai_config.json) shards
+            # analysis across N worker processes
+            workers = int(os.environ.get(
+                'TRADING_WORKERS', config.get('workers', 0)) or 0)
+            if workers > 1:
+                from services.sharded_service import ShardedAITradingService
+                self.ai_service = ShardedAITradingService(
+                    bridge_port=self.bridge_port, config=config,
+                    workers=workers)
+                logger.info(f"Sharded AI service with {workers} workers")
+            else:
+                self.ai_service = AITradingService(
+                    bridge_port=self.bridge_port, config=config)
+            self.ai_service.resource_monitor = self.resource_monitor
+            self.ai_service.load_policy = self.load_policy
             self.ai_service.start()
 
         except ImportError as e:
@@ -312,6 +338,8 @@ class BackgroundTradingService:
         if self.use_ai and self.ai_service:
             logger.info("Stopping AI Trading Service...")
             self.ai_service.stop()
+            if self.resource_monitor:
+                self.resource_monitor.stop()
             return
 
         logger.info("Stopping Background Trading Service...")
@@ -320,6 +348,9 @@ class BackgroundTradingService:
         if self.bridge:
             self.bridge.stop()
 
+        if self.resource_monitor:
+            self.resource_monitor.stop()
+
         logger.info("Background Trading Service stopped")
 
     def get_status(self) -> dict:
@@ -0,0 +1,300 @@
+"""
+Sharded AI Trading Service
+Partitions symbols across worker processes for multi-core analysis
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from typing import Dict, List, Optional
+
+from services.ai_trading_service import AITradingService, AIStrategyEngine
+from utils.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ai.utils.shared_bars import SharedBarPlane
+except ImportError as e:
+    logger.warning(f"Shared bar plane unavailable: {e}")
+    SharedBarPlane = None
+
+
+def shard_symbols(symbols: List[str], count: int) -> List[List[str]]:
+    """
+    Partition symbols round-robin into shards
+
+    Args:
+        symbols: All monitored symbols
+        count: Number of shards
+
+    Returns:
+        Non-empty symbol lists (fewer than ``count`` if there are fewer symbols)
+    """
+    count = max(1, min(count, len(symbols)))
+    return [symbols[i::count] for i in range(count)]
+
+
+def _merge_market_prices(target: Dict, market_prices: Dict):
+    """Merge one worker's market prices into the cycle's combined prices"""
+    for bar_time, prices in market_prices.get('bars', {}).items():
+        target['bars'].setdefault(bar_time, {}).update(prices)
+    target['latest'].update(market_prices.get('latest', {}))
+
+
+def _worker_main(shard_id: int, symbols: List[str], timeframes: List[str], config: Dict,
+                 inbox, outbox, bar_prefix: Optional[str] = None):
+    """
+    Analysis worker process
+
+    Runs its own analyzer and strategies for one shard of symbols. Live bars
+    are read from the coordinator's shared bar plane, or (without one) built
+    by the worker from routed ticks. Messages are (kind, cycle, payload)
+    tuples: 'ticks' feeds live ticks, 'analyze' runs one cycle and answers
+    with the candidate signals and market prices, 'stop' ends the process.
+
+    Args:
+        shard_id: Shard index
+        symbols: Symbols owned by this shard
+        timeframes: Timeframes to collect bars for
+        config: Service configuration
+        inbox: Queue of messages from the coordinator
+        outbox: Queue of results to the coordinator
+        bar_prefix: Shared bar plane to attach to (None = own bars)
+    """
+    service = AITradingService(config=dict(config, metrics_port=0))
+    service.symbols = list(symbols)
+    service.timeframes = list(timeframes)
+    if AIStrategyEngine:
+        service.ai_engine = AIStrategyEngine(config=config.get('ai', {}))
+    service._initialize_strategies()
+
+    bar_plane = None
+    if bar_prefix and SharedBarPlane:
+        bar_plane = SharedBarPlane(bar_prefix)
+        if service.ai_engine:
+            service.ai_engine.set_live_source(bar_plane)
+    else:
+        service._start_realtime_collection()
+    outbox.put(('ready', shard_id, None, os.getpid()))
+    logger.info(f"Shard {shard_id} worker started with {len(symbols)} symbol(s)")
+
+    while True:
+        try:
+            kind, cycle, payload = inbox.get()
+        except (EOFError, KeyboardInterrupt):
+            break
+
+        if kind == 'stop':
+            break
+        elif kind == 'ticks':
+            if service.data_collector:
+                service.data_collector.ingest_ticks(payload)
+        elif kind == 'analyze':
+            candidates = []
+            market_prices = {'bars': {}, 'latest': {}}
+            if service.ai_engine:
+                service.ai_engine.refresh_models()
+                try:
+                    cycle_symbols, cycle_timeframes = payload
+                    candidates = service._collect_candidates(cycle_symbols, cycle_timeframes)
+                    market_prices = service.ai_engine.last_market_prices
+                except Exception as e:
+                    logger.error(f"Shard {shard_id} analysis error: {e}")
+            outbox.put(('candidates', shard_id, cycle, {
+                'candidates': candidates,
+                'market_prices': market_prices
+            }))
+
+    if service.data_collector:
+        service.data_collector.stop_writer()
+    service._release_models()
+    if bar_plane:
+        bar_plane.close()
+    logger.info(f"Shard {shard_id} worker stopped")
+
+
+class ShardedAITradingService(AITradingService):
+    """
+    AI trading service with analysis spread over worker processes
+
+    The coordinator (this process) owns the bridge, brokers, risk manager and
+    signal delivery. Symbols are partitioned across workers, each with its own
+    analyzer, indicator state and strategies, so pandas-ta and strategy code
+    run in parallel instead of serializing on one interpreter lock. Live bars
+    are built once by the coordinator and published to a shared bar plane
+    that workers read without locking (config 'shared_bars', default on);
+    otherwise ticks are routed to the owning worker. Each cycle the workers
+    return candidate signals over multiprocessing queues and the coordinator
+    assesses them against one portfolio risk budget.
+    """
+
+    def __init__(self, bridge_port: int = 5500, config: Optional[Dict] = None,
+                 workers: Optional[int] = None):
+        """
+        Initialize sharded service
+
+        Args:
+            bridge_port: Port for MQL5 bridge
+            config: Configuration dictionary ('workers', 'shard_timeout',
+                'shared_bars')
+            workers: Number of worker processes (default: config 'workers',
+                else one per CPU core minus one for the coordinator)
+        """
+        super().__init__(bridge_port=bridge_port, config=config)
+        self.worker_count = workers or self.config.get('workers') or max(1, (os.cpu_count() or 2) - 1)
+        self.shard_timeout = self.config.get('shard_timeout', 120)  # Seconds to wait for a cycle
+        self.shared_bars = self.config.get('shared_bars', True) and SharedBarPlane is not None
+        self.bar_plane = None
+        self.shards: List[List[str]] = []
+        self.symbol_shard: Dict[str, int] = {}
+        self.workers: List[Optional[multiprocessing.Process]] = []
+        self.inboxes = []
+        self.outbox = None
+        self._cycle = 0
+        # spawn: workers must not inherit the bridge socket or running threads
+        self._context = multiprocessing.get_context('spawn')
+        self.shard_timeouts = get_metrics_registry().counter(
+            'shard_cycle_timeouts', 'Analysis cycles a shard did not answer in time', ['shard']
+        )
+
+    def _start_realtime_collection(self):
+        """Start the workers and feed them live bars"""
+        if self.shared_bars:
+            # Single writer: ticks -> this process's bars -> shared plane
+            super()._start_realtime_collection()
+            if self.data_collector:
+                capacity = self.data_collector.aggregator.capacity
+                self.bar_plane = SharedBarPlane(f"tb{os.getpid()}", capacity=capacity, create=True)
+                self.data_collector.publish_to(self.bar_plane)
+
+        self.shards = shard_symbols(self.symbols, self.worker_count)
+        self.symbol_shard = {symbol: i for i, shard in enumerate(self.shards) for symbol in shard}
+        self.outbox = self._context.Queue()
+        self.inboxes = [self._context.Queue() for _ in self.shards]
+        self.workers = [None] * len(self.shards)
+        for shard_id in range(len(self.shards)):
+            self._start_worker(shard_id)
+
+        if self.bridge and self.bar_plane is None:
+            self.bridge.tick_handler = self._route_ticks
+        logger.info(f"Started {len(self.shards)} analysis worker(s)"
+                    f"{' on shared bars' if self.bar_plane else ''}")
+
+    def _start_worker(self, shard_id: int):
+        """Start (or restart) one shard's worker process"""
+        process = self._context.Process(
+            target=_worker_main,
+            args=(shard_id, self.shards[shard_id], self.timeframes, self.config,
+                  self.inboxes[shard_id], self.outbox,
+                  self.bar_plane.prefix if self.bar_plane else None),
+            name=f'analysis-shard-{shard_id}',
+            daemon=True
+        )
+        process.start()
+        self.workers[shard_id] = process
+
+    def _check_workers(self):
+        """Restart workers that exited"""
+        for shard_id, process in enumerate(self.workers):
+            if process is not None and not process.is_alive():
+                logger.warning(f"Shard {shard_id} worker exited ({process.exitcode}) - restarting")
+                self._start_worker(shard_id)
+
+    def _route_ticks(self, ticks: List[Dict]) -> int:
+        """
+        Forward a PUSH_TICKS batch to the workers owning its symbols
+
+        Args:
+            ticks: Tick dictionaries from the EA
+
+        Returns:
+            Number of ticks forwarded
+        """
+        batches: Dict[int, List[Dict]] = {}
+        for tick in ticks:
+            shard_id = self.symbol_shard.get(tick.get('symbol'))
+            if shard_id is not None:
+                batches.setdefault(shard_id, []).append(tick)
+        for shard_id, batch in batches.items():
+            self.inboxes[shard_id].put(('ticks', None, batch))
+        return sum(len(batch) for batch in batches.values())
+
+    def _analyze_and_trade(self):
+        """Run one analysis cycle on every shard and trade the combined candidates"""
+        if not self.ai_engine or not self.workers:
+            return
+
+        self._check_workers()
+
+        symbols = self.symbols
+        timeframes = self.timeframes
+        if self.load_policy:
+            symbols = self.load_policy.select_symbols(symbols)
+            timeframes = self.load_policy.select_timeframes(timeframes)
+
+        self._cycle += 1
+        pending = set()
+        for shard_id, shard in enumerate(self.shards):
+            cycle_symbols = [symbol for symbol in symbols if self.symbol_shard.get(symbol) == shard_id]
+            if cycle_symbols:
+                self.inboxes[shard_id].put(('analyze', self._cycle, (cycle_symbols, timeframes)))
+                pending.add(shard_id)
+
+        candidates = []
+        market_prices = {'bars': {}, 'latest': {}}
+        deadline = time.monotonic() + self.shard_timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                kind, shard_id, cycle, payload = self.outbox.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if kind != 'candidates' or cycle != self._cycle:
+                continue  # Startup notice or a late answer to an earlier cycle
+            pending.discard(shard_id)
+            candidates.extend(payload['candidates'])
+            _merge_market_prices(market_prices, payload['market_prices'])
+
+        for shard_id in pending:
+            self.shard_timeouts.labels(str(shard_id)).inc()
+        if pending:
+            logger.warning(f"Shard(s) {sorted(pending)} did not answer within {self.shard_timeout}s")
+
+        # Joint correlation updates across all shards, then one portfolio assessment
+        self.ai_engine.update_market_prices(market_prices)
+        self._assess_and_process(candidates)
+
+    def stop(self):
+        """Stop the workers, then the coordinator"""
+        for inbox in self.inboxes:
+            inbox.put(('stop', None, None))
+        for process in self.workers:
+            if process is None:
+                continue
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self.workers = []
+        super().stop()
+        if self.bar_plane:
+            if self.data_collector:
+                self.data_collector.aggregator.listener = None
+            self.bar_plane.close()
+            self.bar_plane = None
+
+    def get_status(self) -> Dict:
+        """Get service status including shard workers"""
+        status = super().get_status()
+        status['shards'] = [
+            {
+                'symbols': shard,
+                'pid': process.pid if process is not None else None,
+                'alive': process is not None and process.is_alive()
+            }
+            for shard, process in zip(self.shards, self.workers)
+        ]
+        return status
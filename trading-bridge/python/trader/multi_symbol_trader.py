@@ -246,13 +246,18 @@ class MultiSymbolTrader:
         Monitor all positions across brokers
 
         Returns:
-            Dictionary of broker_name -> list of positions
+            Dictionary of broker_name -> list of positions (brokers whose
+            query failed are left out, so an error is not mistaken for
+            "no open positions")
         """
         all_positions = {}
 
         for broker_name, broker in self.brokers.items():
             try:
                 positions = broker.get_positions()
+                if positions is None:
+                    print(f"[ERROR] {broker_name}: position query failed")
+                    continue
                 all_positions[broker_name] = positions
 
                 # Update active positions tracking
@@ -270,7 +275,6 @@ class MultiSymbolTrader:
                         }
             except Exception as e:
                 print(f"[ERROR] {broker_name}: {e}")
-                all_positions[broker_name] = []
 
         return all_positions
 
@@ -0,0 +1,136 @@
+"""
+Import Budget Report
+Measures module import time at service startup
+"""
+import builtins
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMPORT_BUDGET = 1.0  # seconds
+
+
+class ImportTimer:
+    """
+    Times module imports while active (similar to ``python -X importtime``)
+
+    Only imports made by the thread that entered the timer are measured;
+    imports from other threads (bridge, sampler) pass straight through.
+
+    Usage:
+        with ImportTimer() as timer:
+            from services.background_service import main
+        timer.log_report()
+    """
+
+    def __init__(self):
+        """Initialize import timer"""
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.total_time = 0.0
+        self._stack: List[float] = []
+        self._original_import = None
+        self._start = 0.0
+        self._thread = None
+        self._active = False
+
+    def __enter__(self) -> 'ImportTimer':
+        self._thread = threading.get_ident()
+        self._active = True
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.total_time = time.perf_counter() - self._start
+        self._active = False
+        # Another hook installed meanwhile wraps ours; leave it in place (we
+        # now pass every import through) rather than dropping it
+        if builtins.__import__ == self._timed_import:
+            builtins.__import__ = self._original_import
+        return False
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """builtins.__import__ replacement recording first-time imports"""
+        if (not self._active or threading.get_ident() != self._thread
+                or (level == 0 and name in sys.modules)):
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+
+            key = f"{'.' * level}{name}"
+            if key not in self.timings:
+                self.timings[key] = {
+                    'cumulative': elapsed,
+                    'self': max(elapsed - children, 0.0)
+                }
+
+    def report(self, budget: float = DEFAULT_IMPORT_BUDGET, top: int = 10) -> Dict:
+        """
+        Build import budget report
+
+        Args:
+            budget: Allowed total import time in seconds
+            top: Number of slowest modules to include
+
+        Returns:
+            Report dictionary
+        """
+        slowest = sorted(self.timings.items(), key=lambda item: item[1]['self'], reverse=True)[:top]
+        return {
+            'total_time': self.total_time,
+            'budget': budget,
+            'within_budget': self.total_time <= budget,
+            'modules_imported': len(self.timings),
+            'slowest': [
+                {'module': name, 'self': t['self'], 'cumulative': t['cumulative']}
+                for name, t in slowest
+            ]
+        }
+
+    def log_report(self, budget: float = None, top: int = 10, verbose: bool = False):
+        """
+        Log import budget report
+
+        Args:
+            budget: Allowed total import time in seconds
+                (defaults to TRADING_IMPORT_BUDGET or 1.0)
+            top: Number of slowest modules to log
+            verbose: Log per-module timings even when within budget
+        """
+        if budget is None:
+            try:
+                budget = float(os.environ.get('TRADING_IMPORT_BUDGET', DEFAULT_IMPORT_BUDGET))
+            except ValueError:
+                budget = DEFAULT_IMPORT_BUDGET
+
+        report = self.report(budget, top)
+        summary = (
+            f"Startup imports: {report['total_time']:.3f}s for "
+            f"{report['modules_imported']} module(s) (budget {budget:.3f}s)"
+        )
+
+        if report['within_budget']:
+            logger.info(summary)
+        else:
+            logger.warning(f"{summary} - OVER BUDGET")
+
+        if verbose or not report['within_budget']:
+            for entry in report['slowest']:
+                logger.info(
+                    f"  import {entry['module']}: self {entry['self'] * 1000:.1f}ms, "
+                    f"cumulative {entry['cumulative'] * 1000:.1f}ms"
+                )
@@ -0,0 +1,181 @@
+"""
+Signal Latency Tracing
+Per-stage timing of trade signals from market data to EA delivery
+"""
+import json
+import logging
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in order; each trace holds a time.monotonic() value per stage
+STAGES = (
+    'market_data',      # Latest EA tick received for the symbol
+    'analysis_start',   # Analysis cycle started
+    'analysis_done',    # Market analysis available
+    'strategy_done',    # Strategies produced the signal
+    'risk_done',        # Risk manager approved the signal
+    'queued',           # Added to the bridge signal queue
+    'delivered',        # Returned to the EA by GET_SIGNALS
+)
+
+
+def stage_durations(trace: Dict[str, float]) -> Dict[str, float]:
+    """
+    Compute time spent reaching each stage from the previous recorded stage
+
+    Args:
+        trace: Stage name -> monotonic timestamp
+
+    Returns:
+        Stage name -> seconds, plus 'total' from the first to the last stage
+    """
+    durations = {}
+    previous = None
+    for stage in STAGES:
+        if stage not in trace:
+            continue
+        if previous is not None:
+            durations[stage] = trace[stage] - trace[previous]
+        previous = stage
+
+    recorded = [trace[s] for s in STAGES if s in trace]
+    if len(recorded) > 1:
+        durations['total'] = recorded[-1] - recorded[0]
+    return durations
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    index = min(max(math.ceil(q * len(sorted_values)) - 1, 0), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class SignalTracer:
+    """
+    Collects completed signal traces
+
+    Stage durations go into histograms (exported on the metrics endpoint),
+    a bounded recent window used for exact percentiles and per-signal
+    lookups, and an NDJSON trace log.
+    """
+
+    def __init__(self, max_traces: int = 1000, log_dir: Optional[Path] = None):
+        """
+        Initialize tracer
+
+        Args:
+            max_traces: Recent traces kept in memory
+            log_dir: Directory for signal_trace_YYYYMMDD.ndjson (None = no log)
+        """
+        self.max_traces = max_traces
+        self.traces: 'OrderedDict[str, Dict]' = OrderedDict()
+        self.log_dir = log_dir
+        self._lock = threading.Lock()
+
+        registry = get_metrics_registry()
+        self.stage_latency = registry.histogram(
+            'signal_stage_latency_seconds', 'Time to reach each signal pipeline stage from the previous one',
+            ['stage']
+        )
+        self.total_latency = registry.histogram(
+            'signal_total_latency_seconds', 'Market data to EA delivery time per signal'
+        )
+
+    def record(self, signal_id: str, symbol: str, trace: Dict[str, float]):
+        """
+        Record a completed trace
+
+        Args:
+            signal_id: Signal identifier
+            symbol: Trading symbol
+            trace: Stage name -> monotonic timestamp
+        """
+        durations = stage_durations(trace)
+        for stage, seconds in durations.items():
+            if stage == 'total':
+                self.total_latency.observe(seconds)
+            else:
+                self.stage_latency.labels(stage).observe(seconds)
+
+        entry = {
+            'signal_id': signal_id,
+            'symbol': symbol,
+            'completed_at': datetime.now().isoformat(),
+            'durations': durations
+        }
+        with self._lock:
+            self.traces[signal_id] = entry
+            self.traces.move_to_end(signal_id)
+            while len(self.traces) > self.max_traces:
+                self.traces.popitem(last=False)
+
+        self._write_log(entry)
+
+    def _write_log(self, entry: Dict):
+        """Append one trace to the NDJSON log"""
+        if self.log_dir is None:
+            return
+        try:
+            log_file = self.log_dir / f"signal_trace_{datetime.now().strftime('%Y%m%d')}.ndjson"
+            with open(log_file, 'a') as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        except OSError as e:
+            logger.error(f"Error writing signal trace: {e}")
+
+    def get_trace(self, signal_id: str) -> Optional[Dict]:
+        """Get a recent trace by signal ID"""
+        with self._lock:
+            return self.traces.get(signal_id)
+
+    def get_recent(self, limit: int = 20) -> List[Dict]:
+        """Get the most recent traces (newest last)"""
+        with self._lock:
+            return list(self.traces.values())[-limit:] if limit > 0 else []
+
+    def get_percentiles(self) -> Dict[str, Dict[str, float]]:
+        """
+        Exact p50/p95/p99 per stage over the recent window
+
+        Returns:
+            Stage name -> {'count', 'p50', 'p95', 'p99'} in seconds
+        """
+        with self._lock:
+            entries = list(self.traces.values())
+
+        samples: Dict[str, List[float]] = {}
+        for entry in entries:
+            for stage, seconds in entry['durations'].items():
+                samples.setdefault(stage, []).append(seconds)
+
+        percentiles = {}
+        for stage in list(STAGES) + ['total']:
+            values = sorted(samples.get(stage, []))
+            if values:
+                percentiles[stage] = {
+                    'count': len(values),
+                    'p50': _percentile(values, 0.50),
+                    'p95': _percentile(values, 0.95),
+                    'p99': _percentile(values, 0.99)
+                }
+        return percentiles
+
+
+# Singleton instance
+_signal_tracer = None
+
+def get_signal_tracer() -> SignalTracer:
+    """Get singleton instance of SignalTracer"""
+    global _signal_tracer
+    if _signal_tracer is None:
+        log_dir = Path(__file__).parent.parent.parent / "logs"
+        log_dir.mkdir(parents=True, exist_ok=True)
+        _signal_tracer = SignalTracer(log_dir=log_dir)
+    return _signal_tracer
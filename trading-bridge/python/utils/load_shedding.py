@@ -0,0 +1,187 @@
+"""
+Load Shedding Policy
+Decides which service work runs under resource pressure
+"""
+import logging
+import threading
+from enum import IntEnum
+from typing import Dict, List, Sequence
+
+from .metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Work tiers, most important first"""
+    CRITICAL = 0  # Signal delivery, SL/TP management
+    HIGH = 1      # Position monitoring
+    NORMAL = 2    # Market analysis
+    LOW = 3       # Health checks, model refresh, metrics export
+
+
+# Shedding level -> lowest priority still allowed to run
+LEVEL_MAX_PRIORITY = {
+    0: Priority.LOW,      # Normal operation
+    1: Priority.NORMAL,   # Shed housekeeping
+    2: Priority.NORMAL,   # Analysis on coarse timeframes and a subset of symbols
+    3: Priority.HIGH,     # No analysis
+    4: Priority.CRITICAL  # Critical path only
+}
+
+# Fraction of symbols analyzed per cycle at each level
+LEVEL_SYMBOL_FRACTION = {0: 1.0, 1: 1.0, 2: 0.5, 3: 0.0, 4: 0.0}
+
+COARSE_TIMEFRAMES = ('30m', '1h', '4h', '1d', 'M30', 'H1', 'H4', 'D1')
+
+
+class LoadSheddingPolicy:
+    """
+    Graded load shedding with hysteresis
+
+    Each update maps ResourceMonitor.check_resources() output to a target
+    level: normal -> 0, warning -> 1, critical -> 2, rising one level per
+    further critical update up to ``max_level``. Shedding escalates
+    immediately but recovers one level at a time, and only after
+    ``recover_after`` consecutive updates below the current level.
+
+    Only fresh readings count: a result whose ``checked_at`` was already
+    applied (check_resources caches between checks) leaves the level alone.
+    One loop updates the policy while others read it, so its state is
+    guarded by a lock.
+    """
+
+    def __init__(self, recover_after: int = 3, max_level: int = 3,
+                 coarse_timeframes: Sequence[str] = COARSE_TIMEFRAMES):
+        """
+        Initialize policy
+
+        Args:
+            recover_after: Consecutive calmer updates needed to drop one level
+            max_level: Highest shedding level (4 also stops position monitoring)
+            coarse_timeframes: Timeframes still analyzed at level 2
+        """
+        self.recover_after = recover_after
+        self.max_level = min(max_level, max(LEVEL_MAX_PRIORITY))
+        self.coarse_timeframes = set(coarse_timeframes)
+        self.level = 0
+        self._calm_updates = 0
+        self._critical_updates = 0
+        self._rotation = 0
+        self._last_checked_at = None
+        self._lock = threading.Lock()
+
+        registry = get_metrics_registry()
+        registry.gauge('load_shedding_level', 'Current load shedding level (0 = none)').set_function(
+            lambda: self.level
+        )
+        self.shed_count = registry.counter(
+            'load_shed_tasks', 'Service tasks skipped by load shedding', ['priority']
+        )
+
+    def update(self, resources: Dict) -> int:
+        """
+        Update the shedding level from a resource check
+
+        Args:
+            resources: ResourceMonitor.check_resources() result
+
+        Returns:
+            New shedding level
+        """
+        with self._lock:
+            checked_at = resources.get('checked_at')
+            if checked_at is not None:
+                if checked_at == self._last_checked_at:
+                    return self.level  # Cached result, already applied
+                self._last_checked_at = checked_at
+
+            status = resources.get('status', 'critical' if resources.get('is_critical') else 'normal')
+            if status == 'critical':
+                self._critical_updates += 1
+                target = 1 + self._critical_updates
+            else:
+                self._critical_updates = 0
+                target = 1 if status == 'warning' else 0
+            target = min(target, self.max_level)
+
+            previous = self.level
+            if target > self.level:
+                self.level = target
+                self._calm_updates = 0
+            elif target < self.level:
+                self._calm_updates += 1
+                if self._calm_updates >= self.recover_after:
+                    self.level -= 1
+                    self._calm_updates = 0
+            else:
+                self._calm_updates = 0
+            level = self.level
+
+        if level != previous:
+            logger.warning(f"Load shedding level {previous} -> {level}")
+        return level
+
+    def allows(self, priority: Priority) -> bool:
+        """
+        Check whether work of a priority should run at the current level
+
+        Args:
+            priority: Work tier
+
+        Returns:
+            True if the work should run (skips are counted)
+        """
+        allowed = priority <= LEVEL_MAX_PRIORITY[self.level]
+        if not allowed:
+            self.shed_count.labels(priority.name).inc()
+        return allowed
+
+    def select_symbols(self, symbols: List[str]) -> List[str]:
+        """
+        Pick the symbols to analyze this cycle
+
+        A rotating window is used so every symbol is still analyzed
+        periodically while breadth is reduced.
+
+        Args:
+            symbols: All monitored symbols
+
+        Returns:
+            Symbols to analyze
+        """
+        with self._lock:
+            fraction = LEVEL_SYMBOL_FRACTION[self.level]
+            if fraction >= 1.0 or not symbols:
+                return list(symbols)
+            count = max(1, int(len(symbols) * fraction)) if fraction > 0 else 0
+            start = self._rotation % len(symbols)
+            self._rotation += count
+        rotated = symbols[start:] + symbols[:start]
+        return rotated[:count]
+
+    def select_timeframes(self, timeframes: List[str]) -> List[str]:
+        """
+        Pick the timeframes to analyze this cycle
+
+        Args:
+            timeframes: All analyzed timeframes
+
+        Returns:
+            Coarse timeframes only from level 2 (falls back to the coarsest
+            configured timeframe if none match)
+        """
+        if self.level < 2:
+            return list(timeframes)
+        coarse = [tf for tf in timeframes if tf in self.coarse_timeframes]
+        return coarse or list(timeframes[-1:])
+
+    def get_status(self) -> Dict:
+        """Get policy status"""
+        with self._lock:
+            return {
+                'level': self.level,
+                'max_priority': LEVEL_MAX_PRIORITY[self.level].name,
+                'symbol_fraction': LEVEL_SYMBOL_FRACTION[self.level],
+                'calm_updates': self._calm_updates
+            }
@@ -0,0 +1,381 @@
+"""
+Metrics Registry
+In-process counters, gauges and histograms exposed in OpenMetrics text format
+"""
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default latency buckets in seconds (0.5ms .. 30s)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if value == float('-inf'):
+        return '-Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metric families"""
+
+    kind = 'unknown'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._function: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **kwargs):
+        """
+        Get the child for a label combination
+
+        Args:
+            *values: Label values in labelnames order
+            **kwargs: Label values by name
+
+        Returns:
+            Child metric
+        """
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def set_function(self, function: Callable[[], object]):
+        """
+        Compute values at scrape time instead of storing them
+
+        Args:
+            function: Returns a number (unlabelled metric) or a dictionary of
+                label value tuple -> number
+        """
+        self._function = function
+
+    def _function_samples(self) -> List[Tuple[Tuple[str, ...], float]]:
+        try:
+            result = self._function()
+        except Exception as e:
+            logger.debug(f"Metric callback {self.name} failed: {e}")
+            return []
+        if isinstance(result, dict):
+            return [(tuple(str(v) for v in key), value) for key, value in result.items()]
+        return [((), result)]
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _Value:
+    """Single float value guarded by a lock"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = float(value)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        """Increment the unlabelled counter"""
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        samples = self._function_samples() if self._function else \
+            [(key, child.value) for key, child in list(self._children.items())]
+        return [
+            f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in samples
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        """Set the unlabelled gauge"""
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def render(self) -> List[str]:
+        samples = self._function_samples() if self._function else \
+            [(key, child.value) for key, child in list(self._children.items())]
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in samples
+        ]
+
+
+class _HistogramValue:
+    """Fixed-bucket histogram state"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record one observation"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        """Observe the duration of a block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        """Get (cumulative bucket counts, sum, count)"""
+        with self._lock:
+            counts = list(self.counts)
+            total, count = self.sum, self.count
+        cumulative = []
+        running = 0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return cumulative, total, count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation within buckets
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value or None if empty
+        """
+        cumulative, _, count = self.snapshot()
+        if count == 0:
+            return None
+        rank = q * count
+        lower = 0.0
+        previous = 0
+        for i, upper in enumerate(self.buckets):
+            if cumulative[i] >= rank:
+                in_bucket = cumulative[i] - previous
+                fraction = (rank - previous) / in_bucket if in_bucket else 0.0
+                return lower + (upper - lower) * fraction
+            lower, previous = upper, cumulative[i]
+        return self.buckets[-1] if self.buckets else None
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        """Observe on the unlabelled histogram"""
+        self.labels().observe(value)
+
+    def time(self):
+        """Time a block on the unlabelled histogram"""
+        return self.labels().time()
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, child in list(self._children.items()):
+            cumulative, total, count = child.snapshot()
+            bounds = [_format_value(b) for b in self.buckets] + ['+Inf']
+            for bound, value in zip(bounds, cumulative):
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {value}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_count{labels} {count}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Get-or-create registry of metric families"""
+
+    def __init__(self):
+        """Initialize empty registry"""
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} already registered as {metric.kind}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter (name without the _total suffix)"""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge"""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Get a registered metric family"""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """
+        Render all metrics in OpenMetrics text format
+
+        Returns:
+            Exposition text terminated by '# EOF'
+        """
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.append(f"# HELP {name} {_escape(metric.documentation)}")
+            lines.extend(metric.render())
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics"""
+
+    registry: MetricsRegistry = None
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are frequent - keep them out of the service logs
+        pass
+
+
+def start_metrics_server(port: int = 9108, host: str = "127.0.0.1",
+                         registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """
+    Serve the registry over HTTP in a daemon thread
+
+    Args:
+        port: Listen port
+        host: Listen address (local only by default)
+        registry: Registry to expose (defaults to the global one)
+
+    Returns:
+        Running server (call shutdown() to stop)
+    """
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry or get_metrics_registry()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    logger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+    return server
+
+
+# Singleton instance
+_metrics_registry = None
+_registry_lock = threading.Lock()
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get singleton instance of MetricsRegistry"""
+    global _metrics_registry
+    if _metrics_registry is None:
+        with _registry_lock:
+            if _metrics_registry is None:
+                _metrics_registry = MetricsRegistry()
+    return _metrics_registry
@@ -0,0 +1,182 @@
+"""
+Sampling Profiler
+Periodic stack sampler that writes flamegraph-compatible collapsed stacks
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame, thread_name: str, max_depth: int = 128) -> str:
+    """
+    Render a frame chain as one collapsed stack (root first)
+
+    Args:
+        frame: Innermost frame
+        thread_name: Thread name, used as the root element
+        max_depth: Frames kept from the innermost one
+
+    Returns:
+        Semicolon-separated stack, e.g. "MainThread;main (x.py:1);loop (x.py:9)"
+    """
+    labels = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    labels.reverse()
+    return ';'.join(label.replace(';', ',') for label in labels)
+
+
+class StackSampler:
+    """
+    Opt-in sampling profiler
+
+    A daemon thread snapshots every thread's stack with sys._current_frames()
+    at a fixed interval and counts identical stacks. Nothing runs while the
+    sampler is stopped; when running the cost is one stack walk per thread per
+    interval. Output is Brendan Gregg's collapsed format ("stack count" per
+    line) as read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, output_dir: Path):
+        """
+        Initialize sampler
+
+        Args:
+            output_dir: Directory for profile_YYYYMMDD_HHMMSS.folded files
+        """
+        self.output_dir = output_dir
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.interval = 0.02
+        self.thread_filter: Optional[Sequence[str]] = None
+        self.started_at: Optional[float] = None
+        self.deadline: Optional[float] = None
+        self.last_output: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: float = 0.02, duration: Optional[float] = None,
+              threads: Optional[Sequence[str]] = None) -> bool:
+        """
+        Start sampling
+
+        Args:
+            interval: Seconds between samples
+            duration: Stop and write the profile after this many seconds (None = until stop())
+            threads: Only sample threads whose name starts with one of these prefixes
+
+        Returns:
+            True if started, False if already running
+        """
+        with self._lock:
+            if self.running:
+                return False
+            self.stacks = Counter()
+            self.samples = 0
+            self.interval = max(interval, 0.001)
+            self.thread_filter = tuple(threads) if threads else None
+            self.started_at = time.monotonic()
+            self.deadline = self.started_at + duration if duration else None
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+            self._thread.start()
+
+        logger.info(f"Stack sampler started (interval={self.interval}s, duration={duration})")
+        return True
+
+    def stop(self) -> Optional[str]:
+        """
+        Stop sampling and write the collapsed stacks
+
+        Returns:
+            Output file path, or None if nothing was sampled
+        """
+        thread = self._thread
+        if thread is None:
+            return None
+        self._stop_event.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self._thread = None
+        return self._write()
+
+    def _run(self):
+        """Sampling loop"""
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                name = names.get(thread_id, f"thread-{thread_id}")
+                if self.thread_filter and not name.startswith(self.thread_filter):
+                    continue
+                self.stacks[collapse_stack(frame, name)] += 1
+            self.samples += 1
+
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self._thread = None
+                self._write()
+                return
+
+    def _write(self) -> Optional[str]:
+        """Write counted stacks to a .folded file"""
+        if not self.stacks:
+            logger.info("Stack sampler stopped with no samples")
+            return None
+        path = self.output_dir / f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.folded"
+        try:
+            with open(path, 'w') as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            logger.error(f"Error writing profile: {e}")
+            return None
+        self.stacks = Counter()
+        self.last_output = str(path)
+        logger.info(f"Profile written: {path} ({self.samples} samples)")
+        return self.last_output
+
+    def get_status(self) -> Dict:
+        """Get sampler status"""
+        return {
+            'running': self.running,
+            'interval': self.interval,
+            'samples': self.samples,
+            'elapsed': time.monotonic() - self.started_at if self.running else 0.0,
+            'threads': list(self.thread_filter) if self.thread_filter else None,
+            'last_output': self.last_output
+        }
+
+
+# Singleton instance
+_stack_sampler = None
+
+def get_profiler() -> StackSampler:
+    """Get singleton instance of StackSampler"""
+    global _stack_sampler
+    if _stack_sampler is None:
+        output_dir = Path(__file__).parent.parent.parent / "logs" / "profiles"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        _stack_sampler = StackSampler(output_dir)
+    return _stack_sampler
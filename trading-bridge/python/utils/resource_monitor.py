@@ -2,14 +2,26 @@
 Resource Monitor for Trading System
 Monitors CPU, memory, and adapts system behavior for low-spec machines
 """
+import gc
 import psutil
 import logging
+import threading
 import time
 from typing import Dict, Optional
 
+from .metrics import get_metrics_registry
+from .profiler import get_profiler
+
 logger = logging.getLogger(__name__)
 
 
+def _ewma(previous: Optional[float], value: float, alpha: float) -> float:
+    """Exponentially weighted moving average step (seeded by the first value)"""
+    if previous is None:
+        return value
+    return previous + alpha * (value - previous)
+
+
 class ResourceMonitor:
     """Monitor system resources and adapt behavior"""
     
@@ -19,7 +31,15 @@ class ResourceMonitor:
         cpu_critical_threshold: float = 85.0,
         memory_warning_threshold: float = 80.0,
         memory_critical_threshold: float = 90.0,
-        check_interval: int = 30
+        check_interval: int = 30,
+        profile_on_critical: bool = False,
+        profile_duration: float = 60.0,
+        iowait_warning_threshold: float = 10.0,
+        iowait_critical_threshold: float = 25.0,
+        load_warning_threshold: float = 1.0,
+        load_critical_threshold: float = 2.0,
+        sample_interval: float = 5.0,
+        smoothing: float = 0.3
     ):
         """
         Initialize resource monitor
@@ -30,78 +50,218 @@ class ResourceMonitor:
             memory_warning_threshold: Memory usage % to trigger warning
             memory_critical_threshold: Memory usage % to trigger critical mode
             check_interval: Seconds between checks
+            profile_on_critical: Sample thread stacks when entering critical mode
+            profile_duration: Seconds to sample for after entering critical mode
+            iowait_warning_threshold: CPU I/O wait % to trigger warning
+            iowait_critical_threshold: CPU I/O wait % to trigger critical mode
+            load_warning_threshold: 1-minute load average per CPU to trigger warning
+            load_critical_threshold: 1-minute load average per CPU to trigger critical mode
+            sample_interval: Seconds between background samples
+            smoothing: EWMA weight of the newest sample (0-1)
         """
         self.cpu_warning_threshold = cpu_warning_threshold
         self.cpu_critical_threshold = cpu_critical_threshold
         self.memory_warning_threshold = memory_warning_threshold
         self.memory_critical_threshold = memory_critical_threshold
+        self.iowait_warning_threshold = iowait_warning_threshold
+        self.iowait_critical_threshold = iowait_critical_threshold
+        self.load_warning_threshold = load_warning_threshold
+        self.load_critical_threshold = load_critical_threshold
         self.check_interval = check_interval
+        self.sample_interval = sample_interval
+        self.smoothing = smoothing
+        self.profile_on_critical = profile_on_critical
+        self.profile_duration = profile_duration
         
         self.last_check_time = 0
         self.cpu_percent = 0.0
         self.memory_percent = 0.0
+        self.iowait_percent = 0.0
+        self.load_per_cpu = 0.0
         self.is_critical = False
+        self.status = 'normal'  # normal, warning or critical
         self.warning_count = 0
         
         # Adaptive sleep values
         self.base_sleep = 10  # Base sleep in seconds
         self.current_sleep = self.base_sleep
         
+        # Background sampler: the service loop only reads the latest snapshot
+        self.process = psutil.Process()
+        self.cpu_count = psutil.cpu_count() or 1
+        self.snapshot: Dict[str, float] = {}
+        self._smoothed: Dict[str, Optional[float]] = {}
+        self._sampler_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        
+        registry = get_metrics_registry()
+        self.cpu_gauge = registry.gauge('system_cpu_percent', 'System CPU usage percent')
+        self.memory_gauge = registry.gauge('system_memory_percent', 'System memory usage percent')
+        self.critical_gauge = registry.gauge('system_resources_critical', '1 while resources are critical')
+        registry.gauge('system_iowait_percent', 'CPU time waiting on I/O (smoothed)').set_function(
+            lambda: self.snapshot.get('iowait_percent', 0.0)
+        )
+        registry.gauge('system_load_per_cpu', '1-minute load average per CPU').set_function(
+            lambda: self.snapshot.get('load_per_cpu', 0.0)
+        )
+        registry.gauge('process_cpu_percent', 'Service process CPU usage percent (smoothed)').set_function(
+            lambda: self.snapshot.get('process_cpu_percent', 0.0)
+        )
+        registry.gauge('process_resident_memory_bytes', 'Service process resident memory').set_function(
+            lambda: self.snapshot.get('process_rss_bytes', 0.0)
+        )
+        registry.gauge('process_threads', 'Service process thread count').set_function(
+            lambda: self.snapshot.get('process_threads', 0.0)
+        )
+        registry.gauge('process_open_fds', 'Service process open file descriptors/handles').set_function(
+            lambda: self.snapshot.get('process_open_fds', 0.0)
+        )
+        registry.gauge('python_gc_collections', 'Garbage collections per generation', ['generation']).set_function(
+            lambda: {(str(i),): stats['collections'] for i, stats in enumerate(gc.get_stats())}
+        )
+    
+    def start(self):
+        """Start the background sampler thread"""
+        if self._sampler_thread is not None and self._sampler_thread.is_alive():
+            return
+        
+        # Prime the non-blocking CPU counters; the first call always returns 0.0
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_times_percent(interval=None)
+        self.process.cpu_percent(interval=None)
+        
+        self._stop_event.clear()
+        self._sampler_thread = threading.Thread(
+            target=self._sample_loop, name='resource-sampler', daemon=True
+        )
+        self._sampler_thread.start()
+    
+    def stop(self):
+        """Stop the background sampler thread"""
+        self._stop_event.set()
+        if self._sampler_thread is not None:
+            self._sampler_thread.join(timeout=self.sample_interval + 1)
+            self._sampler_thread = None
+    
+    def _sample_loop(self):
+        """Sample resources every sample_interval seconds"""
+        while not self._stop_event.wait(self.sample_interval):
+            try:
+                self._sample()
+            except Exception as e:
+                logger.debug(f"Resource sample failed: {e}")
+    
+    def _sample(self):
+        """Take one non-blocking sample and update the smoothed snapshot"""
+        # interval=None reports usage since the previous call - no blocking
+        raw = {
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory_percent': psutil.virtual_memory().percent,
+            'iowait_percent': getattr(psutil.cpu_times_percent(interval=None), 'iowait', 0.0),
+            'load_per_cpu': psutil.getloadavg()[0] / self.cpu_count,
+            'process_cpu_percent': self.process.cpu_percent(interval=None),
+        }
+        snapshot = {
+            name: _ewma(self._smoothed.get(name), value, self.smoothing)
+            for name, value in raw.items()
+        }
+        self._smoothed = dict(snapshot)
+        
+        # Point-in-time process values (not smoothed)
+        with self.process.oneshot():
+            snapshot['process_rss_bytes'] = self.process.memory_info().rss
+            snapshot['process_threads'] = self.process.num_threads()
+            if hasattr(self.process, 'num_fds'):
+                snapshot['process_open_fds'] = self.process.num_fds()
+            else:
+                snapshot['process_open_fds'] = self.process.num_handles()  # Windows
+        snapshot['gc_objects'] = sum(gc.get_count())
+        snapshot['timestamp'] = time.time()
+        
+        self.snapshot = snapshot
+    
     def check_resources(self) -> Dict[str, any]:
         """
         Check system resources
         
+        Reads the latest background sample, so this never blocks. The sampler
+        is started on first use; its first sample is taken one sample_interval
+        later, once the CPU counters cover a real interval.
+        
         Returns:
             Dict with resource information
         """
+        if self._sampler_thread is None:
+            self.start()
+        
         current_time = time.time()
         
-        # Only check if enough time has passed
-        if current_time - self.last_check_time < self.check_interval:
+        # Only check if enough time has passed; until the first sample (one
+        # sample_interval after start) keep the previous values and check again
+        if current_time - self.last_check_time < self.check_interval or not self.snapshot:
             return {
                 'cpu_percent': self.cpu_percent,
                 'memory_percent': self.memory_percent,
+                'iowait_percent': self.iowait_percent,
+                'load_per_cpu': self.load_per_cpu,
                 'is_critical': self.is_critical,
-                'sleep_interval': self.current_sleep
+                'status': self.status,
+                'sleep_interval': self.current_sleep,
+                'checked_at': self.last_check_time
             }
         
         self.last_check_time = current_time
         
-        # Get CPU usage (1 second interval for accuracy)
-        self.cpu_percent = psutil.cpu_percent(interval=1)
+        snapshot = self.snapshot
+        self.cpu_percent = snapshot.get('cpu_percent', 0.0)
+        self.memory_percent = snapshot.get('memory_percent', 0.0)
+        self.iowait_percent = snapshot.get('iowait_percent', 0.0)
+        self.load_per_cpu = snapshot.get('load_per_cpu', 0.0)
         
-        # Get memory usage
-        memory = psutil.virtual_memory()
-        self.memory_percent = memory.percent
+        self.cpu_gauge.set(self.cpu_percent)
+        self.memory_gauge.set(self.memory_percent)
         
         # Determine status
         was_critical = self.is_critical
         
         if (self.cpu_percent >= self.cpu_critical_threshold or 
-            self.memory_percent >= self.memory_critical_threshold):
+            self.memory_percent >= self.memory_critical_threshold or
+            self.iowait_percent >= self.iowait_critical_threshold or
+            self.load_per_cpu >= self.load_critical_threshold):
             self.is_critical = True
+            self.status = 'critical'
             self.warning_count += 1
             
             if not was_critical:
                 logger.warning(
                     f"CRITICAL: System resources high - "
                     f"CPU: {self.cpu_percent:.1f}%, "
-                    f"Memory: {self.memory_percent:.1f}%"
+                    f"Memory: {self.memory_percent:.1f}%, "
+                    f"IO wait: {self.iowait_percent:.1f}%, "
+                    f"Load/CPU: {self.load_per_cpu:.2f}"
                 )
+                if self.profile_on_critical:
+                    # Capture what the process is doing while the spike lasts
+                    get_profiler().start(duration=self.profile_duration)
             
             # Increase sleep interval to reduce load
             self.current_sleep = min(self.base_sleep * 3, 30)
             
         elif (self.cpu_percent >= self.cpu_warning_threshold or 
-              self.memory_percent >= self.memory_warning_threshold):
+              self.memory_percent >= self.memory_warning_threshold or
+              self.iowait_percent >= self.iowait_warning_threshold or
+              self.load_per_cpu >= self.load_warning_threshold):
             self.is_critical = False
+            self.status = 'warning'
             self.warning_count += 1
             
             if self.warning_count % 5 == 0:  # Log every 5 warnings
                 logger.warning(
                     f"Warning: System resources elevated - "
                     f"CPU: {self.cpu_percent:.1f}%, "
-                    f"Memory: {self.memory_percent:.1f}%"
+                    f"Memory: {self.memory_percent:.1f}%, "
+                    f"IO wait: {self.iowait_percent:.1f}%, "
+                    f"Load/CPU: {self.load_per_cpu:.2f}"
                 )
             
             # Moderately increase sleep interval
@@ -113,14 +273,28 @@ class ResourceMonitor:
                 logger.info("System resources returned to normal levels")
             
             self.is_critical = False
+            self.status = 'normal'
             self.current_sleep = self.base_sleep
         
+        self.critical_gauge.set(1 if self.is_critical else 0)
+        
         return {
             'cpu_percent': self.cpu_percent,
             'memory_percent': self.memory_percent,
+            'iowait_percent': self.iowait_percent,
+            'load_per_cpu': self.load_per_cpu,
             'is_critical': self.is_critical,
+            'status': self.status,
             'sleep_interval': self.current_sleep,
-            'warning_count': self.warning_count
+            'checked_at': self.last_check_time,
+            'warning_count': self.warning_count,
+            'process': {
+                'cpu_percent': snapshot.get('process_cpu_percent', 0.0),
+                'rss_bytes': snapshot.get('process_rss_bytes', 0),
+                'threads': snapshot.get('process_threads', 0),
+                'open_fds': snapshot.get('process_open_fds', 0),
+                'gc_objects': snapshot.get('gc_objects', 0)
+            }
         }
     
     def get_adaptive_sleep(self) -> int:
@@ -134,10 +308,15 @@ class ResourceMonitor:
     
     def log_summary(self):
         """Log resource usage summary"""
+        rss_mb = self.snapshot.get('process_rss_bytes', 0) / (1024 * 1024)
         logger.info(
             f"Resource Summary - "
             f"CPU: {self.cpu_percent:.1f}%, "
             f"Memory: {self.memory_percent:.1f}%, "
+            f"IO wait: {self.iowait_percent:.1f}%, "
+            f"Load/CPU: {self.load_per_cpu:.2f}, "
+            f"Process RSS: {rss_mb:.0f}MB, "
+            f"Threads: {self.snapshot.get('process_threads', 0)}, "
             f"Adaptive Sleep: {self.current_sleep}s, "
             f"Status: {'CRITICAL' if self.is_critical else 'NORMAL'}"
         )
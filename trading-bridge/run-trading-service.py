@@ -20,5 +20,11 @@ os.chdir(str(python_dir))
 
 # Now import and run the service
 if __name__ == "__main__":
-    from services.background_service import main
+    from utils.import_budget import ImportTimer
+
+    # Measure cold-start import cost (TRADING_IMPORT_REPORT=1 for details)
+    with ImportTimer() as import_timer:
+        from services.background_service import main
+    import_timer.log_report(verbose=os.environ.get('TRADING_IMPORT_REPORT') == '1')
+
     main()
\ No newline at end of file